@@ -5,4 +5,12 @@ setup(
     version="0.1",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
+    # schema 类使用 @dataclass(slots=True)
+    python_requires=">=3.10",
+    # schema 读取用到 openpyxl 私有属性（有公开 API 退路），锁定已验证的版本范围，与 requirements.txt 一致
+    install_requires=["openpyxl>=3.1,<3.2"],
+    extras_require={
+        # --json-style compact / ndjson 时自动使用
+        "fast": ["orjson"],
+    },
 )
\ No newline at end of file
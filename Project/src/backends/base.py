@@ -9,6 +9,10 @@ class BaseBackend(ABC):
         pass
 
     @abstractmethod
-    def export_model(self, model):
-        """导出模型代码"""
+    def export_model(self, model, model_map=None):
+        """导出模型代码；model_map 为同一批导出的 {name: ModelDef}，用于解析引用"""
         pass
+
+    def export_runtime(self):
+        """所有模型共用的运行时代码 {文件名(不含扩展名): 代码}，默认没有"""
+        return {}
@@ -0,0 +1,206 @@
+# backends/codegen.py
+# 各语言后端共用的代码生成基础：
+#   SchemaPlan      同一批导出（同一个 model_map）的预计算：引用的主键类型、行布局、schema 指纹、读取描述，
+#                   每个 Model 只计算一次，所有语言共用同一种描述
+#   TypeMap         SchemaType -> 目标语言类型名，每个类型只映射一次，各字段 / 各 Model 共享
+#   CodegenBackend  按 model_map 复用 SchemaPlan 与 TypeMap 的后端基类
+# 行布局用 RowLayout（只有线格式，不编译编解码函数），指纹与导出器的 TableLayout 一致
+from abc import ABC, abstractmethod
+
+from exporters.binary_layout import ARRAY, STRING, RowLayout
+from exporters.binary_table import KEY_NONE, primary_key, schema_fingerprint
+from schema.index import KeyCycleError, resolve_key_type
+from schema.types import ArrayType, BasicType, CustomType, EnumType
+from .base import BaseBackend
+
+# 引用未知 / 没有主键 / 主键为数组 / 主键引用成环的 Model 时按 int32 存储（与 field_layout 一致）
+INT = BasicType("int")
+
+
+def value_read_plan(value_type, layout):
+    """
+    单个值的读取描述（与 TableLayout 的编码顺序一致）：
+        ("scalar", struct 格式字符, EnumType 或 None)
+        ("string",)
+        ("pooled",)   字符串池下标
+        ("array", 元素值类型, 元素描述)
+    value_type 也可以是未展开引用的字段类型（C# 后端按字段类型生成属性）
+    """
+    if layout.kind == ARRAY:
+        element_type = value_type.element_type
+        return ("array", element_type, value_read_plan(element_type, layout.element))
+    if layout.kind == STRING:
+        return ("string",)
+    if layout.pooled:
+        return ("pooled",)
+    return ("scalar", layout.kind, value_type if isinstance(value_type, EnumType) else None)
+
+
+def referenced_model(field_type):
+    """字段（或数组元素）引用的 Model 名；不是引用时返回 None"""
+    while isinstance(field_type, ArrayType):
+        field_type = field_type.element_type
+    return field_type.name if isinstance(field_type, CustomType) else None
+
+
+def _enum_names(value_type, names):
+    while isinstance(value_type, ArrayType):
+        value_type = value_type.element_type
+    if isinstance(value_type, EnumType):
+        names.add(value_type.name)
+
+
+class ModelPlan:
+    """
+    单个 Model 的代码生成描述
+        fields:      [(FieldDef, 值类型)]，值类型中的 CustomType 已换成被引用表主键的值类型
+        enums:       值类型用到的 Enum 名（按名称排序），生成 import / include
+    只在生成加载代码时才用到的部分按需计算（不生成加载代码的后端不付出布局的开销）：
+        layout / fingerprint  行布局与 schema 指纹
+        reads:       与 fields 对齐的读取描述
+        key:         可作字典键的主键字段下标，没有时为 None
+    """
+
+    __slots__ = ("model", "fields", "enums", "_plan", "_layout", "_fingerprint", "_reads")
+
+    def __init__(self, plan, model):
+        self.model = model
+        self.fields = tuple((field, plan.value_type(field.type)) for field in model.fields)
+        names = set()
+        for _, value_type in self.fields:
+            _enum_names(value_type, names)
+        self.enums = sorted(names)
+        self._plan = plan
+        self._layout = self._fingerprint = self._reads = None
+
+    @property
+    def layout(self):
+        if self._layout is None:
+            self._layout = RowLayout(self.model, self._plan.model_map, self._plan.pooled)
+        return self._layout
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = schema_fingerprint(self.layout)
+        return self._fingerprint
+
+    @property
+    def reads(self):
+        if self._reads is None:
+            self._reads = tuple(
+                value_read_plan(value_type, layout)
+                for (_, value_type), layout in zip(self.fields, self.layout.fields)
+            )
+        return self._reads
+
+    @property
+    def key(self):
+        key_index, key_kind = primary_key(self.layout)
+        return None if key_kind == KEY_NONE else key_index
+
+
+class SchemaPlan:
+    """
+    model_map: 全项目 {name: ModelDef}；pooled: 非主键字符串按字符串池下标存储
+    按名称缓存，同一个 SchemaPlan 上渲染整个项目的全部 Model 时每项只计算一次
+    """
+
+    def __init__(self, model_map=None, pooled=False):
+        self.model_map = model_map or {}
+        self.pooled = pooled
+        self._key_types = {}
+        self._models = {}
+
+    def key_type(self, model_name):
+        """按主键引用 model_name 时存储的值类型（schema.index.resolve_key_type）；无法确定时为 int32"""
+        key_type = self._key_types.get(model_name)
+        if key_type is None:
+            try:
+                key_type = resolve_key_type(self.model_map, model_name)
+            except KeyCycleError:
+                key_type = None
+            key_type = self._key_types[model_name] = key_type or INT
+        return key_type
+
+    def value_type(self, field_type):
+        """字段类型 -> 实际存储的值类型：CustomType（含数组元素）换成被引用表主键的值类型"""
+        if isinstance(field_type, ArrayType):
+            element_type = self.value_type(field_type.element_type)
+            return field_type if element_type is field_type.element_type else ArrayType(element_type)
+        if isinstance(field_type, CustomType):
+            return self.key_type(field_type.name)
+        return field_type
+
+    def model(self, model):
+        """ModelDef -> ModelPlan"""
+        cached = self._models.get(model.name)
+        if cached is None or cached.model is not model:
+            cached = self._models[model.name] = ModelPlan(self, model)
+        return cached
+
+
+class TypeMap(ABC):
+    """
+    SchemaType -> 目标语言类型名，按类型名缓存
+    子类提供 BASIC / FALLBACK 与 array()；CustomType 默认映射为被引用表主键的值类型
+    """
+
+    BASIC = {}
+    FALLBACK = "object"
+
+    def __init__(self, plan=None):
+        self.plan = plan or SchemaPlan()
+        self._names = {}
+
+    def __call__(self, field_type):
+        name = field_type.name
+        mapped = self._names.get(name)
+        if mapped is None:
+            mapped = self._names[name] = self.map(field_type)
+        return mapped
+
+    def map(self, field_type):
+        if isinstance(field_type, ArrayType):
+            return self.array(self(field_type.element_type))
+        if isinstance(field_type, EnumType):
+            return self.enum(field_type)
+        if isinstance(field_type, CustomType):
+            return self.custom(field_type)
+        if isinstance(field_type, BasicType):
+            return self.BASIC.get(field_type.name.lower(), self.FALLBACK)
+        return self.FALLBACK
+
+    @abstractmethod
+    def array(self, element):
+        """元素类型名 -> 数组类型名"""
+        pass
+
+    def enum(self, enum_type):
+        return enum_type.name
+
+    def custom(self, custom_type):
+        return self(self.plan.key_type(custom_type.name))
+
+
+class CodegenBackend(BaseBackend):
+    """
+    binary_loader: 为二进制 DataTable 生成加载代码；string_pool: 字符串字段从全局字符串池解析
+    同一批导出的各 Model 共用一个 SchemaPlan / TypeMap（以 model_map 对象区分批次）
+    """
+
+    type_map = TypeMap
+
+    def __init__(self, binary_loader=False, string_pool=False):
+        self.binary_loader = binary_loader
+        self.string_pool = string_pool
+        self._context = (None, None, None)
+
+    def context(self, model_map=None):
+        """返回 model_map 对应的 (SchemaPlan, TypeMap)；OutputWriter 多线程渲染时整体替换，不加锁"""
+        source, plan, types = self._context
+        if plan is None or source is not model_map:
+            plan = SchemaPlan(model_map, self.string_pool)
+            types = self.type_map(plan)
+            self._context = (model_map, plan, types)
+        return plan, types
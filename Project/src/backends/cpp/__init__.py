@@ -0,0 +1,2 @@
+from .exporter import CppBackend
+from .types import CppTypes, CPP_TYPE_MAP
@@ -0,0 +1,71 @@
+from backends.codegen import CodegenBackend, referenced_model
+from backends.cpp.types import CppTypes, ENUM_UNDERLYING
+from backends.cpp.templates import CLASS_TEMPLATE, ENUM_TEMPLATE, FIELD_TEMPLATE, ENUM_MEMBER_TEMPLATE
+from backends.cpp.loader import contains_pooled, export_loader, export_reader_runtime, export_string_pool_runtime
+from schema.model import ModelDef
+from schema.types import EnumType
+
+
+class CppBackend(CodegenBackend):
+    """header-only 结构体；binary_loader 时附带 Read(BinaryReader&) 与 {Name}Table"""
+
+    file_ext = "h"  # 文件扩展名
+    type_map = CppTypes
+
+    def export_model(self, model: ModelDef, model_map=None) -> str:
+        plan, types = self.context(model_map)
+        model_plan = plan.model(model)
+
+        lines = []
+        for field in model.fields:
+            comment = field.comment
+            if field.is_primary:
+                comment += " [PrimaryKey]"
+            ref = referenced_model(field.type)
+            if ref is not None:
+                comment += f" {ref} 的主键"
+            lines.append(FIELD_TEMPLATE.format(
+                type=types(field.type),
+                name=field.name,
+                comment=f" // {comment.strip()}" if comment.strip() else "",
+            ))
+
+        includes = ["#include <cstdint>", "#include <string>"]
+        if self.binary_loader:
+            includes.append("#include <unordered_map>")
+        includes.append("#include <vector>")
+        local = [f'#include "../Enums/{e}.h"' for e in model_plan.enums]
+        loader = table = ""
+        if self.binary_loader:
+            local.append('#include "../Runtime/DataTableReader.h"')
+            if contains_pooled(model_plan):
+                local.append('#include "../Runtime/StringPool.h"')
+            loader, table = export_loader(model_plan, types)
+        blocks = ["\n".join(includes)] + (["\n".join(local)] if local else [])
+
+        return CLASS_TEMPLATE.format(
+            name=model.name,
+            includes="\n\n".join(blocks) + "\n",
+            fields="\n".join(lines),
+            loader=loader,
+            table=table,
+        )
+
+    def export_enum(self, enum: EnumType) -> str:
+        members_lines = [
+            ENUM_MEMBER_TEMPLATE.format(name=name, value=value)
+            for name, value in enum.members.items()
+        ]
+        return ENUM_TEMPLATE.format(
+            name=enum.name,
+            underlying=ENUM_UNDERLYING.get((enum.underlying or "int").lower(), "int32_t"),
+            members="\n".join(members_lines),
+        )
+
+    def export_runtime(self):
+        runtime = {}
+        if self.binary_loader:
+            runtime["DataTableReader"] = export_reader_runtime()
+            if self.string_pool:
+                runtime["StringPool"] = export_string_pool_runtime()
+        return runtime
@@ -0,0 +1,115 @@
+# backends/cpp/loader.py
+# 由 backends.codegen 的 ModelPlan 生成 C++ 二进制加载代码（header-only）
+# 读取顺序与编码完全一致；定长元素的数组整段 memcpy（bool 与字符串池下标逐个读取）
+from exporters.binary_table import DATA_MAGIC_U32, FORMAT_VERSION
+from exporters.string_pool import MAGIC as POOL_MAGIC, FORMAT_VERSION as POOL_VERSION, POOL_FILE
+from backends.cpp.types import KIND_CPP_TYPES
+from backends.cpp.templates import (
+    LOADER_TEMPLATE,
+    TABLE_TEMPLATE,
+    KEY_DECL_TEMPLATE,
+    KEY_INIT_TEMPLATE,
+    KEY_ADD_TEMPLATE,
+    KEY_METHODS_TEMPLATE,
+    DATA_TABLE_READER_TEMPLATE,
+    STRING_POOL_TEMPLATE,
+)
+
+
+def _read_expr(plan):
+    """定长值 / 字符串的读取表达式；数组返回 None"""
+    kind = plan[0]
+    if kind == "string":
+        return "r.ReadString()"
+    if kind == "pooled":
+        return "data2code::StringPool::Get(r.Read<uint32_t>())"
+    if kind == "scalar":
+        _, fmt, enum_type = plan
+        if fmt == "?":
+            return "r.ReadBool()"
+        read = f"r.Read<{KIND_CPP_TYPES[fmt]}>()"
+        return f"static_cast<{enum_type.name}>({read})" if enum_type is not None else read
+    return None
+
+
+def _emit_read(plan, target, indent, depth=0):
+    pad = "    " * indent
+    expr = _read_expr(plan)
+    if expr is not None:
+        return [f"{pad}{target} = {expr};"]
+
+    element = plan[2]
+    if element[0] == "scalar" and element[1] != "?":
+        # 元素的 C++ 类型与线格式等宽（Enum 的底层类型与 underlying 一致）
+        return [f"{pad}r.ReadArray({target});"]
+    n, i = f"n{depth}", f"i{depth}"
+    lines = [
+        f"{pad}{{",
+        f"{pad}    uint32_t {n} = r.Read<uint32_t>();",
+        f"{pad}    {target}.resize({n});",
+        f"{pad}    for (uint32_t {i} = 0; {i} < {n}; {i}++)",
+        f"{pad}    {{",
+    ]
+    lines += _emit_read(element, f"{target}[{i}]", indent + 2, depth + 1)
+    lines += [
+        f"{pad}    }}",
+        f"{pad}}}",
+    ]
+    return lines
+
+
+def contains_pooled(model_plan):
+    for plan in model_plan.reads:
+        while plan[0] == "array":
+            plan = plan[2]
+        if plan[0] == "pooled":
+            return True
+    return False
+
+
+def export_loader(model_plan, types):
+    """返回 (结构体内的 Read 代码, 结构体之后的 {Name}Table 类)"""
+    name = model_plan.model.name
+    reads = []
+    for field, plan in zip(model_plan.model.fields, model_plan.reads):
+        reads += _emit_read(plan, f"obj.{field.name}", indent=2)
+    loader = LOADER_TEMPLATE.format(
+        name=name,
+        fingerprint=", ".join(f"0x{b:02X}" for b in model_plan.fingerprint),
+        reads="\n".join(reads),
+    )
+
+    if model_plan.key is not None:
+        field, value_type = model_plan.fields[model_plan.key]
+        fmt = dict(name=name, key_type=types(value_type), key_name=field.name)
+        key_decl = KEY_DECL_TEMPLATE.format(**fmt)
+        key_init = KEY_INIT_TEMPLATE.format(**fmt)
+        key_add = KEY_ADD_TEMPLATE.format(**fmt)
+        key_methods = KEY_METHODS_TEMPLATE.format(**fmt)
+    else:
+        key_decl = key_init = key_add = key_methods = ""
+    table = TABLE_TEMPLATE.format(
+        name=name,
+        key_decl=key_decl,
+        key_init=key_init,
+        key_add=key_add,
+        key_methods=key_methods,
+    )
+    return loader, table
+
+
+def export_reader_runtime():
+    """所有表共用的 Runtime/DataTableReader.h"""
+    return DATA_TABLE_READER_TEMPLATE.format(
+        magic=f"0x{DATA_MAGIC_U32:08X}",
+        version=FORMAT_VERSION,
+    )
+
+
+def export_string_pool_runtime():
+    """Runtime/StringPool.h：加载数据表前先调用 StringPool::Load"""
+    return STRING_POOL_TEMPLATE.format(
+        magic=f"0x{int.from_bytes(POOL_MAGIC, 'little'):08X}",
+        version=POOL_VERSION,
+        pool_file=POOL_FILE,
+    )
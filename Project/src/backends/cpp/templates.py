@@ -0,0 +1,264 @@
+HEADER_COMMENT = "// 由 data2code 生成，请勿手动修改\n"
+
+ENUM_TEMPLATE = HEADER_COMMENT + """#pragma once
+
+#include <cstdint>
+
+enum class {name} : {underlying}
+{{
+{members}
+}};
+"""
+
+ENUM_MEMBER_TEMPLATE = "    {name} = {value},"
+
+CLASS_TEMPLATE = HEADER_COMMENT + """#pragma once
+
+{includes}
+struct {name}
+{{
+{fields}
+{loader}}};
+{table}"""
+
+FIELD_TEMPLATE = "    {type} {name}{{}};{comment}"
+
+# =========================
+# 二进制 DataTable 加载代码
+# =========================
+
+LOADER_TEMPLATE = """
+    static constexpr uint8_t SchemaFingerprint[8] = {{ {fingerprint} }};
+
+    static {name} Read(data2code::BinaryReader& r)
+    {{
+        {name} obj;
+{reads}
+        return obj;
+    }}
+"""
+
+TABLE_TEMPLATE = """
+class {name}Table
+{{
+public:
+    std::vector<{name}> Rows;
+{key_decl}
+    explicit {name}Table(const std::vector<uint8_t>& data)
+    {{
+        data2code::BinaryReader r(data.data(), data.size());
+        auto header = data2code::ReadHeader(r, {name}::SchemaFingerprint, "{name}");
+        Rows.reserve(header.RowCount);
+{key_init}        for (uint32_t i = 0; i < header.RowCount; i++)
+        {{
+            Rows.push_back({name}::Read(r));
+{key_add}        }}
+    }}
+
+    static {name}Table Load(const std::string& path)
+    {{
+        return {name}Table(data2code::ReadFile(path));
+    }}
+{key_methods}}};
+"""
+
+KEY_DECL_TEMPLATE = "    std::unordered_map<{key_type}, size_t> ByKey;\n"
+KEY_INIT_TEMPLATE = "        ByKey.reserve(header.RowCount);\n"
+KEY_ADD_TEMPLATE = "            ByKey[Rows.back().{key_name}] = i;\n"
+KEY_METHODS_TEMPLATE = """
+    const {name}* Find(const {key_type}& key) const
+    {{
+        auto it = ByKey.find(key);
+        return it == ByKey.end() ? nullptr : &Rows[it->second];
+    }}
+"""
+
+DATA_TABLE_READER_TEMPLATE = HEADER_COMMENT + """// 小端 DataTable 读取；假定运行平台为小端（x86 / ARM）
+#pragma once
+
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace data2code
+{{
+
+class BinaryReader
+{{
+public:
+    BinaryReader(const uint8_t* data, size_t size) : begin(data), pos(data), end(data + size) {{}}
+
+    template <typename T>
+    T Read()
+    {{
+        T value;
+        Require(sizeof(T));
+        std::memcpy(&value, pos, sizeof(T));
+        pos += sizeof(T);
+        return value;
+    }}
+
+    bool ReadBool()
+    {{
+        return Read<uint8_t>() != 0;
+    }}
+
+    std::string ReadString()
+    {{
+        uint32_t length = Read<uint32_t>();
+        Require(length);
+        std::string value(reinterpret_cast<const char*>(pos), length);
+        pos += length;
+        return value;
+    }}
+
+    // 定长元素的数组整段复制（bool 除外）
+    template <typename T>
+    void ReadArray(std::vector<T>& out)
+    {{
+        uint32_t n = Read<uint32_t>();
+        Require(size_t(n) * sizeof(T));
+        out.resize(n);
+        if (n > 0)
+            std::memcpy(out.data(), pos, size_t(n) * sizeof(T));
+        pos += size_t(n) * sizeof(T);
+    }}
+
+    const uint8_t* Bytes(size_t n)
+    {{
+        Require(n);
+        const uint8_t* p = pos;
+        pos += n;
+        return p;
+    }}
+
+    void Seek(size_t offset)
+    {{
+        if (offset > size_t(end - begin))
+            throw std::runtime_error("DataTable: offset out of range");
+        pos = begin + offset;
+    }}
+
+private:
+    void Require(size_t n) const
+    {{
+        if (size_t(end - pos) < n)
+            throw std::runtime_error("DataTable: unexpected end of data");
+    }}
+
+    const uint8_t* begin;
+    const uint8_t* pos;
+    const uint8_t* end;
+}};
+
+struct DataTableHeader
+{{
+    uint16_t KeyKind;
+    uint32_t RowCount;
+    uint32_t DataPos;
+    uint32_t OffsetsPos;
+    uint32_t IndexPos;
+    uint32_t IndexCount;
+}};
+
+constexpr uint32_t DataTableMagic = {magic};
+constexpr uint16_t DataTableVersion = {version};
+
+inline DataTableHeader ReadHeader(BinaryReader& r, const uint8_t (&fingerprint)[8], const std::string& table)
+{{
+    if (r.Read<uint32_t>() != DataTableMagic)
+        throw std::runtime_error(table + ": not a DataTable file");
+    uint16_t version = r.Read<uint16_t>();
+    if (version != DataTableVersion)
+        throw std::runtime_error(table + ": unsupported DataTable version " + std::to_string(version));
+
+    DataTableHeader header;
+    header.KeyKind = r.Read<uint16_t>();
+    if (std::memcmp(r.Bytes(8), fingerprint, 8) != 0)
+        throw std::runtime_error(table + ": schema fingerprint mismatch, regenerate code or data");
+    header.RowCount = r.Read<uint32_t>();
+    header.DataPos = r.Read<uint32_t>();
+    header.OffsetsPos = r.Read<uint32_t>();
+    header.IndexPos = r.Read<uint32_t>();
+    header.IndexCount = r.Read<uint32_t>();
+    r.Seek(header.DataPos);
+    return header;
+}}
+
+inline std::vector<uint8_t> ReadFile(const std::string& path)
+{{
+    std::ifstream in(path, std::ios::binary);
+    if (!in)
+        throw std::runtime_error(path + ": cannot open file");
+    return std::vector<uint8_t>(std::istreambuf_iterator<char>(in), std::istreambuf_iterator<char>());
+}}
+
+}} // namespace data2code
+"""
+
+STRING_POOL_TEMPLATE = HEADER_COMMENT + """// 全局字符串池：启用 --string-pool 时，数据表中的字符串字段存为池下标
+// 加载任何 DataTable 之前先调用 data2code::StringPool::Load("DataTables/{pool_file}")
+#pragma once
+
+#include <cstdint>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "DataTableReader.h"
+
+namespace data2code
+{{
+
+class StringPool
+{{
+public:
+    static constexpr uint32_t Magic = {magic};
+    static constexpr uint16_t FormatVersion = {version};
+
+    static void Load(const std::string& path)
+    {{
+        std::vector<uint8_t> data = ReadFile(path);
+        BinaryReader r(data.data(), data.size());
+        if (r.Read<uint32_t>() != Magic)
+            throw std::runtime_error(path + ": not a string pool file");
+        uint16_t version = r.Read<uint16_t>();
+        if (version != FormatVersion)
+            throw std::runtime_error(path + ": unsupported string pool version " + std::to_string(version));
+        r.Read<uint16_t>();
+        uint32_t count = r.Read<uint32_t>();
+        std::vector<uint32_t> offsets(count + 1);
+        for (uint32_t i = 0; i <= count; i++)
+            offsets[i] = r.Read<uint32_t>();
+        const char* blob = reinterpret_cast<const char*>(r.Bytes(offsets[count]));
+
+        std::vector<std::string> result(count);
+        for (uint32_t i = 0; i < count; i++)
+            result[i].assign(blob + offsets[i], offsets[i + 1] - offsets[i]);
+        Strings() = std::move(result);
+    }}
+
+    static size_t Count()
+    {{
+        return Strings().size();
+    }}
+
+    static const std::string& Get(uint32_t index)
+    {{
+        return Strings().at(index);
+    }}
+
+private:
+    static std::vector<std::string>& Strings()
+    {{
+        static std::vector<std::string> strings;
+        return strings;
+    }}
+}};
+
+}} // namespace data2code
+"""
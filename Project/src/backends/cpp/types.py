@@ -0,0 +1,43 @@
+from backends.codegen import TypeMap
+
+CPP_TYPE_MAP = {
+    "int": "int32_t",
+    "float": "float",
+    "string": "std::string",
+    "bool": "bool",
+}
+
+# Enum underlying -> 底层整数类型
+ENUM_UNDERLYING = {
+    "byte": "uint8_t",
+    "sbyte": "int8_t",
+    "short": "int16_t",
+    "ushort": "uint16_t",
+    "int": "int32_t",
+    "uint": "uint32_t",
+    "long": "int64_t",
+    "ulong": "uint64_t",
+}
+
+# struct 格式字符 -> 二进制中读取的 C++ 类型
+KIND_CPP_TYPES = {
+    "i": "int32_t",
+    "I": "uint32_t",
+    "b": "int8_t",
+    "B": "uint8_t",
+    "h": "int16_t",
+    "H": "uint16_t",
+    "q": "int64_t",
+    "Q": "uint64_t",
+    "f": "float",
+    "?": "bool",
+}
+
+
+class CppTypes(TypeMap):
+    BASIC = CPP_TYPE_MAP
+    # 未知的基础类型按字符串导出
+    FALLBACK = "std::string"
+
+    def array(self, element):
+        return f"std::vector<{element}>"
@@ -1,3 +1,3 @@
 from .exporter import CSharpBackend
-from .types import to_csharp_type, C_SHARP_TYPE_MAP
+from .types import to_csharp_type, C_SHARP_TYPE_MAP, CSharpTypes
 from .templates import CLASS_TEMPLATE, ENUM_TEMPLATE, FIELD_TEMPLATE, ENUM_MEMBER_TEMPLATE
\ No newline at end of file
@@ -1,16 +1,19 @@
-from backends.csharp.types import to_csharp_type
+from backends.codegen import CodegenBackend
+from backends.csharp.types import CSharpTypes
 from backends.csharp.templates import CLASS_TEMPLATE, ENUM_TEMPLATE, FIELD_TEMPLATE, ENUM_MEMBER_TEMPLATE
+from backends.csharp.loader import export_loader_class, export_reader_runtime, export_string_pool_runtime
 from schema.model import ModelDef
-from schema.field import FieldDef
 from schema.types import EnumType
 
-class CSharpBackend:
+class CSharpBackend(CodegenBackend):
     file_ext = "cs"  # 文件扩展名
+    type_map = CSharpTypes
 
-    def export_model(self, model: ModelDef) -> str:
+    def export_model(self, model: ModelDef, model_map=None) -> str:
+        plan, types = self.context(model_map)
         lines = []
         for field in model.fields:
-            csharp_type = to_csharp_type(field.type)
+            csharp_type = types(field.type)
             comment = f" // {field.comment}" if field.comment else ""
             if field.is_primary:
                 comment += " [PrimaryKey]"
@@ -19,6 +22,8 @@ class CSharpBackend:
                 name=field.name,
                 comment=comment
             ))
+        if self.binary_loader:
+            return export_loader_class(model, lines, model_map, self.string_pool, plan.model(model))
         return CLASS_TEMPLATE.format(
             name=model.name,
             fields="\n".join(lines)
@@ -34,3 +39,11 @@ class CSharpBackend:
             underlying=enum.underlying or "int",
             members="\n".join(members_lines)
         )
+
+    def export_runtime(self):
+        runtime = {}
+        if self.binary_loader:
+            runtime["DataTableReader"] = export_reader_runtime()
+            if self.string_pool:
+                runtime["StringPool"] = export_string_pool_runtime()
+        return runtime
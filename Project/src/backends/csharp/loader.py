@@ -0,0 +1,198 @@
+# backends/csharp/loader.py
+# 由 exporters.binary_layout 的 TableLayout 生成 C# 二进制加载代码
+# 读取顺序与编码完全一致：read_plan 由 backends.codegen.value_read_plan 生成，各语言后端共用同一种描述
+from exporters.binary_layout import ARRAY, STRING
+from exporters.binary_table import DATA_MAGIC_U32, FORMAT_VERSION
+from exporters.string_pool import MAGIC as POOL_MAGIC, FORMAT_VERSION as POOL_VERSION, POOL_FILE
+from backends.codegen import SchemaPlan, value_read_plan
+from backends.csharp.types import to_csharp_type
+from backends.csharp.templates import (
+    LOADER_CLASS_TEMPLATE,
+    KEY_DECL_TEMPLATE,
+    KEY_INIT_TEMPLATE,
+    KEY_ADD_TEMPLATE,
+    KEY_METHODS_TEMPLATE,
+    DATA_TABLE_READER_TEMPLATE,
+    STRING_POOL_TEMPLATE,
+)
+from schema.types import ArrayType, CustomType
+
+# struct 格式字符 -> BinaryReader 方法
+READ_METHODS = {
+    "i": "ReadInt32",
+    "I": "ReadUInt32",
+    "b": "ReadSByte",
+    "B": "ReadByte",
+    "h": "ReadInt16",
+    "H": "ReadUInt16",
+    "q": "ReadInt64",
+    "Q": "ReadUInt64",
+    "f": "ReadSingle",
+    "?": "ReadBoolean",
+}
+
+# struct 格式字符 -> C# 类型（CustomType 按被引用表的主键存储时使用）
+KIND_CSHARP_TYPES = {
+    "i": "int",
+    "I": "uint",
+    "b": "sbyte",
+    "B": "byte",
+    "h": "short",
+    "H": "ushort",
+    "q": "long",
+    "Q": "ulong",
+    "f": "float",
+    "?": "bool",
+    STRING: "string",
+}
+
+
+def _contains_custom(field_type):
+    while isinstance(field_type, ArrayType):
+        field_type = field_type.element_type
+    return isinstance(field_type, CustomType)
+
+
+def value_csharp_type(field_type, layout):
+    """二进制中实际存储的值的 C# 类型（CustomType 为其主键类型）"""
+    if isinstance(field_type, ArrayType):
+        return value_csharp_type(field_type.element_type, layout.element) + "[]"
+    if isinstance(field_type, CustomType):
+        return "string" if layout.pooled else KIND_CSHARP_TYPES[layout.kind]
+    return to_csharp_type(field_type)
+
+
+def property_name(field):
+    """承载二进制值的属性名：引用其它表的字段另存主键到 {Name}Key"""
+    if _contains_custom(field.type):
+        return field.name + "Key"
+    return field.name
+
+
+def _element_csharp_type(element_type, plan):
+    """数组元素的 C# 类型，与 value_csharp_type 一致（CustomType 按读取描述取其主键类型）"""
+    if plan[0] == "array":
+        return _element_csharp_type(element_type.element_type, plan[2]) + "[]"
+    if isinstance(element_type, CustomType):
+        return "string" if plan[0] != "scalar" else KIND_CSHARP_TYPES[plan[1]]
+    return to_csharp_type(element_type)
+
+
+def read_plan(layout):
+    """TableLayout -> [(属性名, 读取描述)]，按字段顺序"""
+    return [
+        (property_name(field), value_read_plan(field.type, field_layout))
+        for field, field_layout in zip(layout.model.fields, layout.fields)
+    ]
+
+
+def _new_array(element_cs_type, count):
+    """new T[n]，交错数组需写成 new int[n][]"""
+    if "[" in element_cs_type:
+        head, _, tail = element_cs_type.partition("[")
+        return f"new {head}[{count}][{tail}"
+    return f"new {element_cs_type}[{count}]"
+
+
+def _emit_read(plan, target, indent, depth=0):
+    pad = "    " * indent
+    kind = plan[0]
+    if kind == "scalar":
+        _, fmt, enum_type = plan
+        cast = f"({enum_type.name})" if enum_type is not None else ""
+        return [f"{pad}{target} = {cast}r.{READ_METHODS[fmt]}();"]
+    if kind == "string":
+        return [f"{pad}{target} = DataTableReader.ReadString(r);"]
+    if kind == "pooled":
+        return [f"{pad}{target} = StringPool.Get(r.ReadUInt32());"]
+
+    _, element_type, element_plan = plan
+    element_cs_type = _element_csharp_type(element_type, element_plan)
+    n, arr, i = f"n{depth}", f"a{depth}", f"i{depth}"
+    lines = [
+        f"{pad}{{",
+        f"{pad}    int {n} = r.ReadInt32();",
+        f"{pad}    var {arr} = {_new_array(element_cs_type, n)};",
+        f"{pad}    for (int {i} = 0; {i} < {n}; {i}++)",
+        f"{pad}    {{",
+    ]
+    lines += _emit_read(element_plan, f"{arr}[{i}]", indent + 2, depth + 1)
+    lines += [
+        f"{pad}    }}",
+        f"{pad}    {target} = {arr};",
+        f"{pad}}}",
+    ]
+    return lines
+
+
+def key_properties(layout):
+    """引用其它表的字段额外生成的主键属性行"""
+    lines = []
+    for field, field_layout in zip(layout.model.fields, layout.fields):
+        if _contains_custom(field.type):
+            cs_type = value_csharp_type(field.type, field_layout)
+            lines.append(f"    public {cs_type} {property_name(field)} {{ get; set; }} // {field.name} 的主键")
+    return lines
+
+
+def primary_key_field(layout):
+    """(主键属性名, C# 类型)；没有可作字典键的主键时返回 None"""
+    for field, field_layout in zip(layout.model.fields, layout.fields):
+        if field.is_primary and field_layout.kind != ARRAY:
+            return property_name(field), value_csharp_type(field.type, field_layout)
+    return None
+
+
+def export_loader_class(model, field_lines, model_map=None, string_pool=False, plan=None):
+    """
+    带 Read(BinaryReader) 与 {Name}Table 的完整模型代码
+    plan: 后端缓存的 backends.codegen.ModelPlan（布局与指纹）；为 None 时按 model_map 计算
+    """
+    if plan is None:
+        plan = SchemaPlan(model_map, string_pool).model(model)
+    layout = plan.layout
+
+    reads = []
+    for name, read in read_plan(layout):
+        reads += _emit_read(read, f"obj.{name}", indent=2)
+
+    fingerprint = ", ".join(f"0x{b:02X}" for b in plan.fingerprint)
+
+    key = primary_key_field(layout)
+    if key is not None:
+        key_name, key_type = key
+        fmt = dict(name=model.name, key_type=key_type, key_name=key_name)
+        key_decl = KEY_DECL_TEMPLATE.format(**fmt)
+        key_init = KEY_INIT_TEMPLATE.format(**fmt)
+        key_add = KEY_ADD_TEMPLATE.format(**fmt)
+        key_methods = KEY_METHODS_TEMPLATE.format(**fmt)
+    else:
+        key_decl = key_init = key_add = key_methods = ""
+
+    return LOADER_CLASS_TEMPLATE.format(
+        name=model.name,
+        fields="\n".join(field_lines + key_properties(layout)),
+        fingerprint=fingerprint,
+        reads="\n".join(reads),
+        key_decl=key_decl,
+        key_init=key_init,
+        key_add=key_add,
+        key_methods=key_methods,
+    )
+
+
+def export_reader_runtime():
+    """所有表共用的 DataTableReader.cs"""
+    return DATA_TABLE_READER_TEMPLATE.format(
+        magic=f"0x{DATA_MAGIC_U32:08X}",
+        version=FORMAT_VERSION,
+    )
+
+
+def export_string_pool_runtime():
+    """StringPool.cs：加载数据表前先调用 StringPool.Load"""
+    return STRING_POOL_TEMPLATE.format(
+        magic=f"0x{int.from_bytes(POOL_MAGIC, 'little'):08X}",
+        version=POOL_VERSION,
+        pool_file=POOL_FILE,
+    )
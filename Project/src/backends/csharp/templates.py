@@ -12,3 +12,156 @@ ENUM_TEMPLATE = """public enum {name} : {underlying}
 
 FIELD_TEMPLATE = "    public {type} {name} {{ get; set; }}{comment}"
 ENUM_MEMBER_TEMPLATE = "    {name} = {value},"
+
+# =========================
+# 二进制 DataTable 加载代码
+# =========================
+
+LOADER_CLASS_TEMPLATE = """using System.Collections.Generic;
+using System.IO;
+
+public class {name}
+{{
+{fields}
+
+    public static readonly byte[] SchemaFingerprint = {{ {fingerprint} }};
+
+    public static {name} Read(BinaryReader r)
+    {{
+        var obj = new {name}();
+{reads}
+        return obj;
+    }}
+}}
+
+public sealed class {name}Table
+{{
+    public readonly List<{name}> Rows;
+{key_decl}
+    public {name}Table(BinaryReader r)
+    {{
+        var header = DataTableReader.ReadHeader(r, {name}.SchemaFingerprint, "{name}");
+        Rows = new List<{name}>((int)header.RowCount);
+{key_init}        for (uint i = 0; i < header.RowCount; i++)
+        {{
+            var row = {name}.Read(r);
+            Rows.Add(row);
+{key_add}        }}
+    }}
+
+    public static {name}Table Load(string path)
+    {{
+        using (var r = new BinaryReader(File.OpenRead(path)))
+        {{
+            return new {name}Table(r);
+        }}
+    }}
+{key_methods}}}
+"""
+
+KEY_DECL_TEMPLATE = "    public readonly Dictionary<{key_type}, {name}> ByKey;\n"
+KEY_INIT_TEMPLATE = "        ByKey = new Dictionary<{key_type}, {name}>((int)header.RowCount);\n"
+KEY_ADD_TEMPLATE = "            ByKey[row.{key_name}] = row;\n"
+KEY_METHODS_TEMPLATE = """
+    public bool TryGet({key_type} key, out {name} row)
+    {{
+        return ByKey.TryGetValue(key, out row);
+    }}
+"""
+
+DATA_TABLE_READER_TEMPLATE = """using System;
+using System.IO;
+using System.Text;
+
+public struct DataTableHeader
+{{
+    public ushort KeyKind;
+    public uint RowCount;
+    public uint DataPos;
+    public uint OffsetsPos;
+    public uint IndexPos;
+    public uint IndexCount;
+}}
+
+public static class DataTableReader
+{{
+    public const uint Magic = {magic};
+    public const ushort FormatVersion = {version};
+
+    public static DataTableHeader ReadHeader(BinaryReader r, byte[] fingerprint, string table)
+    {{
+        long start = r.BaseStream.Position;
+        if (r.ReadUInt32() != Magic)
+            throw new InvalidDataException(table + ": not a DataTable file");
+        ushort version = r.ReadUInt16();
+        if (version != FormatVersion)
+            throw new InvalidDataException(table + ": unsupported DataTable version " + version);
+
+        var header = new DataTableHeader();
+        header.KeyKind = r.ReadUInt16();
+        byte[] actual = r.ReadBytes(fingerprint.Length);
+        for (int i = 0; i < fingerprint.Length; i++)
+        {{
+            if (actual[i] != fingerprint[i])
+                throw new InvalidDataException(table + ": schema fingerprint mismatch, regenerate code or data");
+        }}
+        header.RowCount = r.ReadUInt32();
+        header.DataPos = r.ReadUInt32();
+        header.OffsetsPos = r.ReadUInt32();
+        header.IndexPos = r.ReadUInt32();
+        header.IndexCount = r.ReadUInt32();
+        r.BaseStream.Position = start + header.DataPos;
+        return header;
+    }}
+
+    public static string ReadString(BinaryReader r)
+    {{
+        int length = r.ReadInt32();
+        return length == 0 ? string.Empty : Encoding.UTF8.GetString(r.ReadBytes(length));
+    }}
+}}
+"""
+
+STRING_POOL_TEMPLATE = """using System.IO;
+using System.Text;
+
+// 全局字符串池：启用 --string-pool 时，数据表中的字符串字段存为池下标
+// 加载任何 DataTable 之前先调用 StringPool.Load("DataTables/{pool_file}")
+public static class StringPool
+{{
+    public const uint Magic = {magic};
+    public const ushort FormatVersion = {version};
+
+    static string[] strings = new string[0];
+
+    public static int Count {{ get {{ return strings.Length; }} }}
+
+    public static void Load(string path)
+    {{
+        using (var r = new BinaryReader(File.OpenRead(path)))
+        {{
+            if (r.ReadUInt32() != Magic)
+                throw new InvalidDataException(path + ": not a string pool file");
+            ushort version = r.ReadUInt16();
+            if (version != FormatVersion)
+                throw new InvalidDataException(path + ": unsupported string pool version " + version);
+            r.ReadUInt16();
+            int count = r.ReadInt32();
+            var offsets = new uint[count + 1];
+            for (int i = 0; i <= count; i++)
+                offsets[i] = r.ReadUInt32();
+            byte[] blob = r.ReadBytes((int)offsets[count]);
+
+            var result = new string[count];
+            for (int i = 0; i < count; i++)
+                result[i] = Encoding.UTF8.GetString(blob, (int)offsets[i], (int)(offsets[i + 1] - offsets[i]));
+            strings = result;
+        }}
+    }}
+
+    public static string Get(uint index)
+    {{
+        return strings[index];
+    }}
+}}
+"""
@@ -1,3 +1,4 @@
+from backends.codegen import TypeMap
 from schema.types import BasicType, ArrayType, EnumType, CustomType
 
 C_SHARP_TYPE_MAP = {
@@ -19,3 +20,15 @@ def to_csharp_type(type_obj):
         return type_obj.name
     else:
         return "object"
+
+
+class CSharpTypes(TypeMap):
+    """与 to_csharp_type 相同的映射，按类型名缓存（引用字段的属性类型为被引用的类名）"""
+
+    BASIC = C_SHARP_TYPE_MAP
+
+    def array(self, element):
+        return f"{element}[]"
+
+    def custom(self, custom_type):
+        return custom_type.name
@@ -1,17 +1,26 @@
-from backends.csharp.exporter import CSharpBackend
-# from backends.python.exporter import PythonBackend
-# from backends.cpp.exporter import CppBackend
+# backends/factory.py
+# 代码后端按语言名注册为 "模块:类"，只在被选中时才导入
+from exporters.factory import load_class
 
-def get_backend(language: str):
+BACKENDS = {
+    "csharp": "backends.csharp.exporter:CSharpBackend",
+    "cpp": "backends.cpp.exporter:CppBackend",
+    "python": "backends.python.exporter:PythonBackend",
+}
+
+
+def register_backend(language, target):
+    """注册导出语言；target 为 "模块:类"，类的构造参数即 get_backend 的 options"""
+    BACKENDS[language.lower()] = target
+
+
+def get_backend(language: str, **options):
     """
     根据语言选择导出后端
+    options: 后端选项，如 binary_loader=True
     """
     language = language.lower()
-    if language == "csharp":
-        return CSharpBackend()
-    # elif language == "python":
-    #     return PythonBackend()
-    # elif language == "cpp":
-    #     return CppBackend()
-    else:
+    target = BACKENDS.get(language)
+    if target is None:
         raise ValueError(f"未知导出语言: {language}")
+    return load_class(target)(**options)
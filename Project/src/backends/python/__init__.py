@@ -0,0 +1,2 @@
+from .exporter import PythonBackend
+from .types import PythonTypes, PYTHON_TYPE_MAP
@@ -0,0 +1,79 @@
+from backends.codegen import CodegenBackend, referenced_model
+from backends.python.types import PythonTypes, attr_name, default_value
+from backends.python.templates import CLASS_TEMPLATE, ENUM_TEMPLATE, FIELD_TEMPLATE, ENUM_MEMBER_TEMPLATE
+from backends.python.loader import export_loader, export_reader_runtime, export_string_pool_runtime
+from schema.model import ModelDef
+from schema.types import ArrayType, EnumType
+
+
+class PythonBackend(CodegenBackend):
+    """__slots__ 数据类；binary_loader 时附带按 struct 预编译的 read() 与 {Name}Table"""
+
+    file_ext = "py"  # 文件扩展名
+    type_map = PythonTypes
+
+    def export_model(self, model: ModelDef, model_map=None) -> str:
+        plan, types = self.context(model_map)
+        model_plan = plan.model(model)
+        names = [attr_name(field.name) for field in model.fields]
+
+        annotations = []
+        params = []
+        assigns = []
+        for name, (field, value_type) in zip(names, model_plan.fields):
+            comment = field.comment
+            if field.is_primary:
+                comment += " [PrimaryKey]"
+            ref = referenced_model(field.type)
+            if ref is not None:
+                comment += f" {ref} 的主键"
+            annotations.append(FIELD_TEMPLATE.format(
+                name=name,
+                type=types(field.type),
+                comment=f"  # {comment.strip()}" if comment.strip() else "",
+            ))
+            params.append(f", {name}={default_value(value_type)}")
+            if isinstance(value_type, ArrayType):
+                assigns.append(f"        self.{name} = [] if {name} is None else {name}")
+            else:
+                assigns.append(f"        self.{name} = {name}")
+
+        imports = [f"from Enums.{e} import {e}" for e in model_plan.enums]
+        prelude = []
+        loader = ""
+        if self.binary_loader:
+            loader_imports, prelude, loader = export_loader(model_plan)
+            imports = loader_imports + ([""] + imports if imports else [])
+        header = "\n" + "\n".join(imports) + "\n" if imports else ""
+        if prelude:
+            header += "\n" + "\n".join(prelude) + "\n"
+
+        slots = ", ".join(f'"{name}"' for name in names) + ("," if len(names) == 1 else "")
+        return CLASS_TEMPLATE.format(
+            name=model.name,
+            imports=header,
+            slots=slots,
+            annotations="\n".join(annotations),
+            params="".join(params),
+            assigns="\n".join(assigns) or "        pass",
+            repr_fields=", ".join(f"{name}={{self.{name}!r}}" for name in names),
+            loader=loader,
+        )
+
+    def export_enum(self, enum: EnumType) -> str:
+        members_lines = [
+            ENUM_MEMBER_TEMPLATE.format(name=attr_name(name), value=value)
+            for name, value in enum.members.items()
+        ]
+        return ENUM_TEMPLATE.format(
+            name=enum.name,
+            members="\n".join(members_lines) or "    pass",
+        )
+
+    def export_runtime(self):
+        runtime = {}
+        if self.binary_loader:
+            runtime["DataTableReader"] = export_reader_runtime()
+            if self.string_pool:
+                runtime["StringPool"] = export_string_pool_runtime()
+        return runtime
@@ -0,0 +1,168 @@
+# backends/python/loader.py
+# 由 backends.codegen 的 ModelPlan 生成 Python 二进制加载代码
+# 与导出器的 TableLayout 相同：相邻的定长字段合并为一个模块级 struct.Struct，一次 unpack_from；
+# 定长元素的数组整段 unpack，string / 嵌套数组逐个解码
+import struct
+
+from exporters.binary_table import FORMAT_VERSION, HEADER, MAGIC
+from exporters.string_pool import (
+    FORMAT_VERSION as POOL_VERSION, HEADER as POOL_HEADER, MAGIC as POOL_MAGIC, POOL_FILE,
+)
+from backends.python.templates import DATA_TABLE_READER_TEMPLATE, LOADER_TEMPLATE, STRING_POOL_TEMPLATE
+from backends.python.types import attr_name
+
+
+def members_name(enum_name):
+    """模块级 {值: 成员} 表的变量名；未知的枚举值保留为 int"""
+    return f"_{enum_name}_members"
+
+
+def _fixed_format(plan):
+    """定长值的 struct 格式字符；变长值返回 None"""
+    if plan[0] == "scalar":
+        return plan[1]
+    if plan[0] == "pooled":
+        return "I"
+    return None
+
+
+def _convert(plan, var):
+    """定长值解码后的转换表达式；无需转换时返回 None"""
+    if plan[0] == "pooled":
+        return f"strings[{var}]"
+    if plan[0] == "scalar" and plan[2] is not None:
+        return f"{members_name(plan[2].name)}.get({var}, {var})"
+    return None
+
+
+def _emit_value(plan, target, indent, depth=0):
+    pad = "    " * indent
+    if plan[0] == "string":
+        return [
+            f"{pad}(m,) = U32.unpack_from(buf, pos)",
+            f"{pad}pos += 4",
+            f'{pad}{target} = str(buf[pos:pos + m], "utf-8")',
+            f"{pad}pos += m",
+        ]
+
+    element = plan[2]
+    n = f"n{depth}"
+    fmt = _fixed_format(element)
+    if fmt is not None:
+        values = f'struct.unpack_from("<%d{fmt}" % {n}, buf, pos + 4)'
+        convert = _convert(element, "v")
+        return [
+            f"{pad}({n},) = U32.unpack_from(buf, pos)",
+            f"{pad}{target} = " + (f"list({values})" if convert is None else f"[{convert} for v in {values}]"),
+            f"{pad}pos += 4 + {struct.calcsize('<' + fmt)} * {n}",
+        ]
+
+    items, item = f"a{depth}", f"e{depth}"
+    lines = [
+        f"{pad}({n},) = U32.unpack_from(buf, pos)",
+        f"{pad}pos += 4",
+        f"{pad}{items} = []",
+        f"{pad}for _ in range({n}):",
+    ]
+    lines += _emit_value(element, item, indent + 1, depth + 1)
+    lines += [
+        f"{pad}    {items}.append({item})",
+        f"{pad}{target} = {items}",
+    ]
+    return lines
+
+
+def _contains_pooled(plan):
+    while plan[0] == "array":
+        plan = plan[2]
+    return plan[0] == "pooled"
+
+
+def _runs(fields):
+    """(FieldDef, 读取描述) 序列按定长 / 变长分段，与 TableLayout 的编码分段一致"""
+    run = []
+    for field, plan in fields:
+        if _fixed_format(plan) is not None:
+            run.append((field, plan))
+            continue
+        if run:
+            yield run
+            run = []
+        yield [(field, plan)]
+    if run:
+        yield run
+
+
+def compile_reads(model_plan):
+    """
+    返回 (模块级定义行, read() 方法体行)
+    定长段各用一个 struct.Struct；需要转换的值先解到局部变量
+    """
+    structs = []
+    reads = []
+    if any(_contains_pooled(plan) for plan in model_plan.reads):
+        reads.append("        strings = StringPool.strings")
+    for run in _runs(zip(model_plan.model.fields, model_plan.reads)):
+        field, plan = run[0]
+        if _fixed_format(plan) is None:
+            reads += _emit_value(plan, f"obj.{attr_name(field.name)}", indent=2)
+            continue
+        name = f"_S{len(structs)}"
+        fmt = "<" + "".join(_fixed_format(plan) for _, plan in run)
+        structs.append(f'{name} = struct.Struct("{fmt}")')
+        targets = []
+        converts = []
+        for j, (field, plan) in enumerate(run):
+            target = f"obj.{attr_name(field.name)}"
+            convert = _convert(plan, f"v{j}")
+            if convert is None:
+                targets.append(target)
+            else:
+                targets.append(f"v{j}")
+                converts.append(f"        {target} = {convert}")
+        unpacked = ", ".join(targets) + ("," if len(targets) == 1 else "")
+        reads.append(f"        {unpacked} = {name}.unpack_from(buf, pos)")
+        reads += converts
+        reads.append(f"        pos += {struct.calcsize(fmt)}")
+    return structs, reads
+
+
+def export_loader(model_plan):
+    """
+    返回 (import 行, 模块级定义行, 类中的加载代码与 {Name}Table)
+    """
+    name = model_plan.model.name
+    structs, reads = compile_reads(model_plan)
+    imports = ["import struct", "", "from Runtime.DataTableReader import U32, read_header"]
+    if any(_contains_pooled(plan) for plan in model_plan.reads):
+        imports.append("from Runtime import StringPool")
+    prelude = [f"{members_name(e)} = {{member.value: member for member in {e}}}" for e in model_plan.enums]
+    prelude += structs
+
+    if model_plan.key is not None:
+        key = attr_name(model_plan.model.fields[model_plan.key].name)
+        by_key = f"{{row.{key}: row for row in rows}}"
+    else:
+        by_key = "{}"
+    loader = LOADER_TEMPLATE.format(
+        name=name,
+        fingerprint=model_plan.fingerprint.hex(),
+        reads="\n".join(reads),
+        by_key=by_key,
+    )
+    return imports, prelude, loader
+
+
+def export_reader_runtime():
+    """所有表共用的 Runtime/DataTableReader.py"""
+    return DATA_TABLE_READER_TEMPLATE.format(magic=MAGIC, version=FORMAT_VERSION, header_format=HEADER.format)
+
+
+def export_string_pool_runtime():
+    """Runtime/StringPool.py：加载数据表前先调用 StringPool.load"""
+    return STRING_POOL_TEMPLATE.format(
+        magic=POOL_MAGIC,
+        version=POOL_VERSION,
+        header_format=POOL_HEADER.format,
+        pool_file=POOL_FILE,
+    )
@@ -0,0 +1,128 @@
+HEADER_COMMENT = "# 由 data2code 生成，请勿手动修改；导入时以输出目录为根（Enums / Models / Runtime）\n"
+
+ENUM_TEMPLATE = HEADER_COMMENT + """from enum import IntEnum
+
+
+class {name}(IntEnum):
+{members}
+"""
+
+ENUM_MEMBER_TEMPLATE = "    {name} = {value}"
+
+CLASS_TEMPLATE = HEADER_COMMENT + """from __future__ import annotations
+{imports}
+
+class {name}:
+    __slots__ = ({slots})
+
+{annotations}
+
+    def __init__(self{params}):
+{assigns}
+
+    def __repr__(self):
+        return f"{name}({repr_fields})"
+{loader}"""
+
+FIELD_TEMPLATE = "    {name}: {type}{comment}"
+
+# =========================
+# 二进制 DataTable 加载代码
+# =========================
+
+LOADER_TEMPLATE = """
+    SCHEMA_FINGERPRINT = bytes.fromhex("{fingerprint}")
+
+    @classmethod
+    def read(cls, buf, pos):
+        \"\"\"从 buf 的 pos 处解码一行，返回 (对象, 行结束位置)\"\"\"
+        obj = cls.__new__(cls)
+{reads}
+        return obj, pos
+
+
+class {name}Table:
+    \"\"\"DT_{name}.bin 的全部行\"\"\"
+
+    __slots__ = ("rows", "by_key")
+
+    def __init__(self, buf):
+        header = read_header(buf, {name}.SCHEMA_FINGERPRINT, "{name}")
+        read = {name}.read
+        pos = header.data_pos
+        rows = []
+        for _ in range(header.row_count):
+            row, pos = read(buf, pos)
+            rows.append(row)
+        self.rows = rows
+        self.by_key = {by_key}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def get(self, key, default=None):
+        \"\"\"按主键查找行；没有主键的表总是返回 default\"\"\"
+        return self.by_key.get(key, default)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+"""
+
+DATA_TABLE_READER_TEMPLATE = HEADER_COMMENT + """# DataTable 容器格式的文件头，与导出器一致
+import struct
+from collections import namedtuple
+
+MAGIC = {magic!r}
+FORMAT_VERSION = {version}
+HEADER = struct.Struct({header_format!r})
+U32 = struct.Struct("<I")
+
+DataTableHeader = namedtuple(
+    "DataTableHeader", ("key_kind", "row_count", "data_pos", "offsets_pos", "index_pos", "index_count"))
+
+
+def read_header(buf, fingerprint, table):
+    magic, version, key_kind, actual, *positions = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(table + ": not a DataTable file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{{table}}: unsupported DataTable version {{version}}")
+    if actual != fingerprint:
+        raise ValueError(table + ": schema fingerprint mismatch, regenerate code or data")
+    return DataTableHeader(key_kind, *positions)
+"""
+
+STRING_POOL_TEMPLATE = HEADER_COMMENT + """# 全局字符串池：启用 --string-pool 时，数据表中的字符串字段存为池下标
+# 加载任何 DataTable 之前先调用 StringPool.load("DataTables/{pool_file}")
+import struct
+
+MAGIC = {magic!r}
+FORMAT_VERSION = {version}
+HEADER = struct.Struct({header_format!r})
+
+strings = []
+
+
+def load(path):
+    global strings
+    with open(path, "rb") as f:
+        buf = f.read()
+    magic, version, _, count = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(path + ": not a string pool file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{{path}}: unsupported string pool version {{version}}")
+    offsets = struct.unpack_from(f"<{{count + 1}}I", buf, HEADER.size)
+    blob = HEADER.size + 4 * (count + 1)
+    strings = [str(buf[blob + offsets[i]:blob + offsets[i + 1]], "utf-8") for i in range(count)]
+    return strings
+
+
+def get(index):
+    return strings[index]
+"""
@@ -0,0 +1,41 @@
+import keyword
+
+from backends.codegen import TypeMap
+from schema.types import ArrayType, BasicType, EnumType
+
+PYTHON_TYPE_MAP = {
+    "int": "int",
+    "float": "float",
+    "string": "str",
+    "bool": "bool",
+}
+
+# __init__ 参数的默认值；数组默认 None，构造时换成新的空列表
+DEFAULT_VALUES = {
+    "int": "0",
+    "float": "0.0",
+    "string": '""',
+    "bool": "False",
+}
+
+
+class PythonTypes(TypeMap):
+    BASIC = PYTHON_TYPE_MAP
+
+    def array(self, element):
+        return f"list[{element}]"
+
+
+def default_value(value_type):
+    if isinstance(value_type, ArrayType):
+        return "None"
+    if isinstance(value_type, EnumType):
+        return "0"
+    if isinstance(value_type, BasicType):
+        return DEFAULT_VALUES.get(value_type.name.lower(), "None")
+    return "None"
+
+
+def attr_name(name):
+    """与 Python 关键字同名的字段加 _ 后缀"""
+    return name + "_" if keyword.iskeyword(name) else name
@@ -0,0 +1,97 @@
+# benchmarks/bench_binary.py
+# python -m benchmarks.bench_binary
+# 对比逐值 struct.pack + f.write 与按 schema 预编译、缓冲整块写出的二进制写入吞吐
+import gc
+import os
+import struct
+import tempfile
+import time
+
+from exporters.binary_layout import TableLayout
+from exporters.binary_table import write_table
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType, EnumType
+
+ELEMENT = EnumType("Element", {"Fire": 1, "Ice": 2, "Thunder": 3})
+
+MODEL = ModelDef("BalanceConfig", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Level", BasicType("int")),
+    FieldDef("Power", BasicType("float")),
+    FieldDef("Rate", BasicType("float")),
+    FieldDef("Element", ELEMENT),
+    FieldDef("Name", BasicType("string")),
+    FieldDef("Cost", BasicType("int")),
+    FieldDef("Levels", ArrayType(BasicType("int"))),
+    FieldDef("Tags", ArrayType(BasicType("string"))),
+])
+NAMES = tuple(f.name for f in MODEL.fields)
+
+
+def make_rows(count):
+    """导出行：按 MODEL 字段顺序的 tuple"""
+    return [
+        (i, i % 100, i * 0.5, 0.25, 1, f"Name{i}", i * 3, [1, 2, 3], ["a", "bb"])
+        for i in range(count)
+    ]
+
+
+def write_per_value(rows, f):
+    """旧实现：按 Python 运行时类型逐值 pack，仅用于对比"""
+    for row in rows:
+        for value in row:
+            if isinstance(value, int):
+                f.write(struct.pack("<i", value))
+            elif isinstance(value, float):
+                f.write(struct.pack("<f", value))
+            elif isinstance(value, str):
+                encoded = value.encode("utf-8")
+                f.write(struct.pack("<I", len(encoded)))
+                f.write(encoded)
+            elif isinstance(value, list):
+                f.write(struct.pack("<I", len(value)))
+                for e in value:
+                    if isinstance(e, int):
+                        f.write(struct.pack("<i", e))
+                    elif isinstance(e, float):
+                        f.write(struct.pack("<f", e))
+                    elif isinstance(e, str):
+                        encoded = e.encode("utf-8")
+                        f.write(struct.pack("<I", len(encoded)))
+                        f.write(encoded)
+
+
+def write_schema(rows, f):
+    write_table(TableLayout(MODEL), rows, f)
+
+
+def measure(label, func, rows, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            with open(path, "wb") as f:
+                func(rows, f)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    size = os.path.getsize(path)
+    print(f"{label:<26} {size / 1e6:>8.2f} MB  {best * 1000:>9.1f} ms  {size / 1e6 / best:>8.1f} MB/s  {len(rows) / best:>12,.0f} rows/s")
+    return best
+
+
+def main(row_count=200_000, repeat=3):
+    rows = make_rows(row_count)
+    print(f"{MODEL.name}: {row_count} rows x {len(MODEL.fields)} fields")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "DT_bench.bin")
+        before = measure("per-value struct.pack", write_per_value, rows, path, repeat)
+        after = measure("schema layout + index", write_schema, rows, path, repeat)
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
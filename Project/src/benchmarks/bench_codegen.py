@@ -0,0 +1,111 @@
+# benchmarks/bench_codegen.py
+# python -m benchmarks.bench_codegen [--models 400] [--rows 200000]
+#   渲染  各后端渲染全部 Model / Enum 的耗时（同一批共用一个 SchemaPlan / TypeMap）
+#   加载  Python 后端生成的 {Name}Table.load 与 reader 包逐行解码、json.load 的对比
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from backends.factory import get_backend
+from benchmarks.bench_binary import MODEL, NAMES, make_rows
+from benchmarks.bench_suite import best_of, load_schema, workbook_for
+from benchmarks.workbook_gen import WorkbookSpec
+from exporters.binary_layout import TableLayout
+from exporters.binary_table import write_table
+
+_LOAD_SCRIPT = """
+import sys, time
+from Models.{name} import {name}Table
+best = float("inf")
+for _ in range({repeat}):
+    start = time.perf_counter()
+    table = {name}Table.load("DT_{name}.bin")
+    best = min(best, time.perf_counter() - start)
+print(best)
+"""
+
+
+def render_all(backend, models, enums):
+    model_map = {model.name: model for model in models}
+    for enum in enums.values():
+        backend.export_enum(enum)
+    for model in models:
+        backend.export_model(model, model_map)
+
+
+def python_loader_time(rows, repeat):
+    """在子进程中导入生成的模块并计时 {Name}Table.load"""
+    backend = get_backend("python", binary_loader=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "Models"))
+        os.makedirs(os.path.join(tmp, "Runtime"))
+        with open(os.path.join(tmp, "Models", f"{MODEL.name}.py"), "w", encoding="utf-8") as f:
+            f.write(backend.export_model(MODEL, {MODEL.name: MODEL}))
+        for name, code in backend.export_runtime().items():
+            with open(os.path.join(tmp, "Runtime", f"{name}.py"), "w", encoding="utf-8") as f:
+                f.write(code)
+        # Element 枚举
+        os.makedirs(os.path.join(tmp, "Enums"))
+        for field in MODEL.fields:
+            if field.type.name == "Element":
+                with open(os.path.join(tmp, "Enums", "Element.py"), "w", encoding="utf-8") as f:
+                    f.write(backend.export_enum(field.type))
+        with open(os.path.join(tmp, f"DT_{MODEL.name}.bin"), "wb") as f:
+            write_table(TableLayout(MODEL), rows, f)
+        script = _LOAD_SCRIPT.format(name=MODEL.name, repeat=repeat)
+        proc = subprocess.run([sys.executable, "-c", script], cwd=tmp, capture_output=True, text=True, check=True)
+        return float(proc.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="代码生成后端：渲染耗时与生成的 Python 加载器")
+    parser.add_argument("--models", type=int, default=400)
+    parser.add_argument("--enums", type=int, default=40)
+    parser.add_argument("--fields", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "data2code_bench"))
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    spec = WorkbookSpec(enum_count=args.enums, model_count=args.models, field_count=args.fields, row_count=1)
+    models, enums = load_schema(workbook_for(spec, args.work_dir))
+    print(f"渲染 {len(models)} 个 Model + {len(enums)} 个 Enum")
+    for lang in ("csharp", "cpp", "python"):
+        for binary_loader in (False, True):
+            # 每次新建后端：计入 SchemaPlan / TypeMap 的建立
+            elapsed = best_of(lambda: render_all(get_backend(lang, binary_loader=binary_loader), models, enums),
+                              args.repeat)
+            label = f"{lang}{' + loader' if binary_loader else ''}"
+            print(f"  {label:<18} {elapsed * 1000:>8.1f} ms")
+
+    rows = make_rows(args.rows)
+    print(f"{MODEL.name}: {args.rows} 行 x {len(NAMES)} 列")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "table.json")
+        bin_path = os.path.join(tmp, "table.bin")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump([dict(zip(NAMES, row)) for row in rows], f, ensure_ascii=False)
+        layout = TableLayout(MODEL)
+        with open(bin_path, "wb") as f:
+            write_table(layout, rows, f)
+
+        def load_json():
+            with open(json_path, encoding="utf-8") as f:
+                return json.load(f)
+
+        def decode_rows():
+            from reader import open_table
+            with open_table(bin_path, MODEL) as table:
+                return [row._tuple() for row in table]
+
+        for label, func in (("json.load", load_json), ("reader 逐行解码", decode_rows)):
+            print(f"  {label:<18} {best_of(func, args.repeat) * 1000:>8.1f} ms")
+    print(f"  {'生成的 Table.load':<18} {python_loader_time(rows, args.repeat) * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_columnar.py
+# python -m benchmarks.bench_columnar
+# 同一张表按 JSON、行式二进制、列式三种格式导出的体积与写出耗时，以及读取单列的耗时
+import gc
+import io
+import json
+import time
+
+from benchmarks.bench_binary import MODEL, NAMES, make_rows
+from exporters.binary_layout import TableLayout
+from exporters.binary_table import BinaryTableReader, write_table
+from exporters.columnar_table import ColumnarTableReader, write_columns
+from exporters.json_writers import named_rows
+
+
+def timed(func):
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = func()
+        return result, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def write_json(rows):
+    return json.dumps(list(named_rows(rows, NAMES)), ensure_ascii=False).encode("utf-8")
+
+
+def write_with(writer, layout, rows):
+    f = io.BytesIO()
+    writer(layout, rows, f)
+    return f.getvalue()
+
+
+def main(row_count=200_000):
+    rows = make_rows(row_count)
+    layout = TableLayout(MODEL)
+    print(f"{MODEL.name}: {row_count} rows x {len(MODEL.fields)} fields")
+
+    outputs = {}
+    for label, func in (
+        ("json (compact)", lambda: write_json(rows)),
+        ("row binary", lambda: write_with(write_table, layout, rows)),
+        ("columnar", lambda: write_with(write_columns, layout, rows)),
+    ):
+        data, seconds = timed(func)
+        outputs[label] = data
+        print(f"{label:<16} {len(data) / 1e6:>8.2f} MB  write {seconds * 1000:>8.1f} ms")
+
+    # 只读取 Power 一列
+    power = MODEL.fields.index(next(f for f in MODEL.fields if f.name == "Power"))
+    reader = BinaryTableReader(outputs["row binary"], layout)
+    _, row_scan = timed(lambda: [reader.row(i)[power] for i in range(len(reader))])
+    columnar = ColumnarTableReader(outputs["columnar"], layout)
+    _, column_scan = timed(lambda: columnar.column("Power"))
+    print(f"scan Power: row binary {row_scan * 1000:.1f} ms, columnar {column_scan * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# benchmarks/bench_convert.py
+# python -m benchmarks.bench_convert
+# 对比逐单元格 isinstance 分派与预编译字段转换函数的吞吐（不含 Excel 读取）
+# LootConfig 为嵌套数组 + 按主键引用的表：朴素实现每个单元格沿类型树递归分派、查找被引用表的主键
+import gc
+import time
+
+from exporters.cell_literal import parse_array_literal
+from exporters.json_exporter import JSONExporter
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType, CustomType, EnumType
+
+ELEMENT = EnumType("Element", {"Fire": 1, "Ice": 2, "Thunder": 3})
+
+# 以标量为主的数值表
+SCALAR_MODEL = ModelDef("BalanceConfig", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Name", BasicType("string")),
+    FieldDef("Power", BasicType("float")),
+    FieldDef("Enabled", BasicType("bool")),
+    FieldDef("Element", ELEMENT),
+    FieldDef("Level", BasicType("int")),
+    FieldDef("Cost", BasicType("int")),
+    FieldDef("Rate", BasicType("float")),
+    FieldDef("Weakness", ELEMENT),
+    FieldDef("Levels", ArrayType(BasicType("int"))),
+])
+
+# 数组列较多的配置表
+ARRAY_MODEL = ModelDef("SkillConfig", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Name", BasicType("string")),
+    FieldDef("Power", BasicType("float")),
+    FieldDef("Enabled", BasicType("bool")),
+    FieldDef("Element", ELEMENT),
+    FieldDef("Elements", ArrayType(ELEMENT)),
+    FieldDef("Levels", ArrayType(BasicType("int"))),
+    FieldDef("Rates", ArrayType(BasicType("float"))),
+    FieldDef("Tags", ArrayType(BasicType("string"))),
+    FieldDef("Level", BasicType("int")),
+])
+
+# 嵌套数组与引用
+ITEM_MODEL = ModelDef("ItemConfig", [FieldDef("Id", BasicType("int"), is_primary=True)])
+NESTED_MODEL = ModelDef("LootConfig", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Item", CustomType("ItemConfig")),
+    FieldDef("Drops", ArrayType(CustomType("ItemConfig"))),
+    FieldDef("Waves", ArrayType(ArrayType(BasicType("int")))),
+    FieldDef("Elements", ArrayType(ArrayType(ELEMENT))),
+])
+MODEL_MAP = {model.name: model for model in (ITEM_MODEL, NESTED_MODEL)}
+
+
+def make_scalar_rows(count):
+    return [
+        (i, f"Name{i}", i * 0.5, i % 2 == 0, "Fire", i % 100, i * 3, 0.25, "Ice", "1,2,3")
+        for i in range(count)
+    ]
+
+
+def make_array_rows(count):
+    return [
+        (i, f"Name{i}", i * 0.5, i % 2 == 0, "Fire", "Ice,Thunder", "1,2,3", "0.5,1.5", "a,b", i % 100)
+        for i in range(count)
+    ]
+
+
+def make_nested_rows(count):
+    return [
+        (i, str(i % 50), "1, 2, 3", "[[1, 2], [3]]", "[[Fire], [Ice, Thunder]]")
+        for i in range(count)
+    ]
+
+
+def convert_value_isinstance(field_type, value):
+    """旧实现：每个单元格一条 isinstance 链，仅用于对比"""
+    if isinstance(field_type, BasicType):
+        return value
+    elif isinstance(field_type, EnumType):
+        if isinstance(value, int):
+            return value
+        elif isinstance(value, str):
+            return field_type.members.get(value, 0)
+        else:
+            return 0
+    elif isinstance(field_type, CustomType):
+        return value
+    elif isinstance(field_type, ArrayType):
+        if not value:
+            return []
+        if isinstance(field_type.element_type, (CustomType, ArrayType)):
+            raise TypeError(f"数组字段 {field_type.name} 不支持自定义类型或嵌套数组")
+        if isinstance(value, str):
+            elems = [e.strip() for e in value.split(",")]
+        else:
+            elems = value
+        converted = []
+        for e in elems:
+            if isinstance(field_type.element_type, BasicType):
+                if field_type.element_type.name == "int":
+                    converted.append(int(e))
+                elif field_type.element_type.name == "float":
+                    converted.append(float(e))
+                elif field_type.element_type.name == "bool":
+                    converted.append(e.lower() in ("1", "true", "yes") if isinstance(e, str) else bool(e))
+                else:
+                    converted.append(str(e))
+            elif isinstance(field_type.element_type, EnumType):
+                if isinstance(e, int):
+                    converted.append(e)
+                else:
+                    converted.append(field_type.element_type.members.get(str(e), 0))
+        return converted
+    else:
+        return value
+
+
+def convert_nested_isinstance(field_type, value, element=False):
+    """嵌套类型的朴素实现：沿类型树逐层 isinstance 分派，引用每次都查找被引用表的主键类型"""
+    if isinstance(field_type, CustomType):
+        key = next(f for f in MODEL_MAP[field_type.name].fields if f.is_primary)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return None
+        return convert_nested_isinstance(key.type, value.strip() if isinstance(value, str) else value, True)
+    if isinstance(field_type, ArrayType):
+        if not value:
+            return []
+        if isinstance(value, str):
+            if isinstance(field_type.element_type, ArrayType):
+                value = parse_array_literal(value)
+            else:
+                value = [e.strip() for e in value.split(",")]
+        elif not isinstance(value, (list, tuple)):
+            value = [value]
+        return [convert_nested_isinstance(field_type.element_type, e, True) for e in value]
+    if isinstance(field_type, EnumType):
+        return value if isinstance(value, int) else field_type.members.get(value, 0)
+    if element and field_type.name == "int":
+        return int(value)
+    return value
+
+
+def rows_isinstance(model, rows, convert=convert_value_isinstance):
+    out = []
+    for row in rows:
+        obj = {}
+        for field, value in zip(model.fields, row):
+            obj[field.name] = convert(field.type, value)
+        out.append(obj)
+    return out
+
+
+def rows_nested_isinstance(model, rows):
+    return rows_isinstance(model, rows, convert_nested_isinstance)
+
+
+class _RowSheet:
+    """模拟 worksheet.iter_rows(values_only=True)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def iter_rows(self, min_row=1, values_only=True):
+        return iter(self.rows)
+
+
+def rows_compiled(model, rows):
+    return list(JSONExporter(model_map=MODEL_MAP).iter_rows(_RowSheet(rows), model))
+
+
+def measure(label, func, model, rows, repeat):
+    """取多次最优；计时期间关闭 GC，避免大量新建对象触发的回收干扰对比"""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = func(model, rows)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    cells = len(rows) * len(model.fields)
+    print(f"  {label:<22} {cells:>9} cells  {best * 1000:>9.1f} ms  {cells / best:>12,.0f} cells/s")
+    return result, best
+
+
+def main(row_count=100_000, repeat=3):
+    cases = (
+        (SCALAR_MODEL, make_scalar_rows, rows_isinstance),
+        (ARRAY_MODEL, make_array_rows, rows_isinstance),
+        (NESTED_MODEL, make_nested_rows, rows_nested_isinstance),
+    )
+    for model, make_rows, naive in cases:
+        rows = make_rows(row_count)
+        print(f"{model.name}: {row_count} rows x {len(model.fields)} fields")
+        before, t_before = measure("isinstance per cell", naive, model, rows, repeat)
+        after, t_after = measure("compiled converters", rows_compiled, model, rows, repeat)
+        names = [f.name for f in model.fields]
+        assert before == [dict(zip(names, row)) for row in after]
+        print(f"  speedup: {t_before / t_after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/bench_json.py
+# python -m benchmarks.bench_json
+# 对比 JSON 输出格式（pretty / compact / ndjson）与序列化器（标准库 / orjson）的体积和写出耗时
+import gc
+import os
+import tempfile
+import time
+
+from benchmarks.bench_binary import NAMES, make_rows
+from exporters import json_writers
+from exporters.json_exporter import JSONExporter
+
+
+def measure(exporter, rows, out_dir, repeat):
+    out_file = os.path.join(out_dir, f"DT_Bench.{exporter.file_ext}")
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            exporter.write_rows(iter(rows), out_file, NAMES)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, os.path.getsize(out_file)
+
+
+def main(row_count=200_000, repeat=3):
+    rows = make_rows(row_count)
+    serializers = ["stdlib"] + (["orjson"] if json_writers.orjson is not None else [])
+    print(f"{row_count} rows; serializers: {', '.join(serializers)}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for style in json_writers.JSON_STYLES:
+            for serializer in (["stdlib"] if style == "pretty" else serializers):
+                exporter = JSONExporter(style=style, serializer=serializer)
+                seconds, size = measure(exporter, rows, tmp, repeat)
+                baseline = baseline or seconds
+                print(f"{style:<8} {serializer:<7} {size / 1e6:>8.2f} MB  {seconds * 1000:>8.1f} ms  "
+                      f"{baseline / seconds:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_memory.py
+# python -m benchmarks.bench_memory [--rows 200000]
+# tracemalloc 测量大表常驻内存：
+#   rows    iter_rows 产出的行（按字段顺序的 tuple）与按字段名建 dict 的行对比
+#   schema  大量 ModelDef / FieldDef 对象
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.bench_convert import ARRAY_MODEL, SCALAR_MODEL, _RowSheet, make_array_rows, make_scalar_rows
+from exporters.json_exporter import JSONExporter
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType
+
+
+def retained(build):
+    """build() 返回的对象常驻占用的字节数（tracemalloc 当前值之差）及分配峰值"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current - base, peak - base
+
+
+def rows_as_dicts(model, rows):
+    names = [f.name for f in model.fields]
+    return [dict(zip(names, row)) for row in rows]
+
+
+def make_schema(model_count, field_count):
+    types = [BasicType("int"), BasicType("string"), BasicType("float"), ArrayType(BasicType("int"))]
+    return [
+        ModelDef(f"Model{m}", [
+            FieldDef(f"Field{i}", types[i % len(types)], comment=f"字段 {i}", is_primary=i == 0)
+            for i in range(field_count)
+        ])
+        for m in range(model_count)
+    ]
+
+
+def report(label, count, size, peak, unit):
+    print(f"  {label:<24} {size / 2**20:>9.1f} MiB  {size / count:>8.1f} B/{unit}  峰值 {peak / 2**20:>9.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="行与 schema 对象的内存占用")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--models", type=int, default=2000)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for model, make in ((SCALAR_MODEL, make_scalar_rows), (ARRAY_MODEL, make_array_rows)):
+        raw = make(args.rows)
+        print(f"{model.name}: {args.rows} 行 x {len(model.fields)} 列")
+        rows, size, peak = retained(lambda: list(JSONExporter().iter_rows(_RowSheet(raw), model)))
+        report(f"iter_rows ({type(rows[0]).__name__})", len(rows), size, peak, "行")
+        dicts, size, peak = retained(lambda: rows_as_dicts(model, rows))
+        report("dict 行", len(dicts), size, peak, "行")
+        del rows, dicts, raw
+
+    fields = args.models * args.fields
+    print(f"schema: {args.models} 个 Model x {args.fields} 个字段")
+    _, size, peak = retained(lambda: make_schema(args.models, args.fields))
+    report("ModelDef / FieldDef", fields, size, peak, "字段")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_output.py
+# python -m benchmarks.bench_output [--models 400] [--threads 1,4,8] [--latency-ms 2]
+# 代码渲染 + 写出：原来的顺序路径（逐个渲染、open / write）与 OutputWriter 线程池对比
+#   首次写出  输出目录为空
+#   再次写出  内容全部不变，OutputWriter 只比较哈希不写入
+# --latency-ms 为每次写文件附加的延迟，模拟网络盘 / 杀毒软件扫描；
+# 渲染本身是纯 Python、受 GIL 限制，线程池的收益主要来自重叠这部分 I/O 等待
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+from backends.csharp.exporter import CSharpBackend
+from benchmarks.bench_suite import best_of, load_schema, workbook_for
+from benchmarks.workbook_gen import WorkbookSpec
+from pipeline.output_writer import OutputWriter
+
+
+@contextmanager
+def write_latency(seconds):
+    """每次写文件前等待 seconds 秒（两种路径都经过这里）"""
+    original = OutputWriter._write_file
+
+    def slow(self, target, data):
+        if seconds:
+            time.sleep(seconds)
+        original(self, target, data)
+
+    OutputWriter._write_file = slow
+    try:
+        yield
+    finally:
+        OutputWriter._write_file = original
+
+
+def sequential(models, enums, backend, out_dir, latency=0.0):
+    """原 tools/export.export_code 的写法"""
+    model_map = {model.name: model for model in models}
+    for sub, items, render in (("Enums", enums.values(), backend.export_enum),
+                               ("Models", models, lambda m: backend.export_model(m, model_map))):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+        for item in items:
+            code = render(item)
+            if latency:
+                time.sleep(latency)
+            with open(os.path.join(out_dir, sub, f"{item.name}.{backend.file_ext}"), "w", encoding="utf-8") as f:
+                f.write(code)
+
+
+def threaded(models, enums, backend, out_dir, threads):
+    model_map = {model.name: model for model in models}
+    with OutputWriter(out_dir, threads) as writer:
+        for enum in enums.values():
+            writer.submit(os.path.join("Enums", f"{enum.name}.{backend.file_ext}"),
+                          lambda enum=enum: backend.export_enum(enum))
+        for model in models:
+            writer.submit(os.path.join("Models", f"{model.name}.{backend.file_ext}"),
+                          lambda model=model: backend.export_model(model, model_map))
+    return writer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="代码渲染与输出写入：顺序 vs 线程池")
+    parser.add_argument("--models", type=int, default=400)
+    parser.add_argument("--enums", type=int, default=40)
+    parser.add_argument("--fields", type=int, default=16)
+    parser.add_argument("--threads", default="1,4,8")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="每次写文件附加的延迟（毫秒）")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "data2code_bench"))
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    spec = WorkbookSpec(enum_count=args.enums, model_count=args.models, field_count=args.fields, row_count=1)
+    models, enums = load_schema(workbook_for(spec, args.work_dir))
+    backend = CSharpBackend(binary_loader=True)
+    latency = args.latency_ms / 1000
+    files = len(models) + len(enums)
+    print(f"{len(models)} 个 Model + {len(enums)} 个 Enum，每次写文件附加延迟 {args.latency_ms:g} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def fresh(func):
+            def run():
+                shutil.rmtree(tmp, ignore_errors=True)
+                func()
+            return run
+
+        base = best_of(fresh(lambda: sequential(models, enums, backend, tmp, latency)), args.repeat)
+        print(f"  {'顺序（原路径）':<16} 首次 {base * 1000:>8.1f} ms  {files / base:>8.0f} 文件/s")
+        with write_latency(latency):
+            for threads in (int(t) for t in args.threads.split(",")):
+                first = best_of(fresh(lambda: threaded(models, enums, backend, tmp, threads)), args.repeat)
+                again = best_of(lambda: threaded(models, enums, backend, tmp, threads), args.repeat)
+                print(f"  {f'OutputWriter x{threads}':<16} 首次 {first * 1000:>8.1f} ms  "
+                      f"{files / first:>8.0f} 文件/s  x{base / first:.2f}   内容不变 {again * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_reader.py
+# python -m benchmarks.bench_reader [--rows 200000]
+# 读取导出表：json.load 整表后建 dict 与 reader 包（mmap + 行视图）对比
+#   打开    打开到可以按主键查询为止的耗时与常驻内存
+#   查询    随机 --lookups 次 get(主键) 并读取一个字段
+#   整列    对 Cost 列求和
+import argparse
+import json
+import os
+import random
+import tempfile
+
+from benchmarks.bench_binary import MODEL, NAMES, make_rows
+from benchmarks.bench_memory import retained
+from benchmarks.bench_suite import best_of
+from exporters.binary_layout import TableLayout
+from exporters.binary_table import write_table
+from exporters.columnar_table import write_columns
+from reader import open_table
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return {row["Id"]: row for row in json.load(f)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="导出表读取：json.load vs mmap 行视图")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    keys = random.Random(0).sample(range(args.rows), min(args.lookups, args.rows))
+    cost = NAMES.index("Cost")
+    print(f"{MODEL.name}: {args.rows} 行 x {len(NAMES)} 列，查询 {len(keys)} 次")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {ext: os.path.join(tmp, f"DT_{MODEL.name}.{ext}") for ext in ("json", "bin", "col")}
+        with open(paths["json"], "w", encoding="utf-8") as f:
+            json.dump([dict(zip(NAMES, row)) for row in rows], f, ensure_ascii=False)
+        for ext, writer in (("bin", write_table), ("col", write_columns)):
+            with open(paths[ext], "wb") as f:
+                writer(TableLayout(MODEL), rows, f)
+        del rows
+
+        table, size, _ = retained(lambda: load_json(paths["json"]))
+        opened = best_of(lambda: load_json(paths["json"]), args.repeat)
+        lookup = best_of(lambda: [table[k]["Name"] for k in keys], args.repeat)
+        column = best_of(lambda: sum(row["Cost"] for row in table.values()), args.repeat)
+        print(f"  {'json.load + dict':<18} 打开 {opened * 1000:>8.1f} ms  {size / 2**20:>7.1f} MiB  "
+              f"查询 {lookup * 1000:>7.1f} ms  整列 {column * 1000:>7.1f} ms")
+        del table
+
+        for ext in ("bin", "col"):
+            def open_indexed():
+                opened = open_table(paths[ext], MODEL)
+                opened.find(0)
+                return opened
+
+            table, size, _ = retained(open_indexed)
+            opened = best_of(lambda: open_indexed().close(), args.repeat)
+            lookup = best_of(lambda: [table.get(k).Name for k in keys], args.repeat)
+            column = best_of(lambda: sum(table.column(NAMES[cost])), args.repeat)
+            print(f"  {f'reader ({ext})':<18} 打开 {opened * 1000:>8.1f} ms  {size / 2**20:>7.1f} MiB  "
+                  f"查询 {lookup * 1000:>7.1f} ms  整列 {column * 1000:>7.1f} ms")
+            table.close()
+
+
+if __name__ == "__main__":
+    main()
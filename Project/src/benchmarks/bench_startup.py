@@ -0,0 +1,115 @@
+# benchmarks/bench_startup.py
+# python -m benchmarks.bench_startup [--repeat 5] [--no-fail]
+# CLI 启动的导入耗时（python -X importtime），检查是否超出预算：
+#   help    python -m tools.export --help
+#   noop    全部命中构建缓存的一次导出（watch / CI 中最常见的情况）
+#   schema  --schema-only，全部命中 schema 缓存时只重新生成代码
+# 同时检查这几种情况下不应被导入的模块（openpyxl、未选中的导出器 / 后端、进程池、cProfile）
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.workbook_gen import WorkbookSpec, make_spec_workbook
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(SRC_DIR)
+
+# 导入耗时预算（毫秒，取多次中最好的一次，不含解释器本身的启动）
+BUDGETS = {"help": 80.0, "noop": 150.0, "schema": 120.0}
+FORBIDDEN = (
+    "openpyxl",
+    "concurrent.futures.process",
+    "cProfile",
+    "exporters.binary_exporter",
+    "exporters.columnar_exporter",
+    "backends.cpp",
+    "backends.python",
+    "pipeline.sheet_digest",
+    "pipeline.watcher",
+)
+# importtime 不记录经 importlib.import_module 导入的模块（导出器 / 后端注册表就是这样导入的），
+# 完整的模块列表在进程退出时从 sys.modules 输出
+_RUNNER = (
+    "import atexit, runpy, sys\n"
+    "atexit.register(lambda: sys.stderr.write(''.join(f'module: {m}\\n' for m in sys.modules)))\n"
+    "sys.argv[0] = 'tools.export'\n"
+    "runpy.run_module('tools.export', run_name='__main__', alter_sys=True)\n"
+)
+# 解释器启动时就会导入的模块，不计入预算
+STARTUP_MODULES = ("encodings", "site", "_frozen_importlib_external", "zipimport", "io", "_signal", "abc",
+                   "_codecs", "codecs", "_io", "marshal", "posix", "time", "winreg", "nt", "atexit", "runpy")
+
+
+def import_profile(args):
+    """
+    以 -X importtime 运行 python -m tools.export args
+    返回 (顶层导入总耗时 ms, 已导入的模块名集合, [(累计耗时 us, 顶层导入的模块名)])
+    """
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RUNNER, *args],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"tools.export {' '.join(args)} 失败:\n{proc.stdout}{proc.stderr}")
+    modules = set()
+    top = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("module: "):
+            modules.add(line[len("module: "):])
+            continue
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        # 顶层导入的模块名前只有一个空格
+        if name.startswith(" ") and not name.startswith("  ") and name.strip() not in STARTUP_MODULES:
+            top.append((int(cumulative), name.strip()))
+    return sum(us for us, _ in top) / 1000, modules, sorted(top, reverse=True)
+
+
+def forbidden_imports(modules):
+    """FORBIDDEN 中被导入了的项（包含其子模块）"""
+    return [f for f in FORBIDDEN if any(m == f or m.startswith(f + ".") for m in modules)]
+
+
+def noop_args(work_dir):
+    """生成一个小工作簿并完整导出一次，之后同样的参数全部命中缓存"""
+    excel_dir = os.path.join(work_dir, "excel")
+    os.makedirs(excel_dir, exist_ok=True)
+    make_spec_workbook(os.path.join(excel_dir, "Startup.xlsx"), WorkbookSpec(model_count=3, row_count=20))
+    args = [excel_dir, "--out", os.path.join(work_dir, "out")]
+    import_profile(args)
+    return args
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CLI 导入耗时预算")
+    parser.add_argument("--repeat", type=int, default=5, help="每项取最好的一次")
+    parser.add_argument("--top", type=int, default=10, help="列出累计耗时最多的顶层导入")
+    parser.add_argument("--no-fail", action="store_true", help="超出预算时不以退出码 1 结束")
+    args = parser.parse_args(argv)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        noop = noop_args(tmp)
+        scenarios = {"help": ["--help"], "noop": noop, "schema": noop + ["--schema-only"]}
+        for name, cli_args in scenarios.items():
+            runs = [import_profile(cli_args) for _ in range(args.repeat)]
+            best, modules, top = min(runs, key=lambda run: run[0])
+            budget = BUDGETS[name]
+            bad = forbidden_imports(modules)
+            status = "OK" if best <= budget and not bad else "超出预算"
+            failed |= status != "OK"
+            print(f"{name:<7} {best:>7.1f} ms  预算 {budget:.0f} ms  {status}")
+            if bad:
+                print(f"        不应导入: {', '.join(bad)}")
+            print("        " + ", ".join(f"{m} {us / 1000:.1f}" for us, m in top[:args.top]))
+    return 1 if failed and not args.no_fail else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# benchmarks/bench_suite.py
+# python -m benchmarks.bench_suite [--scales small,medium] [--history bench_history.json] [--label NAME]
+# 端到端基准：按规模生成合成工作簿，分别计时
+#   parse_enums / parse_models / json / binary / csharp 以及一次完整导出（end_to_end）
+# 每次运行的结果追加到 JSON 历史文件，并与上一次（或 --baseline 指定的记录）对比
+import argparse
+import gc
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+
+from backends.csharp.exporter import CSharpBackend
+from benchmarks.workbook_gen import WorkbookSpec, make_spec_workbook
+from exporters.binary_exporter import BinaryExporter
+from exporters.json_exporter import JSONExporter
+from schema.parser import parse_enums_sheet, parse_models_sheet
+from schema.workbook import WorkbookSession
+
+SCALES = {
+    "small": WorkbookSpec(enum_count=5, model_count=5, field_count=10, row_count=200),
+    "medium": WorkbookSpec(enum_count=20, model_count=20, field_count=16, row_count=1000),
+    "large": WorkbookSpec(enum_count=40, model_count=10, field_count=24, row_count=10000,
+                          string_cardinality=5000),
+}
+
+HISTORY_FORMAT = 1
+DEFAULT_THRESHOLD = 0.10
+MIN_DELTA = 0.005   # 变化小于 5 ms 的项目视为噪声，不判定回退
+
+
+def workbook_for(spec, work_dir):
+    """生成的工作簿按参数缓存，重复运行不再重新生成"""
+    key = hashlib.sha1(repr(spec).encode("utf-8")).hexdigest()[:12]
+    path = os.path.join(work_dir, f"bench_{key}.xlsx")
+    if not os.path.exists(path):
+        print(f"生成工作簿 {path}")
+        make_spec_workbook(path + ".tmp.xlsx", spec)
+        os.replace(path + ".tmp.xlsx", path)
+    return path
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def load_schema(path):
+    with WorkbookSession(path, read_only=True) as session:
+        enums = parse_enums_sheet(session)
+        models = parse_models_sheet(session, enums)
+    return models, enums
+
+
+def export_rows(exporter, path, models, enums, out_dir, stream=True):
+    with WorkbookSession(path, read_only=stream) as session:
+        return exporter.export_stream(session, models, enums, out_dir)
+
+
+def export_code(models, enums, out_dir):
+    backend = CSharpBackend(binary_loader=True)
+    model_map = {model.name: model for model in models}
+    os.makedirs(out_dir, exist_ok=True)
+    for enum in enums.values():
+        with open(os.path.join(out_dir, f"{enum.name}.cs"), "w", encoding="utf-8") as f:
+            f.write(backend.export_enum(enum))
+    for model in models:
+        with open(os.path.join(out_dir, f"{model.name}.cs"), "w", encoding="utf-8") as f:
+            f.write(backend.export_model(model, model_map))
+
+
+def end_to_end(path, out_dir):
+    """一次完整导出：schema + C# 代码 + 二进制数据，共用一次只读加载"""
+    with WorkbookSession(path, read_only=True) as session:
+        enums = parse_enums_sheet(session)
+        models = parse_models_sheet(session, enums)
+        export_code(models, enums, os.path.join(out_dir, "Code"))
+        BinaryExporter().export_stream(session, models, enums, os.path.join(out_dir, "Data"))
+
+
+def run_scale(name, spec, work_dir, repeat):
+    path = workbook_for(spec, work_dir)
+    models, enums = load_schema(path)
+    rows = spec.model_count * spec.row_count
+    out = os.path.join(work_dir, "out")
+
+    def parse_enums():
+        with WorkbookSession(path, read_only=True) as session:
+            parse_enums_sheet(session)
+
+    def parse_models():
+        with WorkbookSession(path, read_only=True) as session:
+            parse_models_sheet(session, parse_enums_sheet(session))
+
+    benches = {
+        "parse_enums": parse_enums,
+        "parse_models": parse_models,
+        "json": lambda: export_rows(JSONExporter(), path, models, enums, os.path.join(out, "json")),
+        "binary": lambda: export_rows(BinaryExporter(), path, models, enums, os.path.join(out, "bin")),
+        "csharp": lambda: export_code(models, enums, os.path.join(out, "cs")),
+        "end_to_end": lambda: end_to_end(path, os.path.join(out, "e2e")),
+    }
+    results = {}
+    for bench, func in benches.items():
+        # 导出器会打印每张表的输出路径，计时时不输出
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                seconds = best_of(func, repeat)
+            finally:
+                sys.stdout = stdout
+        results[bench] = seconds
+        rate = f"{rows / seconds:>12,.0f} rows/s" if bench in ("json", "binary", "end_to_end") else ""
+        print(f"  {name:<7} {bench:<13} {seconds * 1000:>10.1f} ms  {rate}")
+    return {"spec": asdict(spec), "rows": rows, "seconds": results}
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("runs", []) if data.get("format") == HISTORY_FORMAT else []
+
+
+def save_history(path, runs):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"format": HISTORY_FORMAT, "runs": runs}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def find_baseline(runs, ref):
+    """ref 为 None 时取最近一次；否则按 label 或 git 版本前缀匹配最近的一条"""
+    for run in reversed(runs):
+        if ref is None or run.get("label") == ref or (run.get("revision") or "").startswith(ref):
+            return run
+    return None
+
+
+def compare(current, baseline, threshold):
+    """逐项对比，返回回退（变慢超过 threshold）的项目列表"""
+    regressions = []
+    print(f"\n对比基线 {baseline.get('label') or baseline.get('revision')}（{baseline['time']}）")
+    for scale, result in current["scales"].items():
+        base = baseline["scales"].get(scale)
+        if base is None or base["spec"] != result["spec"]:
+            continue
+        for bench, seconds in result["seconds"].items():
+            before = base["seconds"].get(bench)
+            if not before:
+                continue
+            change = seconds / before - 1
+            mark = ""
+            if change > threshold and seconds - before > MIN_DELTA:
+                mark = "  <-- 回退"
+                regressions.append((scale, bench, change))
+            print(f"  {scale:<7} {bench:<13} {before * 1000:>10.1f} -> {seconds * 1000:>10.1f} ms  {change:>+7.1%}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Data2Code 端到端基准")
+    parser.add_argument("--scales", default="small,medium", help=f"逗号分隔，可选 {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="每项取最好的一次")
+    parser.add_argument("--history", default="bench_history.json", help="结果历史文件")
+    parser.add_argument("--label", help="本次记录的名称，默认使用 git 版本")
+    parser.add_argument("--baseline", help="对比的记录（label 或 git 版本前缀），默认上一次")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="判定回退的变慢比例")
+    parser.add_argument("--fail-on-regression", action="store_true", help="有回退时以退出码 1 结束（CI 用）")
+    parser.add_argument("--no-save", action="store_true", help="只对比，不写入历史")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "data2code_bench"),
+                        help="生成的工作簿与输出目录")
+    args = parser.parse_args(argv)
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"未知规模: {', '.join(unknown)}")
+    os.makedirs(args.work_dir, exist_ok=True)
+
+    revision = git_revision()
+    current = {
+        "label": args.label,
+        "revision": revision,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "scales": {},
+    }
+    for scale in scales:
+        current["scales"][scale] = run_scale(scale, SCALES[scale], args.work_dir, args.repeat)
+
+    runs = load_history(args.history)
+    baseline = find_baseline(runs, args.baseline)
+    regressions = compare(current, baseline, args.threshold) if baseline else []
+    if not args.no_save:
+        runs.append(current)
+        save_history(args.history, runs)
+        print(f"\n结果已追加到 {args.history}（共 {len(runs)} 次）")
+    if regressions:
+        print(f"{len(regressions)} 项变慢超过 {args.threshold:.0%}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
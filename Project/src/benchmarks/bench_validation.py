@@ -0,0 +1,67 @@
+# benchmarks/bench_validation.py
+# python -m benchmarks.bench_validation
+# 数据校验的开销：行流经过 RowValidator（按列收集 + 表尾集合运算）与直接消费行流的对比，
+# 以及跨表引用检查（集合差）的耗时
+import gc
+import time
+
+from benchmarks.bench_binary import MODEL, make_rows
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import BasicType, CustomType
+from validation import RowValidator, check_references
+
+REF_MODEL = ModelDef("DropConfig", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Balance", CustomType("BalanceConfig")),
+    FieldDef("Count", BasicType("int")),
+])
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, result
+
+
+def validate(model_map, tables):
+    validator = RowValidator("Bench.xlsx", model_map)
+    for model, rows in tables:
+        numbers = list(range(2, len(rows) + 2))
+        for _ in validator.observe(model, model.name, iter(rows), numbers):
+            pass
+    return validator.facts
+
+
+def main(row_count=200_000, repeat=3):
+    rows = make_rows(row_count)
+    refs = [(i, (i * 7) % row_count, 1) for i in range(row_count)]
+    model_map = {MODEL.name: MODEL, REF_MODEL.name: REF_MODEL}
+    tables = [(MODEL, rows), (REF_MODEL, refs)]
+
+    def consume():
+        for _, table in tables:
+            for _ in iter(table):
+                pass
+
+    base, _ = timed(consume, repeat)
+    observed, facts = timed(lambda: validate(model_map, tables), repeat)
+    checked, violations = timed(lambda: check_references([facts], model_map), repeat)
+    assert not facts.violations and not violations
+    total = 2 * row_count
+    print(f"{total} rows")
+    print(f"consume only   {base * 1000:>8.1f} ms")
+    print(f"row validation {observed * 1000:>8.1f} ms  {total / observed / 1e6:>5.2f} M rows/s")
+    print(f"references     {checked * 1000:>8.1f} ms  ({row_count} refs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmarks/workbook_gen.py
+# 生成用于性能测试的合成工作簿
+import random
+from dataclasses import dataclass
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.table import Table
+
+MODEL_HEADER = ["FieldName", "Type", "Comment", "PrimaryKey"]
+FIELD_TYPES = ["int", "float", "string", "bool", "int[]", "string[]"]
+
+
+def add_table(ws, name, header, rows, start_col=1, start_row=1):
+    """在 (start_row, start_col) 写入一个 Excel 表格对象"""
+    for c, value in enumerate(header):
+        ws.cell(row=start_row, column=start_col + c, value=value)
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row):
+            ws.cell(row=start_row + r, column=start_col + c, value=value)
+    ref = "{}{}:{}{}".format(
+        get_column_letter(start_col), start_row,
+        get_column_letter(start_col + len(header) - 1), start_row + max(len(rows), 1),
+    )
+    ws.add_table(Table(displayName=name, ref=ref))
+
+
+def make_models_sheet(wb, table_count=100, field_count=20, tables_per_band=10):
+    """
+    生成 Models sheet：table_count 个模型表，每表 field_count 个字段
+    每 tables_per_band 个表横向排开为一带，带与带之间空一行
+    """
+    ws = wb.create_sheet("Models")
+    width = len(MODEL_HEADER) + 1
+    height = field_count + 2
+    for t in range(table_count):
+        band, slot = divmod(t, tables_per_band)
+        rows = [
+            (
+                "Id" if f == 0 else f"Field{f}",
+                "int" if f == 0 else FIELD_TYPES[f % len(FIELD_TYPES)],
+                f"字段 {f}",
+                f == 0,
+            )
+            for f in range(field_count)
+        ]
+        add_table(
+            ws, f"Model{t}", MODEL_HEADER, rows,
+            start_col=1 + slot * width, start_row=1 + band * height,
+        )
+    return ws
+
+
+@dataclass(frozen=True)
+class WorkbookSpec:
+    """
+    合成工作簿的规模参数，相同参数与 seed 生成的内容完全一致
+    array_ratio: 数组字段占比；string_cardinality: string 列的不同取值个数
+    """
+    enum_count: int = 5
+    enum_members: int = 8
+    model_count: int = 10
+    field_count: int = 12
+    row_count: int = 1000
+    array_ratio: float = 0.25
+    string_cardinality: int = 100
+    seed: int = 1
+
+
+def make_enums_sheet(wb, enum_count=5, member_count=8, tables_per_band=10):
+    """生成 Enums sheet：Enum{e} 包含 Member0..MemberN，值从 0 递增"""
+    ws = wb.create_sheet("Enums")
+    width = 3
+    height = member_count + 2
+    for e in range(enum_count):
+        band, slot = divmod(e, tables_per_band)
+        rows = [(f"Member{m}", m) for m in range(member_count)]
+        add_table(ws, f"Enum{e}", ["Name", "Value"], rows,
+                  start_col=1 + slot * width, start_row=1 + band * height)
+    return ws
+
+
+def spec_fields(spec):
+    """
+    每个 Model 的字段 [(name, type)]：首列为 int 主键，其余在标量 / 枚举中轮换，
+    按 array_ratio 均匀地把部分字段换成对应的数组类型
+    """
+    scalars = ["int", "float", "string", "bool"] + [f"Enum{e}" for e in range(min(spec.enum_count, 2))]
+    fields = [("Id", "int")]
+    arrays = 0
+    for f in range(1, spec.field_count):
+        base = scalars[f % len(scalars)]
+        if base != "bool" and (arrays + 1) <= spec.array_ratio * f:
+            arrays += 1
+            fields.append((f"Field{f}", base + "[]"))
+        else:
+            fields.append((f"Field{f}", base))
+    return fields
+
+
+def _cell_value(rnd, field_type, spec, strings):
+    if field_type.endswith("[]"):
+        element = field_type[:-2]
+        return ",".join(str(_cell_value(rnd, element, spec, strings)) for _ in range(rnd.randint(0, 4)))
+    if field_type == "int":
+        return rnd.randint(-1000, 100000)
+    if field_type == "float":
+        return round(rnd.uniform(0, 1000), 3)
+    if field_type == "string":
+        return strings[rnd.randrange(len(strings))]
+    if field_type == "bool":
+        return rnd.random() < 0.5
+    return f"Member{rnd.randrange(spec.enum_members)}"
+
+
+def make_spec_workbook(path, spec):
+    """按 WorkbookSpec 生成包含 Enums / Models / 数据表的完整工作簿，返回 (path, 总行数)"""
+    rnd = random.Random(spec.seed)
+    wb = Workbook()
+    wb.remove(wb.active)
+    make_enums_sheet(wb, spec.enum_count, spec.enum_members)
+
+    fields = spec_fields(spec)
+    ws = wb.create_sheet("Models")
+    width = len(MODEL_HEADER) + 1
+    for m in range(spec.model_count):
+        rows = [(name, field_type, "", name == "Id") for name, field_type in fields]
+        add_table(ws, f"Model{m}", MODEL_HEADER, rows, start_col=1 + m * width)
+
+    strings = [f"str_{i}_{'x' * (i % 17)}" for i in range(max(spec.string_cardinality, 1))]
+    for m in range(spec.model_count):
+        data = wb.create_sheet(f"Model{m}")
+        data.append([name for name, _ in fields])
+        for r in range(spec.row_count):
+            data.append([r + 1] + [_cell_value(rnd, field_type, spec, strings) for _, field_type in fields[1:]])
+    wb.save(path)
+    return path, spec.model_count * spec.row_count
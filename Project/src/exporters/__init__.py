@@ -1,3 +1,21 @@
-from .json_exporter import JSONExporter
-from .binary_exporter import BinaryExporter
-from .base import BaseDataExporter
\ No newline at end of file
+# 包内类按需导入：import exporters.factory 等不会连带加载所有导出器
+# （JSONExporter 读取工作簿时才导入 openpyxl）
+import importlib
+
+_EXPORTS = {
+    "JSONExporter": ".json_exporter",
+    "BinaryExporter": ".binary_exporter",
+    "ColumnarExporter": ".columnar_exporter",
+    "StringPool": ".string_pool",
+    "BaseDataExporter": ".base",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
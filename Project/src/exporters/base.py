@@ -3,13 +3,61 @@ from abc import ABC, abstractmethod
 
 class BaseDataExporter(ABC):
     file_ext: str = "data"
+    # validation.RowValidator；设置后 iter_tables 的行流会经过它收集校验信息
+    validator = None
 
+    @classmethod
     @abstractmethod
-    def export_data(self, file_path, models, enums):
-        """解析 Excel 数据，返回 dict"""
+    def from_options(cls, string_pool=None, json_style="pretty", strict=True, model_map=None):
+        """由 exporters.factory 按命令行选项构造；各导出器只取用自己支持的选项"""
         pass
 
     @abstractmethod
-    def write_file(self, data_dict, output_dir):
-        """写入文件"""
+    def iter_tables(self, source, models, enums):
+        """
+        流式解析 Excel 数据
+        逐个 yield (model, rows)，rows 为转换后行（按字段顺序的 tuple）的生成器；
+        必须先消费完 rows 再取下一个表
+        """
+        pass
+
+    @abstractmethod
+    def write_tables(self, tables, output_dir):
+        """
+        流式写入：tables 为 (model_name, rows) 的可迭代对象
+        返回 {model_name: 输出文件名}
+        """
+        pass
+
+    def write_mapping(self, mapping, output_dir):
+        """写入表名 -> 文件名映射，默认不生成"""
         pass
+
+    def export_stream(self, source, models, enums, output_dir):
+        """边读边写，不在内存中保留整张表"""
+        tables = (
+            (model.name, rows)
+            for model, rows in self.iter_tables(source, models, enums)
+        )
+        mapping = self.write_tables(tables, output_dir)
+        self.write_mapping(mapping, output_dir)
+        return mapping
+
+    def export_data(self, source, models, enums):
+        """
+        解析 Excel 数据，返回 {model_name: [dict 行]}；source 为文件路径或 WorkbookSession
+        兼容旧的一次性接口：iter_tables 内部的 tuple 行在此按字段名转换
+        """
+        from .json_writers import named_rows
+        return {
+            model.name: list(named_rows(rows, [f.name for f in model.fields]))
+            for model, rows in self.iter_tables(source, models, enums)
+        }
+
+    def write_file(self, data_dict, output_dir):
+        """写入 export_data 返回的 {model_name: [dict 行]}（dict 的键按字段顺序）"""
+        from .json_writers import tuple_rows
+        mapping = self.write_tables(
+            ((model_name, tuple_rows(rows)) for model_name, rows in data_dict.items()), output_dir)
+        self.write_mapping(mapping, output_dir)
+        return mapping
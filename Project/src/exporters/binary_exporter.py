@@ -1,44 +1,102 @@
 # exporters/bin_exporter.py
 import os
-import struct
 from .base import BaseDataExporter
+from .binary_layout import PackError, TableLayout
+from .binary_table import BinaryTableReader, write_table
 from .json_exporter import JSONExporter
+from .string_pool import RemapPool
+
+class _RowLocator:
+    """
+    未挂 RowValidator 时代替它接入 JSONExporter.iter_tables：行原样透传，
+    只记录各表的 sheet 与 Excel 行号，打包失败时据此定位单元格
+    """
+
+    def __init__(self):
+        self.tables = {}   # {model_name: (sheet, row_numbers)}
+
+    def observe(self, model, sheet, rows, row_numbers):
+        self.tables[model.name] = (sheet, row_numbers)
+        return rows
+
 
 class BinaryExporter(BaseDataExporter):
     file_ext = "bin"
 
-    def export_data(self, file_path, models, enums):
+    def __init__(self, string_pool=None, strict=True, model_map=None):
+        # 全项目的 Model（解析跨工作簿的引用）
+        self.model_map = dict(model_map or {})
+        self.models = dict(self.model_map)
+        # 不为 None 时 string / string[] 字段写为池下标
+        self.string_pool = string_pool
+        # 未知枚举值报错（见 JSONExporter）
+        self.strict = strict
+        self.locator = _RowLocator()
+
+    @classmethod
+    def from_options(cls, string_pool=None, json_style="pretty", strict=True, model_map=None):
+        return cls(string_pool, strict, model_map)
+
+    def iter_tables(self, source, models, enums):
+        # 记录 schema，写文件时按字段类型编码
+        self.models = {**self.model_map, **{model.name: model for model in models}}
         # 复用 JSONExporter 解析 Excel
-        return JSONExporter().export_data(file_path, models, enums)
+        reader = JSONExporter(strict=self.strict, model_map=self.models)
+        self.locator = _RowLocator()
+        reader.validator = self.validator or self.locator
+        return reader.iter_tables(source, models, enums)
+
+    def layout_for(self, model_name, models=None, string_pool=None):
+        models = models if models is not None else self.models
+        model = models.get(model_name)
+        if model is None:
+            raise ValueError(f"缺少 Model 定义，无法按 schema 导出二进制: {model_name}")
+        # 挂了校验器时非法值按默认值写出、由校验报告带坐标列出；否则打包时直接报错
+        return TableLayout(model, models, string_pool if string_pool is not None else self.string_pool,
+                           lenient=self.validator is not None)
 
-    def write_file(self, data_dict, output_dir):
+    def write_table(self, layout, rows, f):
+        write_table(layout, rows, f)
+
+    def read_rows(self, buf, layout):
+        """读回整表的行（按字段顺序的值），池化字段为池下标"""
+        return list(BinaryTableReader(buf, layout))
+
+    def write_tables(self, tables, output_dir):
         os.makedirs(output_dir, exist_ok=True)
-        for model_name, data_list in data_dict.items():
-            out_file = os.path.join(output_dir, f"DT_{model_name}.{self.file_ext}")
-            with open(out_file, "wb") as f:
-                for row in data_list:
-                    for value in row.values():
-                        if isinstance(value, int):
-                            f.write(struct.pack("<i", value))
-                        elif isinstance(value, float):
-                            f.write(struct.pack("<f", value))
-                        elif isinstance(value, str):
-                            encoded = value.encode("utf-8")
-                            f.write(struct.pack("<I", len(encoded)))
-                            f.write(encoded)
-                        elif isinstance(value, list):
-                            f.write(struct.pack("<I", len(value)))
-                            for e in value:
-                                if isinstance(e, int):
-                                    f.write(struct.pack("<i", e))
-                                elif isinstance(e, float):
-                                    f.write(struct.pack("<f", e))
-                                elif isinstance(e, str):
-                                    encoded = e.encode("utf-8")
-                                    f.write(struct.pack("<I", len(encoded)))
-                                    f.write(encoded)
-                                else:
-                                    raise TypeError(f"不支持的列表元素类型: {type(e)}")
-                        else:
-                            raise TypeError(f"不支持的数据类型: {type(value)}")
+        mapping = {}
+        for model_name, rows in tables:
+            layout = self.layout_for(model_name)
+            out_file_name = f"DT_{model_name}.{self.file_ext}"
+            out_file = os.path.join(output_dir, out_file_name)
+            try:
+                with open(out_file, "wb") as f:
+                    self.write_table(layout, rows, f)
+            except PackError as err:
+                raise ValueError(f"{self._locate(model_name, layout, err)} {err}（未校验时不按默认值写出）") from None
+            mapping[model_name] = out_file_name
             print(f"导出 DataTable {model_name} 到 {out_file}")
+        return mapping
+
+    def _locate(self, model_name, layout, err):
+        """PackError -> [sheet!单元格]；没有行号记录（如 write_file）时退回 [Model.字段]"""
+        sheet, row_numbers = self.locator.tables.get(model_name, (model_name, None))
+        if row_numbers is None or err.row is None or err.row >= len(row_numbers):
+            return f"[{model_name}.{err.field}]"
+        from openpyxl.utils import get_column_letter
+        return f"[{sheet}!{get_column_letter(layout.names.index(err.field) + 1)}{row_numbers[err.row]}]"
+
+    def remap_strings(self, output_dir, mapping, models, remap):
+        """
+        把已写出表中的池下标按 remap 改写为全局池下标
+        并行导出时各工作簿的新字符串在本地池中编号，合并时需要重写
+        models 为该工作簿的 Model；跨工作簿的引用按 self.model_map（全项目）解析
+        """
+        models = {**self.model_map, **{model.name: model for model in models}}
+        for model_name, out_file_name in mapping.items():
+            layout = self.layout_for(model_name, models, RemapPool(remap))
+            out_file = os.path.join(output_dir, out_file_name)
+            with open(out_file, "rb") as f:
+                rows = self.read_rows(f.read(), layout)
+            with open(out_file, "wb") as f:
+                self.write_table(layout, rows, f)
@@ -0,0 +1,481 @@
+# exporters/binary_layout.py
+# 由 ModelDef 字段类型决定的二进制布局（小端）：
+#   int      int32
+#   float    float32
+#   bool     uint8 (0/1)
+#   string   uint32 字节长度 + UTF-8；启用字符串池时为 uint32 池下标（主键除外）
+#   Enum     按 underlying 宽度的整数
+#   Custom   被引用 Model 的主键类型（无主键时 int32）
+#   T[]      uint32 元素个数 + 逐个元素
+# None 写为该类型的默认值；无法转换或超出范围的值见 fallback_coerce
+import struct
+from operator import itemgetter
+
+from schema.index import KeyCycleError, resolve_key_type
+from schema.types import BasicType, EnumType, ArrayType, CustomType
+from .converters import TRUE_STRINGS
+
+STRING = "string"
+ARRAY = "array"
+
+BASIC_FORMATS = {
+    "int": "i",
+    "float": "f",
+    "bool": "?",
+}
+
+ENUM_FORMATS = {
+    "byte": "B",
+    "sbyte": "b",
+    "short": "h",
+    "ushort": "H",
+    "int": "i",
+    "uint": "I",
+    "long": "q",
+    "ulong": "Q",
+}
+
+_U32 = struct.Struct("<I")
+
+
+def _to_int(v):
+    if v is None:
+        return 0
+    return int(v)
+
+
+def _to_float(v):
+    if v is None:
+        return 0.0
+    return float(v)
+
+
+def _to_bool(v):
+    if isinstance(v, str):
+        return v.strip().lower() in TRUE_STRINGS
+    return bool(v)
+
+
+def _to_str(v):
+    if v is None:
+        return ""
+    return v if isinstance(v, str) else str(v)
+
+
+SCALAR_COERCE = {
+    "i": _to_int, "I": _to_int, "b": _to_int, "B": _to_int,
+    "h": _to_int, "H": _to_int, "q": _to_int, "Q": _to_int,
+    "f": _to_float,
+    "?": _to_bool,
+}
+
+
+def _in_range(fmt, convert):
+    """转换后再检查 fmt 的取值范围，超出范围同样抛 ValueError"""
+    check = struct.Struct("<" + fmt).pack
+
+    def coerce(v):
+        v = convert(v)
+        try:
+            check(v)
+        except (struct.error, OverflowError) as err:
+            raise ValueError(f"{v!r} 超出 {fmt} 的取值范围") from err
+        return v
+    return coerce
+
+
+# SCALAR_COERCE 转换后仍无法打包（超出范围）时使用；逐值检查，只在这种少见情况下调用
+CHECKED_COERCE = {fmt: _in_range(fmt, convert) for fmt, convert in SCALAR_COERCE.items() if fmt != "?"}
+CHECKED_COERCE["?"] = _to_bool
+
+
+class PackError(ValueError):
+    """
+    单元格值（"abc" 写入 int 列、超出范围等）无法按字段布局写出
+    row: 出错的行在本表中的序号（从 0 起），由写表函数补上
+    """
+
+    def __init__(self, field, value, row=None):
+        super().__init__(field, value)
+        self.field = field
+        self.value = value
+        self.row = row
+
+    def __str__(self):
+        return f"字段 {self.field} 的值 {self.value!r} 无法写出"
+
+
+def fallback_coerce(fmt, field, lenient):
+    """
+    逐值转换的最后一步
+    lenient 时非法值按字段默认值写出（错误由 validation.RowValidator 带坐标记录），
+    否则抛 PackError，不静默写默认值
+    """
+    check = CHECKED_COERCE[fmt]
+    default = SCALAR_COERCE[fmt](None)
+
+    def coerce(v):
+        try:
+            return check(v)
+        except (TypeError, ValueError, OverflowError):
+            if lenient:
+                return default
+            raise PackError(field, v) from None
+    return coerce
+
+
+class FieldLayout:
+    """
+    单个字段（或数组元素）的线格式
+        kind:    struct 格式字符（定长标量）/ "string" / "array"
+        element: 数组元素的 FieldLayout
+        pooled:  字符串以字符串池下标（kind 为 "I"）存储
+    """
+
+    __slots__ = ("name", "kind", "element", "pooled")
+
+    def __init__(self, name, kind, element=None, pooled=False):
+        self.name = name
+        self.kind = kind
+        self.element = element
+        self.pooled = pooled
+
+    @property
+    def is_fixed(self):
+        return self.kind not in (STRING, ARRAY)
+
+    @property
+    def size(self):
+        """定长字段的字节数"""
+        return struct.calcsize("<" + self.kind)
+
+    def describe(self):
+        """布局描述字符串，如 i / string / array<string>"""
+        if self.kind == ARRAY:
+            return f"array<{self.element.describe()}>"
+        if self.pooled:
+            return "pool"
+        return self.kind
+
+    def __repr__(self):
+        return f"FieldLayout({self.name!r}, {self.describe()!r})"
+
+
+def field_layout(name, field_type, model_map=None, pooled=False):
+    """SchemaType -> FieldLayout；pooled 时字符串按池下标存储"""
+    if isinstance(field_type, ArrayType):
+        return FieldLayout(name, ARRAY, field_layout(name, field_type.element_type, model_map, pooled))
+    if isinstance(field_type, EnumType):
+        return FieldLayout(name, ENUM_FORMATS.get((field_type.underlying or "int").lower(), "i"))
+    if isinstance(field_type, CustomType):
+        # 引用另一张表：按其主键类型存储；无法确定主键类型（未知、无主键、成环）时按 int32
+        try:
+            key_type = resolve_key_type(model_map or {}, field_type.name)
+        except KeyCycleError:
+            key_type = None
+        if key_type is None:
+            return FieldLayout(name, "i")
+        return field_layout(name, key_type, model_map, pooled)
+    kind = STRING
+    if isinstance(field_type, BasicType):
+        kind = BASIC_FORMATS.get(field_type.name.lower(), STRING)
+    if kind == STRING and pooled:
+        return FieldLayout(name, "I", pooled=True)
+    return FieldLayout(name, kind)
+
+
+def _interner(layout, index):
+    """池化字段的值转换：字符串 -> 池下标，数组逐元素转换"""
+    if layout.kind != ARRAY:
+        return index
+    convert = _interner(layout.element, index)
+    return lambda value: [convert(e) for e in value or ()]
+
+
+def _contains_pooled(layout):
+    while layout.kind == ARRAY:
+        layout = layout.element
+    return layout.pooled
+
+
+def _tuple_getter(indices):
+    """itemgetter 在单个下标时返回标量，这里统一返回 tuple"""
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda values: (values[index],)
+    return itemgetter(*indices)
+
+
+def _fixed_packer(layouts, lenient=False):
+    """
+    定长字段序列的打包函数 (args) -> bytes
+    快路径直接交给 struct 校验；类型不符（None、float 写 int 列等）时逐个转换后重试，
+    仍无法打包的值交给 fallback_coerce
+    bool 字段始终先转换，避免字符串 "false" 被当成真值
+    """
+    kinds = [layout.kind for layout in layouts]
+    packer = struct.Struct("<" + "".join(kinds)).pack
+    coercers = tuple(SCALAR_COERCE[kind] for kind in kinds)
+    fallbacks = tuple(fallback_coerce(layout.kind, layout.name, lenient) for layout in layouts)
+    bool_positions = tuple(i for i, kind in enumerate(kinds) if kind == "?")
+
+    def pack(args):
+        if bool_positions:
+            args = list(args)
+            for i in bool_positions:
+                args[i] = _to_bool(args[i])
+        try:
+            return packer(*args)
+        except (struct.error, TypeError, OverflowError):
+            try:
+                return packer(*[coerce(a) for coerce, a in zip(coercers, args)])
+            except (struct.error, TypeError, ValueError, OverflowError):
+                return packer(*[coerce(a) for coerce, a in zip(fallbacks, args)])
+    return pack
+
+
+def _value_encoder(layout, lenient=False):
+    """生成单个值的编码函数 (value, out: bytearray) -> None"""
+    pack_len = _U32.pack
+
+    if layout.kind == STRING:
+        def encode(value, out):
+            data = (value if value.__class__ is str else _to_str(value)).encode("utf-8")
+            out += pack_len(len(data))
+            out += data
+        return encode
+
+    if layout.kind == ARRAY:
+        element = layout.element
+        if element.is_fixed:
+            fmt = element.kind
+            coerce = SCALAR_COERCE[fmt]
+            fallback = fallback_coerce(fmt, element.name, lenient)
+            packers = {}
+
+            def encode(value, out):
+                items = value or ()
+                n = len(items)
+                out += pack_len(n)
+                if not n:
+                    return
+                packer = packers.get(n)
+                if packer is None:
+                    packer = packers[n] = struct.Struct(f"<{n}{fmt}").pack
+                if fmt == "?":
+                    items = [_to_bool(e) for e in items]
+                try:
+                    out += packer(*items)
+                except (struct.error, TypeError, OverflowError):
+                    try:
+                        out += packer(*map(coerce, items))
+                    except (struct.error, TypeError, ValueError, OverflowError):
+                        out += packer(*map(fallback, items))
+            return encode
+
+        encode_elem = _value_encoder(element, lenient)
+
+        def encode(value, out):
+            items = value or ()
+            out += pack_len(len(items))
+            for item in items:
+                encode_elem(item, out)
+        return encode
+
+    pack = _fixed_packer((layout,), lenient)
+
+    def encode(value, out):
+        out += pack((value,))
+    return encode
+
+
+def _value_decoder(layout):
+    """生成单个值的解码函数 (buf, pos) -> (value, new_pos)"""
+    unpack_len = _U32.unpack_from
+
+    if layout.kind == STRING:
+        def decode(buf, pos):
+            (n,) = unpack_len(buf, pos)
+            pos += 4
+            return str(buf[pos:pos + n], "utf-8"), pos + n
+        return decode
+
+    if layout.kind == ARRAY:
+        element = layout.element
+        if element.is_fixed:
+            fmt = element.kind
+            size = element.size
+
+            def decode(buf, pos):
+                (n,) = unpack_len(buf, pos)
+                pos += 4
+                return list(struct.unpack_from(f"<{n}{fmt}", buf, pos)), pos + n * size
+            return decode
+
+        decode_elem = _value_decoder(element)
+
+        def decode(buf, pos):
+            (n,) = unpack_len(buf, pos)
+            pos += 4
+            items = []
+            for _ in range(n):
+                item, pos = decode_elem(buf, pos)
+                items.append(item)
+            return items, pos
+        return decode
+
+    unpacker = struct.Struct("<" + layout.kind)
+
+    def decode(buf, pos):
+        return unpacker.unpack_from(buf, pos)[0], pos + unpacker.size
+    return decode
+
+
+class RowLayout:
+    """
+    一个 Model 各字段的线格式，不编译编解码函数
+    代码生成与 schema 指纹只需要这一部分（见 backends.codegen）
+    """
+
+    def __init__(self, model, model_map=None, pooled=False):
+        """pooled: 非主键的 string 字段按字符串池下标存储"""
+        self.model = model
+        self.fields = tuple(
+            field_layout(field.name, field.type, model_map, pooled and not field.is_primary)
+            for field in model.fields
+        )
+        self.names = tuple(layout.name for layout in self.fields)
+
+    def describe(self):
+        """[(字段名, 布局描述)]，供代码生成与测试对照"""
+        return [(layout.name, layout.describe()) for layout in self.fields]
+
+
+class TableLayout(RowLayout):
+    """
+    一个 Model 的行布局及其编解码
+    相邻的定长字段合并为一个预编译的 struct.Struct，一次 pack；
+    变长字段（string / 数组）逐个编码
+    """
+
+    def __init__(self, model, model_map=None, string_pool=None, lenient=False):
+        """
+        string_pool: 提供 index(value) 的字符串池；非主键的 string 字段按池下标存储
+        lenient: 非法单元格值按默认值写出（挂了 RowValidator、错误另有报告时使用）；
+                 默认抛 PackError
+        """
+        super().__init__(model, model_map, string_pool is not None)
+        self.lenient = lenient
+        self._interners = tuple(
+            (i, _interner(layout, string_pool.index))
+            for i, layout in enumerate(self.fields)
+            if _contains_pooled(layout)
+        )
+        self._encoders = tuple(self._compile_segments())
+        self._decoders = tuple(self._compile_decoders())
+        # 每个字段所在的解码段：解码单个字段时只需运行到该段为止
+        self._field_segment = tuple(self._segment_numbers())
+
+    def _compile_segments(self):
+        run = []
+        for index, layout in enumerate(self.fields):
+            if layout.is_fixed:
+                run.append((index, layout))
+                continue
+            if run:
+                yield self._fixed_run_encoder(run)
+                run = []
+            yield self._var_encoder(index, layout)
+        if run:
+            yield self._fixed_run_encoder(run)
+
+    def _fixed_run_encoder(self, run):
+        """相邻定长字段：一次取值、一次 struct.pack"""
+        getter = _tuple_getter([index for index, _ in run])
+        pack = _fixed_packer([layout for _, layout in run], self.lenient)
+
+        def encode(values, out):
+            out += pack(getter(values))
+        return encode
+
+    def _var_encoder(self, index, layout):
+        encode_value = _value_encoder(layout, self.lenient)
+
+        def encode(values, out):
+            encode_value(values[index], out)
+        return encode
+
+    def _compile_decoders(self):
+        """与 _compile_segments 对称：定长段一次 unpack_from，变长字段逐个解码"""
+        run = []
+        for layout in self.fields:
+            if layout.is_fixed:
+                run.append(layout)
+                continue
+            if run:
+                yield self._fixed_run_decoder(run)
+                run = []
+            yield self._var_decoder(layout)
+        if run:
+            yield self._fixed_run_decoder(run)
+
+    @staticmethod
+    def _fixed_run_decoder(run):
+        unpacker = struct.Struct("<" + "".join(layout.kind for layout in run))
+        unpack_from = unpacker.unpack_from
+        size = unpacker.size
+
+        def decode(buf, pos, values):
+            values.extend(unpack_from(buf, pos))
+            return pos + size
+        return decode
+
+    @staticmethod
+    def _var_decoder(layout):
+        decode_value = _value_decoder(layout)
+
+        def decode(buf, pos, values):
+            value, pos = decode_value(buf, pos)
+            values.append(value)
+            return pos
+        return decode
+
+    def _segment_numbers(self):
+        segment = -1
+        in_run = False
+        for layout in self.fields:
+            if not (layout.is_fixed and in_run):
+                segment += 1
+            in_run = layout.is_fixed
+            yield segment
+
+    def encode_row(self, values, out):
+        """values: 按字段顺序的值序列；编码追加到 out (bytearray)"""
+        for encode in self._encoders:
+            encode(values, out)
+
+    def decode_row(self, buf, pos=0):
+        """从 buf 的 pos 处解码一行，返回 (按字段顺序的值列表, 行结束位置)"""
+        values = []
+        for decode in self._decoders:
+            pos = decode(buf, pos, values)
+        return values, pos
+
+    def decode_field(self, buf, pos, index):
+        """只解码一行中的第 index 个字段（其后的字段不解码），返回其值"""
+        values = []
+        for decode in self._decoders[:self._field_segment[index] + 1]:
+            pos = decode(buf, pos, values)
+        return values[index]
+
+    def row_values(self, row):
+        """导出行（按字段顺序的 tuple）-> 编码用的值（行比字段短时补 None；池化字段已转换为池下标）"""
+        missing = len(self.fields) - len(row)
+        if missing > 0:
+            row = (*row, *(None,) * missing)
+        if not self._interners:
+            return row
+        values = list(row)
+        for i, intern in self._interners:
+            values[i] = intern(values[i])
+        return values
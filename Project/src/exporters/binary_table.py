@@ -0,0 +1,242 @@
+# exporters/binary_table.py
+# 带索引的二进制 DataTable 容器格式（小端）
+#
+#   Header（HEADER.size 字节）
+#       magic        4s   b"D2CT"
+#       version      u16
+#       key_kind     u16  主键索引类型：0 无 / 1 整数 / 2 字符串
+#       fingerprint  8s   schema 指纹（字段名与布局的 sha1 前 8 字节）
+#       row_count    u32
+#       data_pos     u32  行数据区起点
+#       offsets_pos  u32  行偏移表：row_count 个 u32，相对 data_pos
+#       index_pos    u32  主键索引
+#       index_count  u32  索引条目数
+#   行数据（按 TableLayout 编码，逐行紧密排列）
+#   行偏移表
+#   主键索引（按主键升序）
+#       整数主键：index_count 个 (key i64, row u32)
+#       字符串主键：index_count 个 (key_pos u32, key_len u32, row u32)，随后是 UTF-8 主键串
+#
+# 读取方可以二分主键索引后直接 seek 到单行，或 mmap 整个文件按需解码
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+
+from .binary_layout import STRING, PackError, _to_str, fallback_coerce
+
+MAGIC = b"D2CT"
+DATA_MAGIC_U32 = struct.unpack("<I", MAGIC)[0]  # 按小端 uint32 读取时的 magic
+FORMAT_VERSION = 1
+
+KEY_NONE = 0
+KEY_INT = 1
+KEY_STRING = 2
+
+INT_KEY_KINDS = frozenset("bBhHiIqQ")
+
+HEADER = struct.Struct("<4sHH8sIIIII")
+INT_INDEX_ENTRY = struct.Struct("<qI")
+STRING_INDEX_ENTRY = struct.Struct("<III")
+OFFSET = struct.Struct("<I")
+
+# 缓冲区超过该大小时整块写出
+FLUSH_SIZE = 1 << 20
+
+
+def schema_fingerprint(layout):
+    """由 Model 名、字段名与线格式计算 8 字节指纹，schema 不一致时读取方可以拒绝"""
+    text = layout.model.name + "|" + ";".join(f"{name}:{desc}" for name, desc in layout.describe())
+    return hashlib.sha1(text.encode("utf-8")).digest()[:8]
+
+
+def primary_key(layout):
+    """返回 (主键字段下标, key_kind)；没有可索引的主键时为 (None, KEY_NONE)"""
+    for index, field in enumerate(layout.model.fields):
+        if not field.is_primary:
+            continue
+        kind = layout.fields[index].kind
+        if kind in INT_KEY_KINDS:
+            return index, KEY_INT
+        if kind == STRING:
+            return index, KEY_STRING
+        return None, KEY_NONE
+    return None, KEY_NONE
+
+
+def _u32_bytes(values):
+    arr = array("I", values)
+    if arr.itemsize != 4:
+        arr = array("L", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _build_index(key_kind, keys):
+    """keys: 按行顺序的主键值 -> 索引字节"""
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    out = bytearray()
+    if key_kind == KEY_INT:
+        pack = INT_INDEX_ENTRY.pack
+        for row in order:
+            out += pack(keys[row], row)
+    elif key_kind == KEY_STRING:
+        pack = STRING_INDEX_ENTRY.pack
+        blob = bytearray()
+        for row in order:
+            out += pack(len(blob), len(keys[row]), row)
+            blob += keys[row]
+        out += blob
+    return bytes(out)
+
+
+def write_table(layout, rows, f):
+    """
+    按容器格式写出一张表；rows 为导出行（按字段顺序的 tuple）的可迭代对象，逐行流式编码
+    f 必须可 seek（结束时回填 Header）；返回写出的字节数
+    """
+    key_index, key_kind = primary_key(layout)
+    if key_kind == KEY_INT:
+        # 与行内打包的值一致：非法主键按默认值写入索引（lenient）或抛 PackError
+        key_layout = layout.fields[key_index]
+        coerce_key = fallback_coerce(key_layout.kind, key_layout.name, layout.lenient)
+    else:
+        def coerce_key(value):
+            return _to_str(value).encode("utf-8")
+
+    start = f.tell()
+    f.write(bytes(HEADER.size))
+    data_pos = HEADER.size
+
+    offsets = []
+    keys = []
+    buf = bytearray()
+    flushed = 0
+    encode_row = layout.encode_row
+    row_values = layout.row_values
+    for row in rows:
+        values = row_values(row)
+        offsets.append(flushed + len(buf))
+        try:
+            if key_kind != KEY_NONE:
+                keys.append(coerce_key(values[key_index]))
+            encode_row(values, buf)
+        except PackError as err:
+            err.row = len(offsets) - 1
+            raise
+        if len(buf) >= FLUSH_SIZE:
+            f.write(buf)
+            flushed += len(buf)
+            buf.clear()
+    f.write(buf)
+    flushed += len(buf)
+
+    offsets_pos = data_pos + flushed
+    offsets_bytes = _u32_bytes(offsets)
+    f.write(offsets_bytes)
+
+    index_pos = offsets_pos + len(offsets_bytes)
+    index_bytes = _build_index(key_kind, keys)
+    f.write(index_bytes)
+    end = f.tell()
+
+    f.seek(start)
+    f.write(HEADER.pack(
+        MAGIC, FORMAT_VERSION, key_kind, schema_fingerprint(layout),
+        len(offsets), data_pos, offsets_pos, index_pos, len(keys),
+    ))
+    f.seek(end)
+    return end - start
+
+
+class BinaryTableReader:
+    """
+    容器格式的读取器（测试与工具用）
+    buf 可以是 bytes 或 mmap；行按需解码，get(key) 二分主键索引
+    """
+
+    def __init__(self, buf, layout):
+        self.buf = buf
+        self.layout = layout
+        (
+            magic, version, self.key_kind, fingerprint, self.row_count,
+            self.data_pos, self.offsets_pos, self.index_pos, self.index_count,
+        ) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("不是 DataTable 二进制文件（magic 不匹配）")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"不支持的 DataTable 格式版本: {version}")
+        if fingerprint != schema_fingerprint(layout):
+            raise ValueError(f"DataTable 与 Model {layout.model.name} 的 schema 不一致")
+
+    @classmethod
+    def open(cls, path, layout):
+        """mmap 打开文件"""
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf, layout)
+
+    def close(self):
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.row_count
+
+    def row(self, i):
+        """第 i 行，按字段顺序的值列表"""
+        if not 0 <= i < self.row_count:
+            raise IndexError(i)
+        (offset,) = OFFSET.unpack_from(self.buf, self.offsets_pos + 4 * i)
+        values, _ = self.layout.decode_row(self.buf, self.data_pos + offset)
+        return values
+
+    def row_dict(self, i):
+        return dict(zip(self.layout.names, self.row(i)))
+
+    def __iter__(self):
+        for i in range(self.row_count):
+            yield self.row(i)
+
+    def _key_at(self, n):
+        """第 n 个索引条目的 (key, row)"""
+        if self.key_kind == KEY_INT:
+            return INT_INDEX_ENTRY.unpack_from(self.buf, self.index_pos + n * INT_INDEX_ENTRY.size)
+        key_pos, key_len, row = STRING_INDEX_ENTRY.unpack_from(
+            self.buf, self.index_pos + n * STRING_INDEX_ENTRY.size)
+        blob = self.index_pos + self.index_count * STRING_INDEX_ENTRY.size
+        return bytes(self.buf[blob + key_pos:blob + key_pos + key_len]), row
+
+    def find(self, key):
+        """主键 -> 行号；不存在返回 None"""
+        if self.key_kind == KEY_NONE:
+            raise KeyError(f"{self.layout.model.name} 没有可索引的主键")
+        if self.key_kind == KEY_STRING:
+            key = _to_str(key).encode("utf-8")
+        lo, hi = 0, self.index_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.index_count:
+            found, row = self._key_at(lo)
+            if found == key:
+                return row
+        return None
+
+    def get(self, key, default=None):
+        """按主键取一行（值列表）"""
+        row = self.find(key)
+        if row is None:
+            return default
+        return self.row(row)
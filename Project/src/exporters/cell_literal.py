@@ -0,0 +1,103 @@
+# exporters/cell_literal.py
+# 嵌套数组单元格的字面量语法（类 JSON）：
+#   [[1, 2], [3]]          int[][]
+#   [1, 2], [3]            最外层方括号可省略
+#   [["a,b", 'c'], [d]]    元素可加单 / 双引号（内含逗号、方括号或首尾空白时需要），反斜杠转义
+# 未加引号的元素去掉首尾空白后原样保留为字符串，由元素类型的转换函数再转换
+# 先整体切分为 token（C 实现的 re.split），再用一个小状态机组装各层列表
+import re
+
+_SPLIT = re.compile(r"([\[\],])")
+# 含引号时逐个匹配：标点 / 双引号串 / 单引号串 / 未加引号的元素
+_TOKEN = re.compile(r"""\s*(?:([\[\],])|"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)'|([^\[\],"']+))""")
+_ESCAPE = re.compile(r"\\(.)")
+
+# 解析状态：下一个 token 可以是
+_VALUE_OR_CLOSE = 0   # 元素或 ]（刚读到 [）
+_VALUE = 1            # 元素（刚读到 ,）
+_SEP_OR_CLOSE = 2     # , 或 ]（刚读完一个元素）
+
+
+def _error(text, message):
+    return ValueError(f"数组字面量 {text!r}: {message}")
+
+
+def _quoted_tokens(text):
+    """含引号的文本 -> token 列表；加引号的元素包成 1 元组，与标点区分"""
+    tokens = []
+    pos = 0
+    end = len(text)
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            if text[pos:].isspace():
+                break
+            raise _error(text, "引号未闭合或多余的引号")
+        punct, double, single, bare = m.groups()
+        if punct is not None:
+            tokens.append(punct)
+        elif bare is not None:
+            tokens.append(bare)
+        else:
+            value = double if double is not None else single
+            tokens.append((_ESCAPE.sub(r"\1", value) if "\\" in value else value,))
+        pos = m.end()
+    return tokens
+
+
+def _parse(text):
+    """text 以 [ 开头（已去首尾空白）；返回 (列表, 最外层 ] 之后是否还有内容)"""
+    tokens = _quoted_tokens(text) if ("'" in text or '"' in text) else _SPLIT.split(text)
+    stack = []
+    current = None
+    expect = _VALUE
+    for i, token in enumerate(tokens):
+        if token == "[":
+            if expect == _SEP_OR_CLOSE:
+                raise _error(text, "缺少 ,")
+            if current is not None:
+                stack.append(current)
+            current = []
+            expect = _VALUE_OR_CLOSE
+        elif token == "]":
+            if expect == _VALUE:
+                current.append("")
+            if not stack:
+                rest = tokens[i + 1:]
+                return current, any(t.__class__ is tuple or t.strip() for t in rest)
+            parent = stack.pop()
+            parent.append(current)
+            current = parent
+            expect = _SEP_OR_CLOSE
+        elif token == ",":
+            if expect != _SEP_OR_CLOSE:
+                current.append("")
+            expect = _VALUE
+        else:
+            if token.__class__ is tuple:
+                value = token[0]
+            else:
+                value = token.strip()
+                if not value:
+                    continue
+            if expect == _SEP_OR_CLOSE or current is None:
+                raise _error(text, "缺少 , 或 ]")
+            current.append(value)
+            expect = _SEP_OR_CLOSE
+    raise _error(text, "缺少 ]")
+
+
+def parse_array_literal(text):
+    """
+    "[[1, 2], [3]]" -> [["1", "2"], ["3"]]
+    省略最外层方括号时（"1, 2" / "[1, 2], [3]"）按整体再包一层解析；格式错误时抛出 ValueError
+    """
+    stripped = text.strip()
+    if stripped.startswith("["):
+        result, trailing = _parse(stripped)
+        if not trailing:
+            return result
+    result, trailing = _parse(f"[{stripped}]")
+    if trailing:
+        raise _error(text, "多余的字符")
+    return result
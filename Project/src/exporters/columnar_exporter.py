@@ -0,0 +1,13 @@
+# exporters/columnar_exporter.py
+from .binary_exporter import BinaryExporter
+from .columnar_table import ColumnarTableReader, write_columns
+
+class ColumnarExporter(BinaryExporter):
+    """按列导出：每个字段一段连续的定长数组，适合只扫描少数几列的大表"""
+    file_ext = "col"
+
+    def write_table(self, layout, rows, f):
+        write_columns(layout, rows, f)
+
+    def read_rows(self, buf, layout):
+        return ColumnarTableReader(buf, layout).records()
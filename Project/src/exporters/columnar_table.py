@@ -0,0 +1,234 @@
+# exporters/columnar_table.py
+# 按列存储的 DataTable 格式（struct-of-arrays，小端）
+#
+#   Header（HEADER.size 字节）
+#       magic         4s   b"D2CC"
+#       version       u16
+#       column_count  u16  与 Model 字段数一致，按字段顺序
+#       fingerprint   8s   schema 指纹，与 binary_table 相同
+#       row_count     u32
+#   列目录：每列 buffer_count u32，随后 buffer_count 个 (pos u32, len u32)，pos 为文件内偏移
+#   数据区：每个 buffer 起点按 ALIGN 字节对齐，可整段 memcpy 成目标语言的数组
+#
+# 每列由一个或多个 buffer 组成，取决于字段布局：
+#   定长标量   [值数组]            int32 / float32 / 枚举按 underlying 宽度
+#   bool       [位图]              第 i 行对应第 i//8 字节的第 i%8 位（低位在前）
+#   string     [偏移, UTF-8 串]    偏移为 row_count+1 个 u32，第 i 个串是 blob[off[i]:off[i+1]]
+#   T[]        [偏移, 元素列...]   偏移为 row_count+1 个 u32 元素下标，元素列按 T 递归展开
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, chain
+
+from .binary_layout import ARRAY, SCALAR_COERCE, STRING, PackError, _to_bool, _to_str, fallback_coerce
+from .binary_table import schema_fingerprint
+
+MAGIC = b"D2CC"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHH8sI")
+BUFFER_COUNT = struct.Struct("<I")
+BUFFER_ENTRY = struct.Struct("<II")
+
+ALIGN = 8
+
+# struct 格式字符 -> array 类型码（两者字节宽度在主流平台一致）
+ARRAY_TYPECODES = {
+    "b": "b", "B": "B", "h": "h", "H": "H",
+    "i": "i", "I": "I", "q": "q", "Q": "Q",
+    "f": "f",
+}
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _array_bytes(arr):
+    if _BIG_ENDIAN:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _offsets_bytes(lengths):
+    """各项长度 -> row_count+1 个 u32 累计偏移"""
+    return _array_bytes(array("I", accumulate(lengths, initial=0)))
+
+
+def _fixed_column(layout, values, lenient=False):
+    kind = layout.kind
+    typecode = ARRAY_TYPECODES[kind]
+    try:
+        arr = array(typecode, values)
+    except (TypeError, ValueError, OverflowError):
+        # None、float 写入整数列、非法单元格值等：逐个转换后重试，仍不行的值交给 fallback_coerce
+        try:
+            arr = array(typecode, map(SCALAR_COERCE[kind], values))
+        except (TypeError, ValueError, OverflowError):
+            fallback = fallback_coerce(kind, layout.name, lenient)
+            arr = array(typecode)
+            for row, value in enumerate(values):
+                try:
+                    arr.append(fallback(value))
+                except PackError as err:
+                    err.row = row
+                    raise
+    return _array_bytes(arr)
+
+
+def _bitset(values):
+    nbytes = (len(values) + 7) // 8
+    if not nbytes:
+        return b""
+    bits = "".join("1" if _to_bool(v) else "0" for v in reversed(values))
+    return int(bits, 2).to_bytes(nbytes, "little")
+
+
+def encode_column(layout, values, buffers, lenient=False):
+    """
+    把一列值按 FieldLayout 编码，依次追加到 buffers
+    lenient 见 TableLayout；抛出的 PackError.row 为该值在 values 中的下标
+    """
+    kind = layout.kind
+    if kind == "?":
+        buffers.append(_bitset(values))
+    elif kind == STRING:
+        encoded = [(v if v.__class__ is str else _to_str(v)).encode("utf-8") for v in values]
+        buffers.append(_offsets_bytes(map(len, encoded)))
+        buffers.append(b"".join(encoded))
+    elif kind == ARRAY:
+        items = [v or () for v in values]
+        buffers.append(_offsets_bytes(map(len, items)))
+        try:
+            encode_column(layout.element, list(chain.from_iterable(items)), buffers, lenient)
+        except PackError as err:
+            # 元素下标 -> 所在的值（行）下标
+            err.row = bisect_right(list(accumulate(map(len, items))), err.row)
+            raise
+    else:
+        buffers.append(_fixed_column(layout, values, lenient))
+    return buffers
+
+
+def _padding(pos):
+    return -pos % ALIGN
+
+
+def write_columns(layout, rows, f):
+    """
+    按列格式写出一张表；rows 为导出行（按字段顺序的 tuple）的可迭代对象
+    列存储需要整列数据，行会先按列收集；返回写出的字节数
+    """
+    row_values = layout.row_values
+    records = [row_values(row) for row in rows]
+    row_count = len(records)
+    if records:
+        columns = list(zip(*records))
+    else:
+        columns = [() for _ in layout.fields]
+    del records
+
+    column_buffers = [
+        encode_column(field, list(values), [], layout.lenient)
+        for field, values in zip(layout.fields, columns)
+    ]
+
+    # 先算目录大小，再顺序排布各 buffer
+    pos = HEADER.size + sum(
+        BUFFER_COUNT.size + BUFFER_ENTRY.size * len(buffers) for buffers in column_buffers
+    )
+    directory = bytearray()
+    placed = []
+    for buffers in column_buffers:
+        directory += BUFFER_COUNT.pack(len(buffers))
+        for data in buffers:
+            pos += _padding(pos)
+            directory += BUFFER_ENTRY.pack(pos, len(data))
+            placed.append((pos, data))
+            pos += len(data)
+
+    start = f.tell()
+    f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(layout.fields), schema_fingerprint(layout), row_count))
+    f.write(directory)
+    written = HEADER.size + len(directory)
+    for offset, data in placed:
+        f.write(bytes(offset - written))
+        f.write(data)
+        written = offset + len(data)
+    return f.tell() - start
+
+
+def _read_array(buf, typecode, pos, length):
+    arr = array(typecode)
+    arr.frombytes(buf[pos:pos + length])
+    if _BIG_ENDIAN:
+        arr.byteswap()
+    return arr
+
+
+class ColumnarTableReader:
+    """
+    列格式的读取器（测试与工具用）
+    column(name) 返回整列：定长列为 array（一次拷贝），其余为 list
+    """
+
+    def __init__(self, buf, layout):
+        self.buf = buf
+        self.layout = layout
+        magic, version, column_count, fingerprint, self.row_count = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("不是列格式 DataTable 文件（magic 不匹配）")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"不支持的列格式版本: {version}")
+        if column_count != len(layout.fields) or fingerprint != schema_fingerprint(layout):
+            raise ValueError(f"DataTable 与 Model {layout.model.name} 的 schema 不一致")
+
+        self._buffers = {}
+        pos = HEADER.size
+        for field in layout.fields:
+            (count,) = BUFFER_COUNT.unpack_from(buf, pos)
+            pos += BUFFER_COUNT.size
+            entries = []
+            for _ in range(count):
+                entries.append(BUFFER_ENTRY.unpack_from(buf, pos))
+                pos += BUFFER_ENTRY.size
+            self._buffers[field.name] = entries
+
+    def __len__(self):
+        return self.row_count
+
+    def column(self, name):
+        field = next((f for f in self.layout.fields if f.name == name), None)
+        if field is None:
+            raise KeyError(name)
+        values, _ = self._decode(field, iter(self._buffers[name]), self.row_count)
+        return values
+
+    def _decode(self, layout, entries, count):
+        kind = layout.kind
+        if kind == "?":
+            pos, length = next(entries)
+            bits = bin(int.from_bytes(self.buf[pos:pos + length], "little"))[2:]
+            bits = bits.zfill(length * 8)[::-1]
+            return [c == "1" for c in bits[:count]], entries
+        if kind == STRING:
+            offsets = _read_array(self.buf, "I", *next(entries))
+            pos, _ = next(entries)
+            blob = self.buf
+            return [
+                str(blob[pos + offsets[i]:pos + offsets[i + 1]], "utf-8")
+                for i in range(count)
+            ], entries
+        if kind == ARRAY:
+            offsets = _read_array(self.buf, "I", *next(entries))
+            flat, entries = self._decode(layout.element, entries, offsets[count] if count else 0)
+            return [list(flat[offsets[i]:offsets[i + 1]]) for i in range(count)], entries
+        return _read_array(self.buf, ARRAY_TYPECODES[kind], *next(entries)), entries
+
+    def records(self):
+        """按行还原为 tuple 列表（与导出行的表示相同）"""
+        return list(zip(*(self.column(name) for name in self.layout.names)))
+
+    def rows(self):
+        """按行还原为 dict 列表"""
+        return [dict(zip(self.layout.names, values)) for values in self.records()]
@@ -0,0 +1,310 @@
+# exporters/converters.py
+# 按字段类型预编译单元格转换函数：每个 ModelDef 只做一次类型分派
+#   Enum      名称 / 数值 -> 枚举值
+#   Custom    按主键引用另一张表：转换为被引用表主键的类型（沿主键引用链解析，成环时报错）
+#   T[]       "a, b, c" 按逗号拆分后逐个转换
+#   T[][]     类 JSON 字面量 "[[1, 2], [3]]"（见 cell_literal），逐层转换
+from schema.index import resolve_key_type
+from schema.types import BasicType, EnumType, ArrayType, CustomType
+from .cell_literal import parse_array_literal
+
+TRUE_STRINGS = frozenset(("1", "true", "yes"))
+
+
+def _identity(value):
+    return value
+
+
+def _to_bool(e):
+    return e.lower() in TRUE_STRINGS if isinstance(e, str) else bool(e)
+
+
+class UnknownEnumValue(ValueError):
+    """
+    严格模式下无法识别的枚举字面量
+    literals: 无法识别的原始值；fallback: 宽松模式下该单元格的导出值
+    """
+
+    def __init__(self, enum_name, literals, fallback):
+        self.enum_name = enum_name
+        self.literals = literals
+        self.fallback = fallback
+        super().__init__(f"未知 {enum_name} 枚举值: {', '.join(map(repr, literals))}")
+
+
+def _is_blank(value):
+    return value is None or (value.__class__ is str and not value.strip())
+
+
+def _enum_converter(enum, strict=False):
+    # 单元格值都可哈希，先查精确匹配表，未命中再走完整解析
+    get = enum.resolver.by_name.get
+    lookup = enum.resolver.lookup
+
+    if strict:
+        def convert(value):
+            found = get(value)
+            if found is None:
+                found = lookup(value)
+                if found is None:
+                    if _is_blank(value):
+                        return 0
+                    raise UnknownEnumValue(enum.name, [value], 0)
+            return found
+        return convert
+
+    def convert(value):
+        if isinstance(value, int):
+            return value
+        elif isinstance(value, str):
+            found = get(value)
+            return lookup(value, 0) if found is None else found
+        else:
+            return 0
+    return convert
+
+
+def _enum_array_converter(enum, strict=False):
+    get = enum.resolver.by_name.get
+    lookup = enum.resolver.lookup
+
+    def convert(value):
+        if not value:
+            return []
+        if value.__class__ is str:
+            literals = [e.strip() for e in value.split(",")]
+        else:
+            literals = value if isinstance(value, (list, tuple)) else [value]
+        items = [get(e) for e in literals]
+        if None in items:
+            items = [lookup(e) if v is None else v for e, v in zip(literals, items)]
+        if None in items:
+            fallback = [0 if v is None else v for v in items]
+            if strict:
+                unknown = [e for e, v in zip(literals, items) if v is None]
+                raise UnknownEnumValue(enum.name, unknown, fallback)
+            return fallback
+        return items
+    return convert
+
+
+def _basic_element_converter(type_name):
+    if type_name == "int":
+        return int
+    elif type_name == "float":
+        return float
+    elif type_name == "bool":
+        return _to_bool
+    else:
+        return str
+
+
+def _to_int_key(value):
+    """整数主键：拒绝 1.5 这样会被 int() 截断的值"""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"不是整数: {value!r}")
+    return int(value)
+
+
+def _key_converter(key_type, strict=False):
+    """引用单元格 -> 被引用表主键类型的值；空单元格为 None（空引用合法）"""
+    if isinstance(key_type, EnumType):
+        convert_enum = _enum_converter(key_type, strict)
+
+        def convert(value):
+            return None if _is_blank(value) else convert_enum(value)
+        return convert
+
+    convert_key = _basic_element_converter(key_type.name)
+    if convert_key is int:
+        convert_key = _to_int_key
+
+    def convert(value):
+        if _is_blank(value):
+            return None
+        return convert_key(value.strip() if value.__class__ is str else value)
+    return convert
+
+
+def _convert_elements(convert_elem, value):
+    """非字符串的数组单元格：已是序列则逐个转换，单个值视为单元素数组"""
+    if isinstance(value, (list, tuple)):
+        return [convert_elem(e) for e in value]
+    return [convert_elem(value)]
+
+
+def _nested_array_converter(convert_elem):
+    """T[][]...：字符串单元格按字面量解析出各层列表，每个元素交给内层数组的转换函数"""
+    def convert(value):
+        if not value:
+            return []
+        if value.__class__ is str:
+            value = parse_array_literal(value)
+        try:
+            return _convert_elements(convert_elem, value)
+        except UnknownEnumValue:
+            return _convert_nested_checked(convert_elem, value)
+    return convert
+
+
+def _convert_nested_checked(convert_elem, value):
+    """内层有未知枚举值：逐个转换，重新抛出的异常带有整个单元格（各层结构完整）的宽松值"""
+    items = value if isinstance(value, (list, tuple)) else [value]
+    fallback = []
+    unknown = []
+    enum_name = None
+    for item in items:
+        try:
+            fallback.append(convert_elem(item))
+        except UnknownEnumValue as e:
+            fallback.append(e.fallback)
+            unknown.extend(e.literals)
+            enum_name = e.enum_name
+    raise UnknownEnumValue(enum_name, unknown, fallback)
+
+
+def _array_converter(array_type, strict=False):
+    """一维数组；元素类型为 Enum / BasicType，其它（无法解析的引用）只拆分不转换"""
+    element_type = array_type.element_type
+
+    if isinstance(element_type, EnumType):
+        return _enum_array_converter(element_type, strict)
+
+    if isinstance(element_type, BasicType):
+        convert_elem = _basic_element_converter(element_type.name)
+    else:
+        convert_elem = _identity
+
+    # 字符串单元格 "a, b, c" 按逗号拆分，按元素类型生成专用的转换函数
+    if convert_elem is int or convert_elem is float:
+        # int() / float() 自带去空白
+        def convert(value):
+            if not value:
+                return []
+            if value.__class__ is str:
+                return list(map(convert_elem, value.split(",")))
+            return _convert_elements(convert_elem, value)
+    elif convert_elem is _to_bool:
+        def convert(value):
+            if not value:
+                return []
+            if value.__class__ is str:
+                return [e.strip().lower() in TRUE_STRINGS for e in value.split(",")]
+            return _convert_elements(convert_elem, value)
+    else:
+        def convert(value):
+            if not value:
+                return []
+            if value.__class__ is str:
+                return [e.strip() for e in value.split(",")]
+            return _convert_elements(convert_elem, value)
+    return convert
+
+
+class TypeCompiler:
+    """
+    一组 Model（通常是全项目的 model_map）共用的转换函数编译器
+    每个类型只编译一次，各字段 / 各表共享；引用按主键类型解析的结果同样缓存
+    """
+
+    def __init__(self, model_map=None, strict=False):
+        self.model_map = model_map or {}
+        self.strict = strict
+        self._converters = {}
+        self._key_types = {}
+
+    def key_type(self, model_name):
+        """
+        按主键引用 model_name 时单元格中的值的类型（schema.index.resolve_key_type）
+        被引用的 Model 未知、没有主键或主键为数组时返回 None；主键引用链成环时抛出 ValueError
+        """
+        if model_name not in self._key_types:
+            self._key_types[model_name] = resolve_key_type(self.model_map, model_name)
+        return self._key_types[model_name]
+
+    def converter(self, field_type):
+        """字段类型 -> 转换函数 value -> 导出值；None 表示原样输出"""
+        name = field_type.name
+        if name not in self._converters:
+            self._converters[name] = self._compile(field_type)
+        return self._converters[name]
+
+    def _compile(self, field_type):
+        if isinstance(field_type, EnumType):
+            return _enum_converter(field_type, self.strict)
+        if isinstance(field_type, CustomType):
+            key_type = self.key_type(field_type.name)
+            return None if key_type is None else _key_converter(key_type, self.strict)
+        if isinstance(field_type, ArrayType):
+            element_type = field_type.element_type
+            if isinstance(element_type, ArrayType):
+                return _nested_array_converter(self.converter(element_type))
+            if isinstance(element_type, CustomType):
+                element_type = self.key_type(element_type.name) or element_type
+            return _array_converter(ArrayType(element_type), self.strict)
+        return None
+
+
+def compile_converter(field_type, strict=False, model_map=None):
+    """
+    为单个字段类型生成转换函数 value -> 导出值
+    BasicType 原样输出，返回 None 表示无需转换
+    strict: 无法识别的枚举值抛出 UnknownEnumValue，否则按 0 导出
+    model_map: {name: ModelDef}，用于解析 CustomType 的主键类型；找不到时引用原样输出
+    """
+    return TypeCompiler(model_map, strict).converter(field_type)
+
+
+class CompiledModel:
+    """
+    ModelDef 预编译结果：
+        names:      字段名 tuple
+        converters: 与 model.fields 一一对应的转换函数 tuple（原样输出的字段为 _identity）
+        active:     仅需要转换的 (列下标, 转换函数)
+    """
+
+    __slots__ = ("names", "converters", "active")
+
+    def __init__(self, model, strict=False, compiler=None):
+        self.names = tuple(field.name for field in model.fields)
+        compiler = compiler or TypeCompiler(strict=strict)
+        compiled = [compiler.converter(field.type) for field in model.fields]
+        self.converters = tuple(c or _identity for c in compiled)
+        self.active = tuple((i, c) for i, c in enumerate(compiled) if c is not None)
+
+    def convert_row(self, row):
+        """原始行 -> 转换后的值列表；行比字段短时只转换已有的列"""
+        values = list(row[:len(self.names)])
+        if len(values) == len(self.names):
+            for i, convert in self.active:
+                values[i] = convert(values[i])
+        else:
+            values = [convert(v) for convert, v in zip(self.converters, values)]
+        return values
+
+    def convert_row_checked(self, row):
+        """
+        逐个字段转换并收集错误（convert_row 抛出异常后调用）
+        返回 (值列表, [(字段下标, 异常)])
+        未知枚举值使用宽松模式的值，其余无法转换的单元格（如 int[] 列中的非数字）为 None
+        """
+        values = []
+        errors = []
+        for i, (convert, v) in enumerate(zip(self.converters, row[:len(self.names)])):
+            try:
+                values.append(convert(v))
+            except UnknownEnumValue as e:
+                values.append(e.fallback)
+                errors.append((i, e))
+            except (ValueError, TypeError) as e:
+                values.append(None)
+                errors.append((i, ValueError(f"{self.names[i]} 无法转换的值 {v!r}: {e}")))
+        return values, errors
+
+
+def compile_model(model, strict=False, model_map=None, compiler=None):
+    """
+    ModelDef -> CompiledModel
+    compiler: 同一组 Model 共用的 TypeCompiler；为 None 时按 model_map 新建
+    """
+    return CompiledModel(model, strict, compiler or TypeCompiler(model_map, strict))
@@ -1,17 +1,47 @@
 # exporters/factory.py
+# 数据导出器按名称注册为 "模块:类"，只在被选中时才导入对应模块（及其依赖）
+import importlib
 
-from .json_exporter import JSONExporter
-from .binary_exporter import BinaryExporter
+DATA_EXPORTERS = {
+    "json": "exporters.json_exporter:JSONExporter",
+    "bin": "exporters.binary_exporter:BinaryExporter",
+    "columnar": "exporters.columnar_exporter:ColumnarExporter",
+}
+ALIASES = {"binary": "bin", "col": "columnar"}
 
-def get_data_exporter(data_type: str):
+
+def load_class(target):
+    """"模块:类" -> 类对象"""
+    module_name, _, class_name = target.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def register_data_exporter(data_type, target):
+    """注册数据导出类型；target 为 "模块:类"，类需提供 from_options"""
+    DATA_EXPORTERS[data_type.lower()] = target
+
+
+def data_exporter_class(data_type: str):
+    data_type = data_type.lower()
+    target = DATA_EXPORTERS.get(ALIASES.get(data_type, data_type))
+    if target is None:
+        raise ValueError(f"未知数据导出类型: {data_type}")
+    cls = load_class(target)
+    # from_options 是类方法，抽象方法未实现时不会因实例化而报错，在选中导出器时检查
+    missing = getattr(cls, "__abstractmethods__", None)
+    if missing:
+        raise TypeError(f"数据导出器 {target} 未实现: {', '.join(sorted(missing))}")
+    return cls
+
+
+def get_data_exporter(data_type: str, string_pool=None, json_style="pretty", strict=True, model_map=None):
     """
     根据类型返回数据导出器
-    data_type: 'json' 或 'bin'
+    data_type: 'json'、'bin' 或 'columnar'
+    string_pool: StringPool，字符串字段按池下标导出（仅二进制格式）
+    json_style: JSON 输出格式 pretty / compact / ndjson
+    strict: 未知枚举值报错；False 时按 0 导出
+    model_map: 全项目 {name: ModelDef}，二进制格式据此确定跨工作簿引用的存储类型
     """
-    data_type = data_type.lower()
-    if data_type == "json":
-        return JSONExporter()
-    elif data_type in ("bin", "binary"):
-        return BinaryExporter()
-    else:
-        raise ValueError(f"未知数据导出类型: {data_type}")
+    return data_exporter_class(data_type).from_options(
+        string_pool=string_pool, json_style=json_style, strict=strict, model_map=model_map)
@@ -1,86 +1,140 @@
 # exporters/json_exporter.py
 import os
 import json
-from openpyxl import load_workbook
 from .base import BaseDataExporter
-from schema.types import BasicType, EnumType, ArrayType, CustomType
+from .converters import TypeCompiler, compile_model
+from .json_writers import JSON_STYLES, get_serializer, named_rows, write_compact_array, write_json_array, write_ndjson
 
 class JSONExporter(BaseDataExporter):
     file_ext = "json"
 
-    def export_data(self, file_path, models, enums):
-        wb = load_workbook(file_path, data_only=True)
-        data_dict = {}
+    def __init__(self, style="pretty", serializer="auto", strict=True, model_map=None):
+        """
+        style: pretty / compact / ndjson，见 json_writers
+        serializer: compact / ndjson 使用的序列化器，auto 时优先 orjson
+        strict: 无法识别的枚举值记为错误（带单元格坐标），整个工作簿读完后一并报告；
+                False 时按 0 导出
+        model_map: 全项目 {name: ModelDef}，引用其它工作簿的 Model 时据此确定主键类型
+        """
+        if style not in JSON_STYLES:
+            raise ValueError(f"未知 JSON 输出格式: {style}，可选 {', '.join(JSON_STYLES)}")
+        self.style = style
+        self.strict = strict
+        self.model_map = dict(model_map or {})
+        self.serializer, self.dumps = get_serializer(serializer)
+        # {model_name: 字段名 tuple}；行在内存中是按字段顺序的 tuple，写出时才与字段名组成对象
+        self.columns = {}
+        if style == "ndjson":
+            self.file_ext = "ndjson"
 
-        for model in models:
-            if model.name not in wb.sheetnames:
-                continue
-            ws = wb[model.name]
-            data_list = []
+    @classmethod
+    def from_options(cls, string_pool=None, json_style="pretty", strict=True, model_map=None):
+        if string_pool is not None:
+            raise ValueError("JSON 导出不支持字符串池，请使用 bin 或 columnar")
+        return cls(style=json_style, strict=strict, model_map=model_map)
 
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if all(v is None for v in row):
+    def iter_tables(self, source, models, enums):
+        # openpyxl 导入较慢，只在真正读取工作簿时导入
+        from schema.workbook import open_session
+        errors = []
+        # 本工作簿的所有表共用一个编译器，同一类型（及引用的主键类型）只编译一次
+        compiler = TypeCompiler({**self.model_map, **{model.name: model for model in models}}, self.strict)
+        with open_session(source) as session:
+            for model in models:
+                ws = session.get_sheet(model.name)
+                if ws is None:
                     continue
-                obj = {}
-                for field, value in zip(model.fields, row):
-                    obj[field.name] = self._convert_value(field.type, value)
-                data_list.append(obj)
-            data_dict[model.name] = data_list
-        return data_dict
+                self.columns[model.name] = tuple(f.name for f in model.fields)
+                if self.validator is None:
+                    yield model, self.iter_rows(ws, model, errors, compiler=compiler)
+                else:
+                    row_numbers = []
+                    rows = self.iter_rows(ws, model, errors, row_numbers, compiler)
+                    yield model, self.validator.observe(model, ws.title, rows, row_numbers)
+            file_path = session.file_path
+        # 所有表读完后统一报告，一次列出全部错误
+        raise_data_errors(file_path, errors)
 
-    def _convert_value(self, field_type, value):
-        if isinstance(field_type, BasicType):
-            return value
-        elif isinstance(field_type, EnumType):
-            if isinstance(value, int):
-                return value
-            elif isinstance(value, str):
-                return field_type.members.get(value, 0)
-            else:
-                return 0
-        elif isinstance(field_type, CustomType):
-            return value
-        elif isinstance(field_type, ArrayType):
-            if not value:
-                return []
-            if isinstance(field_type.element_type, (CustomType, ArrayType)):
-                raise TypeError(f"数组字段 {field_type.name} 不支持自定义类型或嵌套数组")
-            if isinstance(value, str):
-                elems = [e.strip() for e in value.split(",")]
-            else:
-                elems = value
-            converted = []
-            for e in elems:
-                if isinstance(field_type.element_type, BasicType):
-                    if field_type.element_type.name == "int":
-                        converted.append(int(e))
-                    elif field_type.element_type.name == "float":
-                        converted.append(float(e))
-                    elif field_type.element_type.name == "bool":
-                        converted.append(e.lower() in ("1", "true", "yes") if isinstance(e, str) else bool(e))
-                    else:
-                        converted.append(str(e))
-                elif isinstance(field_type.element_type, EnumType):
-                    if isinstance(e, int):
-                        converted.append(e)
-                    else:
-                        converted.append(field_type.element_type.members.get(str(e), 0))
-            return converted
-        else:
-            return value
+    def iter_rows(self, ws, model, errors=None, row_numbers=None, compiler=None):
+        """
+        逐行读取数据 sheet 并转换，yield 每行按字段顺序的值 tuple
+        （行比字段短时 tuple 也较短，与缺少这些键的对象对应）
+        errors: 收集严格模式错误的列表；为 None 时在本表读完后直接报告
+        row_numbers: 不为 None 时，每 yield 一行先追加该行的 Excel 行号（供校验定位单元格）
+        compiler: 共用的 TypeCompiler；为 None 时按 self.model_map 新建
+        """
+        compiled = compile_model(model, self.strict, self.model_map, compiler)
+        convert_row = compiled.convert_row
+        sheet = getattr(ws, "title", model.name)
+        collected = [] if errors is None else errors
+        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            # 跳过空行
+            if row.count(None) == len(row):
+                continue
+            try:
+                values = convert_row(row)
+            except (ValueError, TypeError):
+                values, row_errors = compiled.convert_row_checked(row)
+                if not row_errors:
+                    raise
+                from openpyxl.utils import get_column_letter
+                for col, err in row_errors:
+                    collected.append(f"[{sheet}!{get_column_letter(col + 1)}{row_idx}] {err}")
+            if row_numbers is not None:
+                row_numbers.append(row_idx)
+            yield tuple(values)
+        if errors is None:
+            raise_data_errors(sheet, collected)
+
+    def write_tables(self, tables, output_dir):
+        return self._write_tables(tables, output_dir, self.columns)
 
     def write_file(self, data_dict, output_dir):
+        """
+        export_data 的 dict 行直接写出：字段名取自 dict 本身，
+        不依赖 iter_tables 记录的 self.columns（手工构造的 data_dict 也能写出对象）
+        """
+        mapping = self._write_tables(data_dict.items(), output_dir, {})
+        self.write_mapping(mapping, output_dir)
+        return mapping
+
+    def _write_tables(self, tables, output_dir, columns):
+        """columns: {model_name: 字段名}；不在其中的表的行本身就是 dict"""
         os.makedirs(output_dir, exist_ok=True)
         mapping = {}
-        for model_name, data_list in data_dict.items():
+        for model_name, rows in tables:
             out_file_name = f"DT_{model_name}.{self.file_ext}"
             out_file = os.path.join(output_dir, out_file_name)
-            with open(out_file, "w", encoding="utf-8") as f:
-                json.dump(data_list, f, ensure_ascii=False, indent=4)
+            self.write_rows(rows, out_file, columns.get(model_name))
             mapping[model_name] = out_file_name
             print(f"导出 DataTable {model_name} 到 {out_file}")
+        return mapping
+
+    def write_rows(self, rows, out_file, names=None):
+        """names: 字段名；为 None 时 rows 本身就是 dict（未经 iter_tables 的数据）"""
+        if names is not None:
+            rows = named_rows(rows, names)
+        if self.style == "pretty":
+            with open(out_file, "w", encoding="utf-8") as f:
+                write_json_array(rows, f)
+        else:
+            writer = write_ndjson if self.style == "ndjson" else write_compact_array
+            with open(out_file, "wb") as f:
+                writer(rows, f, self.dumps)
+
+    def write_mapping(self, mapping, output_dir):
+        os.makedirs(output_dir, exist_ok=True)
         # 生成 mapping.json
         mapping_file = os.path.join(output_dir, "_mapping.json")
         with open(mapping_file, "w", encoding="utf-8") as f:
             json.dump(mapping, f, ensure_ascii=False, indent=4)
         print(f"生成映射文件 {mapping_file}")
+
+
+def raise_data_errors(source, errors):
+    """打印全部数据错误并抛出 ValueError；没有错误时什么也不做"""
+    if not errors:
+        return
+    for err in errors:
+        print("数据校验错误:", f"[{source}]{err}")
+    raise ValueError(f"{source} 数据校验失败，共 {len(errors)} 个错误")
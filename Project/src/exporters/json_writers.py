@@ -0,0 +1,88 @@
+# exporters/json_writers.py
+# JSON DataTable 的写出方式
+#   pretty   缩进 4 的数组，与 json.dump(indent=4, ensure_ascii=False) 逐字节一致（默认）
+#   compact  无空白的数组
+#   ndjson   每行一个 JSON 对象，以换行分隔，适合流式读取
+# compact / ndjson 优先使用 orjson（若已安装），否则使用标准库；pretty 始终使用标准库以保证输出不变
+import json
+from itertools import repeat
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+JSON_STYLES = ("pretty", "compact", "ndjson")
+SERIALIZERS = ("auto", "stdlib", "orjson")
+
+# 每累积这么多行写一次文件
+CHUNK_ROWS = 1024
+
+
+def get_serializer(name="auto"):
+    """返回 (实际使用的序列化器名, dumps: obj -> UTF-8 bytes)"""
+    if name not in SERIALIZERS:
+        raise ValueError(f"未知 JSON 序列化器: {name}，可选 {', '.join(SERIALIZERS)}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("未安装 orjson，无法使用 orjson 序列化器")
+    if name in ("auto", "orjson") and orjson is not None:
+        return "orjson", orjson.dumps
+
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), check_circular=False).encode
+
+    def dumps(obj):
+        return encode(obj).encode("utf-8")
+    return "stdlib", dumps
+
+
+def named_rows(rows, names):
+    """tuple 行 -> dict 行，逐行惰性生成，写出后即可回收"""
+    return map(dict, map(zip, repeat(names), rows))
+
+
+def tuple_rows(rows):
+    """named_rows 的逆：键按字段顺序的 dict 行 -> tuple 行"""
+    return map(tuple, map(dict.values, rows))
+
+
+def write_json_array(rows, f, indent=4):
+    """
+    逐行写出 JSON 数组，输出与 json.dump(list(rows), f, ensure_ascii=False, indent=indent)
+    逐字节一致，但不需要先把整张表放进内存
+    """
+    pad = " " * indent
+    first = True
+    for row in rows:
+        text = json.dumps(row, ensure_ascii=False, indent=indent)
+        f.write("[\n" if first else ",\n")
+        f.write(pad + text.replace("\n", "\n" + pad))
+        first = False
+    f.write("[]" if first else "\n]")
+
+
+def _chunks(rows, dumps):
+    chunk = []
+    for row in rows:
+        chunk.append(dumps(row))
+        if len(chunk) >= CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_compact_array(rows, f, dumps):
+    """紧凑 JSON 数组；f 为二进制文件"""
+    f.write(b"[")
+    sep = b""
+    for chunk in _chunks(rows, dumps):
+        f.write(sep + b",".join(chunk))
+        sep = b","
+    f.write(b"]")
+
+
+def write_ndjson(rows, f, dumps):
+    """每行一个 JSON 对象；f 为二进制文件"""
+    for chunk in _chunks(rows, dumps):
+        chunk.append(b"")
+        f.write(b"\n".join(chunk))
@@ -0,0 +1,94 @@
+# exporters/string_pool.py
+# 全局字符串池：string / string[] 字段只存池下标（u32），所有 DataTable 共用一个池文件
+#
+# 池文件格式（小端）
+#   magic    4s   b"D2CS"
+#   version  u16
+#   reserved u16
+#   count    u32
+#   offsets  count+1 个 u32，第 i 个串是 blob[off[i]:off[i+1]]
+#   blob     UTF-8
+#
+# 池只追加：已有字符串的下标在增量构建之间保持不变，缓存命中的表无需重写
+import struct
+from itertools import accumulate
+
+from .binary_layout import _to_str
+from .binary_table import _u32_bytes
+
+MAGIC = b"D2CS"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+
+POOL_FILE = "_strings.bin"
+
+
+class StringPool:
+    """字符串 -> 下标；strings 为已有内容（通常来自上次构建的池文件）"""
+
+    def __init__(self, strings=()):
+        self.strings = list(strings)
+        self._index = {s: i for i, s in enumerate(self.strings)}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def index(self, value):
+        """返回字符串的池下标，不存在时追加"""
+        if value.__class__ is not str:
+            value = _to_str(value)
+        i = self._index.get(value)
+        if i is None:
+            i = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+
+    def merge(self, local_strings, base):
+        """
+        合并另一个池中 base 之后新增的字符串（该池以本池前 base 项为种子）
+        返回下标映射 remap：remap[本地下标] = 全局下标
+        """
+        remap = list(range(base))
+        remap.extend(self.index(s) for s in local_strings)
+        return remap
+
+
+class RemapPool:
+    """把已编码的池下标映射到新池，用于重写暂存表；与 StringPool 接口一致"""
+
+    def __init__(self, remap):
+        self.remap = remap
+
+    def index(self, value):
+        return self.remap[value]
+
+
+def is_identity(remap):
+    return all(i == j for i, j in enumerate(remap))
+
+
+def write_pool(strings, f):
+    encoded = [s.encode("utf-8") for s in strings]
+    f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(encoded)))
+    f.write(_u32_bytes(list(accumulate(map(len, encoded), initial=0))))
+    f.write(b"".join(encoded))
+
+
+def read_pool(buf):
+    """池文件内容 -> 字符串列表"""
+    magic, version, _, count = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("不是字符串池文件（magic 不匹配）")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"不支持的字符串池版本: {version}")
+    offsets = struct.unpack_from(f"<{count + 1}I", buf, HEADER.size)
+    blob = HEADER.size + 4 * (count + 1)
+    return [
+        str(buf[blob + offsets[i]:blob + offsets[i + 1]], "utf-8")
+        for i in range(count)
+    ]
+
+
+def load_pool(path):
+    with open(path, "rb") as f:
+        return read_pool(f.read())
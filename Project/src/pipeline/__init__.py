@@ -0,0 +1,28 @@
+# 包内模块按需导入：import pipeline.build_cache 不会连带加载 schema 索引、zip / XML 解析等
+import importlib
+
+_EXPORTS = {
+    "BuildCache": ".build_cache",
+    "CacheEntry": ".build_cache",
+    "file_digest": ".build_cache",
+    "OutputWriter": ".output_writer",
+    "atomic_open": ".output_writer",
+    "remove_orphans": ".output_writer",
+    "SchemaCache": ".schema_cache",
+    "load_schema_index": ".schema_cache",
+    "WorkbookDigest": ".sheet_digest",
+    "changed_sheets": ".sheet_digest",
+    "workbook_digest": ".sheet_digest",
+    "PollingWatcher": ".watcher",
+    "is_complete": ".watcher",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
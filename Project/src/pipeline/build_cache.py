@@ -0,0 +1,116 @@
+# pipeline/build_cache.py
+# 增量构建缓存：按工作簿内容哈希跳过未变更的文件
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass, field
+
+TOOL_VERSION = "0.1"
+CACHE_FORMAT = 2
+CACHE_FILE = ".data2code_cache"
+
+_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    """文件内容的 sha256（分块读取）"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """单个工作簿的缓存记录"""
+    content_hash: str
+    size: int
+    mtime_ns: int
+    config: tuple
+    models: list = field(default_factory=list)
+    enums: dict = field(default_factory=dict)
+    mapping: dict = field(default_factory=dict)
+    outputs: dict = field(default_factory=dict)  # {相对输出路径: sha256}
+    schema_key: str = ""  # 引用的外部类型摘要，见 SchemaIndex.dependency_key
+    facts: object = None  # validation.WorkbookFacts，跨表校验时无需重读工作簿
+
+
+class BuildCache:
+    """
+    持久化构建缓存，保存在输出目录下
+    键：工作簿路径；命中条件：内容哈希 + 导出配置（数据导出器 / 后端 / 选项 / 工具版本）一致，且记录的输出文件都还在
+    """
+
+    def __init__(self, out_dir, exporter, backend, options=()):
+        self.out_dir = out_dir
+        self.path = os.path.join(out_dir, CACHE_FILE)
+        self.config = (exporter, backend, tuple(options), TOOL_VERSION)
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.files_written = 0
+        self.files_unchanged = 0
+
+    def reset_counters(self):
+        """常驻进程多次导出时，每次导出前清零统计"""
+        self.hits = self.misses = 0
+        self.files_written = self.files_unchanged = 0
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return self
+        if data.get("format") == CACHE_FORMAT:
+            self.entries = data.get("entries", {})
+        return self
+
+    def save(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"format": CACHE_FORMAT, "entries": self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+
+    def lookup(self, file_path, content_hash, schema_key=""):
+        """返回可直接复用的 CacheEntry，否则返回 None"""
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None or entry.content_hash != content_hash or entry.config != self.config:
+            return None
+        if entry.schema_key != schema_key:
+            return None
+        for rel_path in entry.outputs:
+            if not os.path.exists(os.path.join(self.out_dir, rel_path)):
+                return None
+        return entry
+
+    def previous(self, file_path, schema_key=""):
+        """
+        内容已变化、但导出配置与外部依赖未变的上次记录，输出文件都还在
+        watch 模式以它为基础，只重新导出变化的 sheet
+        """
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None or entry.config != self.config or entry.schema_key != schema_key:
+            return None
+        for rel_path in entry.outputs:
+            if not os.path.exists(os.path.join(self.out_dir, rel_path)):
+                return None
+        return entry
+
+    def update(self, file_path, entry):
+        self.entries[os.path.abspath(file_path)] = entry
+
+    def prune(self, file_paths):
+        """删除已不存在的工作簿的记录"""
+        keep = {os.path.abspath(p) for p in file_paths}
+        for key in list(self.entries):
+            if key not in keep:
+                del self.entries[key]
+
+    def report(self):
+        return (
+            f"构建缓存: 工作簿命中 {self.hits} 个，未命中 {self.misses} 个；"
+            f"文件写入 {self.files_written} 个，内容未变跳过 {self.files_unchanged} 个"
+        )
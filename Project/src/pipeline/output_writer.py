@@ -0,0 +1,210 @@
+# pipeline/output_writer.py
+# 输出文件写入
+#   atomic_open   临时文件 + os.replace，崩溃时目标文件要么是旧内容、要么是完整的新内容
+#   OutputWriter  线程池中渲染并写入（或从暂存目录提交）文件，内容不变的文件不覆盖
+#   remove_orphans 删除上次构建产生、本次不再产生的输出（已删除的 Model / Enum / 工作簿）
+# 渲染是纯 Python，受 GIL 限制；线程池的收益主要来自重叠逐文件的 I/O 延迟（网络盘上尤其明显）
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+from .build_cache import file_digest
+
+
+def _tmp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextmanager
+def atomic_open(path, mode="wb", **kwargs):
+    """
+    写模式打开 path 的临时文件，with 块正常结束后原子替换为 path；出错时删除临时文件
+    用法同 open(path, mode, ...)
+    """
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _encode(content):
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+class OutputWriter:
+    """
+    以 root 为根目录写出文件，渲染与写入都在线程池中进行
+    submit / move 立即返回；wait() 等待全部完成，返回 {相对路径: sha256}
+
+    内容与目标文件相同则不写（保持 mtime，避免引擎重新导入资源）
+    atomic=True（默认）：临时文件 + os.replace
+    atomic=False：直接写入（暂存目录中的文件由提交时的 os.replace 保证原子性）
+    threads=1 时在调用线程中顺序执行
+    """
+
+    def __init__(self, root, threads=None, atomic=True, force=False):
+        self.root = root
+        self.atomic = atomic
+        self.force = force
+        self.written = 0
+        self.unchanged = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        if threads != 1:
+            # 默认（threads=1）不导入 concurrent.futures，见 benchmarks/bench_startup.py
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(max_workers=threads)
+        self._pending = []
+        self._dirs = set()
+
+    def _target(self, rel_path):
+        target = os.path.join(self.root, rel_path)
+        directory = os.path.dirname(target)
+        if directory not in self._dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._dirs.add(directory)
+        return target
+
+    def _count(self, written):
+        with self._lock:
+            if written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+
+    def _unchanged(self, target, size, digest):
+        if self.force or not os.path.exists(target):
+            return False
+        return os.path.getsize(target) == size and file_digest(target) == digest
+
+    def _write_file(self, target, data):
+        """写入一个文件（测试与基准可覆盖此方法模拟网络盘延迟）"""
+        if not self.atomic:
+            with open(target, "wb") as f:
+                f.write(data)
+            return
+        with atomic_open(target, "wb") as f:
+            f.write(data)
+
+    def _render_and_write(self, rel_path, render):
+        data = _encode(render())
+        digest = hashlib.sha256(data).hexdigest()
+        target = self._target(rel_path)
+        if self._unchanged(target, len(data), digest):
+            self._count(False)
+        else:
+            self._write_file(target, data)
+            self._count(True)
+        return rel_path, digest
+
+    def _move(self, rel_path, staged):
+        digest = file_digest(staged)
+        target = self._target(rel_path)
+        if self._unchanged(target, os.path.getsize(staged), digest):
+            os.remove(staged)
+            self._count(False)
+        else:
+            os.replace(staged, target)
+            self._count(True)
+        return rel_path, digest
+
+    def _run(self, fn, *args):
+        if self._pool is None:
+            self._pending.append(_Done(fn, args))
+        else:
+            self._pending.append(self._pool.submit(fn, *args))
+
+    def submit(self, rel_path, render):
+        """render() 返回 str（按 UTF-8 写出）或 bytes，在工作线程中调用"""
+        self._run(self._render_and_write, rel_path, render)
+
+    def write(self, rel_path, content):
+        self._run(self._render_and_write, rel_path, lambda: content)
+
+    def move(self, rel_path, staged):
+        """把已写好的文件（同一文件系统上的暂存文件）提交到 rel_path"""
+        self._run(self._move, rel_path, staged)
+
+    def commit_dir(self, stage_dir):
+        """提交暂存目录下的全部文件，相对路径保持不变"""
+        for dirpath, _, filenames in os.walk(stage_dir):
+            rel_dir = os.path.relpath(dirpath, stage_dir)
+            for f in filenames:
+                self.move(os.path.normpath(os.path.join(rel_dir, f)), os.path.join(dirpath, f))
+
+    def wait(self):
+        """等待已提交的任务，返回 {相对路径: sha256}；有任务失败时等全部结束后抛出第一个异常"""
+        pending, self._pending = self._pending, []
+        outputs = {}
+        error = None
+        for future in pending:
+            try:
+                rel_path, digest = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            outputs[os.path.normpath(rel_path)] = digest
+        if error is not None:
+            raise error
+        return outputs
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self.close()
+
+
+class _Done:
+    """threads=1 时在调用线程中立即执行，接口同 Future.result()"""
+
+    def __init__(self, fn, args):
+        self.value = self.error = None
+        try:
+            self.value = fn(*args)
+        except Exception as e:
+            self.error = e
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def remove_orphans(root, previous, current):
+    """
+    删除 previous 中有、current 中没有的输出文件（相对 root 的路径），以及因此变空的目录
+    只删除构建缓存记录过的文件，不碰输出目录中的其它文件；返回删除的相对路径列表
+    """
+    removed = []
+    for rel_path in sorted(set(previous) - set(current)):
+        path = os.path.join(root, rel_path)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        removed.append(rel_path)
+        directory = os.path.dirname(path)
+        while os.path.normpath(directory) != os.path.normpath(root):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+    return removed
@@ -0,0 +1,109 @@
+# pipeline/schema_cache.py
+# schema 索引缓存：每个工作簿的 Enums / Models 原始内容按内容哈希缓存，
+# 未变更的工作簿不再打开 Excel；最近一次建立的索引也一并保存，供工具 / IDE 直接查询
+# 另记录各工作簿的大小 / mtime，二者不变时不重新计算内容哈希（--schema-only 不经过构建缓存）
+import os
+import pickle
+
+from schema.index import SchemaIndex, read_workbook_schema
+from .build_cache import TOOL_VERSION, file_digest
+
+SCHEMA_CACHE_FORMAT = 3
+SCHEMA_CACHE_FILE = ".data2code_schema"
+
+
+class SchemaCache:
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.path = os.path.join(out_dir, SCHEMA_CACHE_FILE)
+        self.workbooks = {}   # {绝对路径: (content_hash, WorkbookSchema)}
+        self.stamps = {}      # {绝对路径: (size, mtime_ns, content_hash)}
+        self.index = None
+        self.reused = 0
+        self.parsed = 0
+
+    def reset_counters(self):
+        self.reused = self.parsed = 0
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return self
+        if data.get("format") == SCHEMA_CACHE_FORMAT and data.get("tool") == TOOL_VERSION:
+            self.workbooks = data.get("workbooks", {})
+            self.stamps = data.get("stamps", {})
+            self.index = data.get("index")
+        return self
+
+    def save(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({
+                "format": SCHEMA_CACHE_FORMAT,
+                "tool": TOOL_VERSION,
+                "workbooks": self.workbooks,
+                "stamps": self.stamps,
+                "index": self.index,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+
+    def content_hash(self, file_path):
+        """
+        工作簿内容哈希与 os.stat 结果，导出与 --schema-only 共用（BuildCache 只记录结果）
+        大小与 mtime 都没变时沿用记录的哈希，否则重新计算并记录
+        """
+        st = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        stamp = self.stamps.get(key)
+        if stamp is not None and stamp[:2] == (st.st_size, st.st_mtime_ns):
+            return stamp[2], st
+        digest = file_digest(file_path)
+        self.stamps[key] = (st.st_size, st.st_mtime_ns, digest)
+        return digest, st
+
+    def workbook_schema(self, file_path, content_hash):
+        key = os.path.abspath(file_path)
+        cached = self.workbooks.get(key)
+        if cached is not None and cached[0] == content_hash:
+            self.reused += 1
+            schema = cached[1]
+            schema.file_path = file_path
+            return schema
+        self.parsed += 1
+        schema = read_workbook_schema(file_path)
+        self.workbooks[key] = (content_hash, schema)
+        return schema
+
+    def retag(self, file_path, content_hash):
+        """工作簿已变化但 Enums / Models 未变（见 sheet_digest）：沿用缓存的 schema，只更新哈希"""
+        key = os.path.abspath(file_path)
+        cached = self.workbooks.get(key)
+        if cached is not None:
+            self.workbooks[key] = (content_hash, cached[1])
+
+    def build_index(self, file_paths, content_hash=None):
+        """
+        按文件顺序建立全项目索引
+        content_hash: file_path -> 哈希，默认使用 self.content_hash（大小 / mtime 不变时不读文件）
+        """
+        content_hash = content_hash or (lambda file_path: self.content_hash(file_path)[0])
+        workbooks = [self.workbook_schema(p, content_hash(p)) for p in file_paths]
+        keep = {os.path.abspath(p) for p in file_paths}
+        for entries in (self.workbooks, self.stamps):
+            for key in list(entries):
+                if key not in keep:
+                    del entries[key]
+        self.index = SchemaIndex.build(workbooks)
+        return self.index
+
+    def report(self):
+        return f"Schema 缓存: 复用 {self.reused} 个工作簿，重新解析 {self.parsed} 个"
+
+
+def load_schema_index(out_dir):
+    """读取上次导出保存的索引，不打开任何 Excel；没有缓存时返回 None"""
+    return SchemaCache(out_dir).load().index
@@ -0,0 +1,111 @@
+# pipeline/sheet_digest.py
+# 工作表级别的变更检测：xlsx 是 zip，每个 sheet 是一个独立的 XML 部件，
+# 中央目录里已有每个部件的 CRC32，无需解压、无需 openpyxl 即可知道哪些 sheet 变了
+#
+# 单元格中的字符串大多存放在共享字符串表（xl/sharedStrings.xml）中，sheet 只存下标。
+# 共享字符串表变化时，只有引用了「内容变化的下标」的 sheet 才算变化
+import re
+import zipfile
+import posixpath
+from dataclasses import dataclass, field
+from xml.etree import ElementTree
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+WORKBOOK_PART = "xl/workbook.xml"
+WORKBOOK_RELS = "xl/_rels/workbook.xml.rels"
+SHARED_STRINGS = "xl/sharedStrings.xml"
+# 这些部件变化时（sheet 增删改名、数字格式等）整个工作簿重新导出
+WORKBOOK_LEVEL_PARTS = (WORKBOOK_PART, WORKBOOK_RELS, "xl/styles.xml")
+
+_SHARED_CELL = re.compile(rb'<c\b[^>]*\bt="s"[^>]*>\s*<v>(\d+)</v>')
+
+
+@dataclass
+class WorkbookDigest:
+    """
+    workbook: 工作簿级部件的 CRC
+    sheets:   {sheet 名: (CRC, 大小)}
+    parts:    {sheet 名: zip 部件名}
+    shared:   共享字符串表（CRC, 字符串列表）
+    """
+    workbook: tuple = ()
+    sheets: dict = field(default_factory=dict)
+    parts: dict = field(default_factory=dict)
+    shared: tuple = (0, ())
+
+
+def _part_path(target):
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _shared_strings(archive):
+    """共享字符串表 -> 字符串列表（忽略注音 rPh，与 openpyxl 一致）"""
+    strings = []
+    with archive.open(SHARED_STRINGS) as f:
+        for _, element in ElementTree.iterparse(f):
+            if element.tag != NS_MAIN + "si":
+                continue
+            parts = []
+            for child in element:
+                if child.tag == NS_MAIN + "t":
+                    parts.append(child.text or "")
+                elif child.tag == NS_MAIN + "r":
+                    parts.extend(t.text or "" for t in child.iter(NS_MAIN + "t"))
+            strings.append("".join(parts))
+            element.clear()
+    return strings
+
+
+def workbook_digest(path):
+    with zipfile.ZipFile(path) as archive:
+        infos = {info.filename: info for info in archive.infolist()}
+        workbook = tuple(
+            (name, infos[name].CRC) if name in infos else (name, None) for name in WORKBOOK_LEVEL_PARTS
+        )
+        rels = {
+            rel.get("Id"): _part_path(rel.get("Target"))
+            for rel in ElementTree.fromstring(archive.read(WORKBOOK_RELS)).iter(NS_PKG_REL + "Relationship")
+        }
+        digest = WorkbookDigest(workbook=workbook)
+        for sheet in ElementTree.fromstring(archive.read(WORKBOOK_PART)).iter(NS_MAIN + "sheet"):
+            part = rels.get(sheet.get(NS_REL + "id"))
+            info = infos.get(part)
+            if info is None:
+                continue
+            digest.parts[sheet.get("name")] = part
+            digest.sheets[sheet.get("name")] = (info.CRC, info.file_size)
+        if SHARED_STRINGS in infos:
+            digest.shared = (infos[SHARED_STRINGS].CRC, _shared_strings(archive))
+    return digest
+
+
+def _referenced_strings(archive, part):
+    return {int(i) for i in _SHARED_CELL.findall(archive.read(part))}
+
+
+def changed_sheets(path, old, new):
+    """
+    对比同一工作簿的两次摘要
+    返回变化的 sheet 名集合；工作簿级部件变化（或无法判断）时返回 None，表示整个工作簿都要重新导出
+    """
+    if old is None or old.workbook != new.workbook:
+        return None
+    changed = {name for name in old.sheets.keys() | new.sheets.keys()
+               if old.sheets.get(name) != new.sheets.get(name)}
+    if old.shared[0] != new.shared[0]:
+        # 未变化的 sheet 只可能引用旧表已有的下标；旧表之外的新下标只会出现在已变化的 sheet 里
+        old_strings, new_strings = old.shared[1], new.shared[1]
+        modified = {i for i, (a, b) in enumerate(zip(old_strings, new_strings)) if a != b}
+        if len(new_strings) < len(old_strings):
+            modified.update(range(len(new_strings), len(old_strings)))
+        if modified:
+            with zipfile.ZipFile(path) as archive:
+                for name in new.sheets.keys() - changed:
+                    if _referenced_strings(archive, new.parts[name]) & modified:
+                        changed.add(name)
+    return changed
@@ -0,0 +1,79 @@
+# pipeline/watcher.py
+# 轮询式目录监视：定期 stat 目录下的工作簿，变化稳定 debounce 秒后才报告，
+# 避免 Excel 保存过程中（先写临时文件再改名）读到半个文件
+import os
+import time
+import zipfile
+
+
+def snapshot(paths):
+    """{路径: (大小, mtime_ns)}；stat 失败（文件正在被替换）的路径跳过"""
+    result = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        result[path] = (st.st_size, st.st_mtime_ns)
+    return result
+
+
+def is_complete(path):
+    """
+    xlsx 的 zip 中央目录在文件末尾写出，能读到说明文件已写完
+    .xls 不是 zip，无从判断，只靠 debounce
+    """
+    if not path.lower().endswith(".xlsx"):
+        return True
+    try:
+        return zipfile.is_zipfile(path)
+    except OSError:
+        return False
+
+
+class PollingWatcher:
+    """
+    list_files: 返回当前全部工作簿路径的函数
+    wait() 阻塞到有变化并且稳定下来，返回变化（新增 / 修改 / 删除）的路径集合
+    ready: 变化的文件是否已完整写出；保存较慢的大文件在两次写入之间可能超过 debounce
+    ready_timeout: 文件停止变化后仍不完整的最长等待（秒），超过后报告并照常返回，不无限等待
+    """
+
+    def __init__(self, list_files, interval=0.2, debounce=0.3, ready=is_complete, ready_timeout=10.0):
+        self.list_files = list_files
+        self.interval = interval
+        self.debounce = debounce
+        self.ready = ready
+        self.ready_timeout = ready_timeout
+        self.state = snapshot(list_files())
+
+    def poll(self):
+        """立即检查一次，返回与上次状态不同的路径集合并更新状态"""
+        current = snapshot(self.list_files())
+        changed = {p for p in current.keys() | self.state.keys() if current.get(p) != self.state.get(p)}
+        self.state = current
+        return changed
+
+    def wait(self):
+        changed = set()
+        last_change = None
+        not_ready_since = None
+        while True:
+            found = self.poll()
+            now = time.monotonic()
+            if found:
+                changed |= found
+                last_change = now
+                not_ready_since = None
+            elif changed and now - last_change >= self.debounce:
+                pending = sorted(p for p in changed if p in self.state and not self.ready(p))
+                if not pending:
+                    return changed
+                if not_ready_since is None:
+                    not_ready_since = now
+                elif now - not_ready_since >= self.ready_timeout:
+                    # 文件不再变化却始终读不出来（损坏、非 xlsx 内容等）：交给导出报错
+                    print(f"工作簿 {self.ready_timeout:g} 秒后仍不完整，照常导出: {', '.join(pending)}")
+                    return changed
+                last_change = now
+            time.sleep(self.interval)
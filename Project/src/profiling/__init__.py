@@ -0,0 +1,15 @@
+import importlib
+
+from .profiler import NULL_PROFILER, Event, NullProfiler, Profiler, active, peak_rss, stage, use
+
+# 报告与 cProfile 相关函数按需导入（pstats / cProfile 只在输出报告时需要）
+_REPORT = ("chrome_trace", "cprofile_to", "format_summary", "profile_stats", "write_chrome_trace")
+__all__ = ["NULL_PROFILER", "Event", "NullProfiler", "Profiler", "active", "peak_rss", "stage", "use", *_REPORT]
+
+
+def __getattr__(name):
+    if name not in _REPORT:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".report", __name__), name)
+    globals()[name] = value
+    return value
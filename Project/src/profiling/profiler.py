@@ -0,0 +1,206 @@
+# profiling/profiler.py
+# 导出流程的分阶段计时：每个阶段记录耗时、行数、单元格数、字节数，可选 tracemalloc 峰值内存
+# 未启用时使用 NULL_PROFILER，各埋点只是一次空的 with，不影响导出性能
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class Event:
+    """一个阶段的一次执行；start 为 perf_counter 秒（同一台机器上各进程可比）"""
+    name: str
+    workbook: str = ""
+    model: str = ""
+    start: float = 0.0
+    duration: float = 0.0
+    pid: int = 0
+    rows: int = 0
+    cells: int = 0
+    bytes: int = 0
+    peak_memory: int = None             # tracemalloc 峰值（字节），未启用时为 None
+    parts: dict = field(default_factory=dict)   # 交错执行的子阶段耗时，如 {"read_convert": 秒, "write": 秒}
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class NullProfiler:
+    """不记录任何内容"""
+    enabled = False
+    pid = None
+
+    def stage(self, name, workbook="", model=""):
+        return _NULL_CONTEXT
+
+    def tables(self, tables, workbook):
+        return ((model.name, rows) for model, rows in tables)
+
+    def table_bytes(self, workbook, mapping, data_dir):
+        pass
+
+    def merge(self, other):
+        pass
+
+    def finish(self):
+        return self
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    """
+    events: 全部阶段记录；工作进程的 Profiler 随结果返回，由主进程 merge
+    peak_rss: {pid: 峰值 RSS 字节}，进程结束前由 finish 记录
+    """
+    enabled = True
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.pid = os.getpid()
+        self.events = []
+        self.peak_rss = {}
+        self._stack = []
+        self._tables = {}
+        self._tracing = memory and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, workbook="", model=""):
+        """with profiler.stage(...) as event: 可在块内设置 event.rows / cells / bytes"""
+        event = Event(name, workbook, model, pid=os.getpid())
+        if self.memory:
+            # 进入子阶段前把父阶段到目前为止的峰值记下，再重置峰值
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak_memory = max(parent.peak_memory or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            event.peak_memory = 0
+        self._stack.append(event)
+        event.start = time.perf_counter()
+        try:
+            yield event
+        finally:
+            event.duration = time.perf_counter() - event.start
+            self._stack.pop()
+            if self.memory:
+                event.peak_memory = max(event.peak_memory, tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent.peak_memory = max(parent.peak_memory or 0, event.peak_memory)
+            self.events.append(event)
+
+    def tables(self, tables, workbook):
+        """
+        包装 iter_tables 的 (model, rows) 流，yield (model_name, rows)
+        每张表一个 "table" 记录：rows 在 next() 内的时间记为 read_convert（读取 + 转换），
+        其余时间记为 write；流式导出时两者交错，非流式时分别在两次遍历中累计
+        """
+        for model, rows in tables:
+            yield model.name, self.rows(rows, workbook, model.name)
+
+    def rows(self, rows, workbook, model):
+        event = self._tables.get((workbook, model))
+        if event is None:
+            event = self._tables[(workbook, model)] = Event("table", workbook, model, pid=os.getpid())
+            event.start = time.perf_counter()
+            self.events.append(event)
+        parts = event.parts
+        clock = time.perf_counter
+        inside = 0.0
+        count = cells = 0
+        begin = clock()
+        it = iter(rows)
+        try:
+            while True:
+                t = clock()
+                try:
+                    row = next(it)
+                except StopIteration:
+                    inside += clock() - t
+                    break
+                inside += clock() - t
+                count += 1
+                cells += len(row)
+                yield row
+        finally:
+            end = clock()
+            parts["read_convert"] = parts.get("read_convert", 0.0) + inside
+            parts["write"] = parts.get("write", 0.0) + (end - begin - inside)
+            event.duration = end - event.start
+            event.rows = max(event.rows, count)
+            event.cells = max(event.cells, cells)
+
+    def table_bytes(self, workbook, mapping, data_dir):
+        """write_tables 返回后，按输出文件大小补全各表的字节数"""
+        for model, file_name in mapping.items():
+            event = self._tables.get((workbook, model))
+            path = os.path.join(data_dir, file_name)
+            if event is not None and os.path.exists(path):
+                event.bytes = os.path.getsize(path)
+
+    def finish(self):
+        """记录本进程的峰值 RSS 并停止由本对象开启的 tracemalloc；工作进程在返回结果前调用"""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        rss = peak_rss()
+        if rss is not None:
+            self.peak_rss[os.getpid()] = rss
+        return self
+
+    def merge(self, other):
+        if other is not None:
+            self.events.extend(other.events)
+            self.peak_rss.update(other.peak_rss)
+
+
+def peak_rss():
+    """本进程的峰值 RSS（字节）；不支持的平台返回 None"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return usage if os.uname().sysname == "Darwin" else usage * 1024
+
+
+_active = NULL_PROFILER
+
+
+def active():
+    """当前生效的 Profiler（未启用时为 NULL_PROFILER）"""
+    return _active
+
+
+@contextmanager
+def use(profiler):
+    """在 with 块内把 profiler 设为当前 Profiler，供深层代码通过 stage() 埋点"""
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+def stage(name, workbook="", model=""):
+    return _active.stage(name, workbook, model)
@@ -0,0 +1,180 @@
+# profiling/report.py
+# 性能统计输出：控制台汇总表、Chrome trace（chrome://tracing / Perfetto 可直接打开）、cProfile 统计文件
+import cProfile
+import json
+import os
+import pstats
+import unicodedata
+from collections import defaultdict
+from contextlib import contextmanager
+
+TOP_MODELS = 10
+
+
+def _mb(value):
+    return f"{value / 1e6:.1f}" if value else "-"
+
+
+def _kb(value):
+    return f"{value / 1e3:.1f}" if value else "-"
+
+
+def _width(text):
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+
+def _row(cells, widths):
+    """第一列左对齐，其余右对齐；按显示宽度补空格（中文占两列）"""
+    out = []
+    for i, (text, width) in enumerate(zip(cells, widths)):
+        pad = " " * max(width - _width(text), 0)
+        out.append(text + pad if i == 0 else pad + text)
+    return "".join(out)
+
+
+def _count(value):
+    return f"{value}" if value else "-"
+
+
+def _aggregate(events):
+    """按阶段名汇总；table 记录的子阶段单独成行（table.read_convert / table.write）"""
+    stages = {}
+    for e in events:
+        keys = [(e.name, e.duration)] + [(f"{e.name}.{part}", t) for part, t in e.parts.items()]
+        for name, seconds in keys:
+            s = stages.setdefault(name, {"count": 0, "seconds": 0.0, "rows": 0, "cells": 0, "bytes": 0, "peak": None})
+            s["count"] += 1
+            s["seconds"] += seconds
+            if name == e.name:
+                s["rows"] += e.rows
+                s["cells"] += e.cells
+                s["bytes"] += e.bytes
+                if e.peak_memory is not None:
+                    s["peak"] = max(s["peak"] or 0, e.peak_memory)
+    return stages
+
+
+def format_summary(profiler):
+    lines = ["", "性能统计（并行时各阶段为各进程耗时之和）"]
+    widths = (24, 6, 12, 10, 12, 12, 14)
+    lines.append(_row(("阶段", "次数", "耗时 ms", "行数", "单元格", "输出 KB", "峰值内存 MB"), widths))
+    stages = _aggregate(profiler.events)
+    for name, s in sorted(stages.items(), key=lambda item: -item[1]["seconds"]):
+        lines.append(_row((
+            name, str(s["count"]), f"{s['seconds'] * 1000:.1f}", _count(s["rows"]),
+            _count(s["cells"]), _kb(s["bytes"]), _mb(s["peak"]),
+        ), widths))
+
+    workbooks = [e for e in profiler.events if e.name == "workbook"]
+    if workbooks:
+        widths = (40, 12, 10, 12)
+        lines.append("")
+        lines.append(_row(("工作簿", "耗时 ms", "行数", "输出 KB"), widths))
+        per_table = defaultdict(lambda: [0, 0])
+        for e in profiler.events:
+            if e.name == "table":
+                per_table[e.workbook][0] += e.rows
+                per_table[e.workbook][1] += e.bytes
+        for e in sorted(workbooks, key=lambda e: -e.duration):
+            rows, size = per_table[e.workbook]
+            lines.append(_row((
+                os.path.basename(e.workbook), f"{e.duration * 1000:.1f}", _count(rows), _kb(size),
+            ), widths))
+
+    tables = sorted((e for e in profiler.events if e.name == "table"), key=lambda e: -e.duration)
+    if tables:
+        widths = (32, 14, 10, 10, 12, 12)
+        lines.append("")
+        lines.append(f"最慢的 {min(len(tables), TOP_MODELS)} 张表")
+        lines.append(_row(("Model", "读取+转换 ms", "写出 ms", "行数", "单元格", "输出 KB"), widths))
+        for e in tables[:TOP_MODELS]:
+            lines.append(_row((
+                e.model, f"{e.parts.get('read_convert', 0) * 1000:.1f}", f"{e.parts.get('write', 0) * 1000:.1f}",
+                _count(e.rows), _count(e.cells), _kb(e.bytes),
+            ), widths))
+
+    if profiler.peak_rss:
+        main_pid = os.getpid()
+        main = profiler.peak_rss.get(main_pid)
+        workers = [rss for pid, rss in profiler.peak_rss.items() if pid != main_pid]
+        text = f"峰值 RSS: 主进程 {_mb(main)} MB"
+        if workers:
+            text += f"，工作进程最大 {_mb(max(workers))} MB（{len(workers)} 个）"
+        lines.append("")
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def chrome_trace(profiler):
+    """Trace Event Format：每个阶段一个完整事件（ph=X），时间单位微秒"""
+    events = profiler.events
+    origin = min((e.start for e in events), default=0.0)
+    main_pid = os.getpid()
+    trace = [
+        {"name": "process_name", "ph": "M", "pid": pid, "tid": pid,
+         "args": {"name": "main" if pid == main_pid else f"worker {pid}"}}
+        for pid in sorted({e.pid for e in events})
+    ]
+    for e in events:
+        args = {k: v for k, v in (
+            ("workbook", e.workbook), ("model", e.model), ("rows", e.rows), ("cells", e.cells),
+            ("bytes", e.bytes), ("peak_memory", e.peak_memory),
+        ) if v}
+        args.update({f"{part}_ms": round(t * 1000, 3) for part, t in e.parts.items()})
+        trace.append({
+            "name": f"{e.name} {e.model}" if e.model else e.name,
+            "cat": e.name,
+            "ph": "X",
+            "ts": round((e.start - origin) * 1e6, 1),
+            "dur": round(e.duration * 1e6, 1),
+            "pid": e.pid,
+            "tid": e.pid,
+            "args": args,
+        })
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(profiler, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(profiler), f, ensure_ascii=False)
+    print(f"生成 Chrome trace {path}")
+
+
+class _CollectedStats:
+    """pstats.Stats 可加载的对象：工作进程返回的原始 stats 字典"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def profile_stats(profile):
+    """结束 cProfile 并取出可 pickle 的 stats 字典（工作进程随结果返回）"""
+    profile.disable()
+    profile.create_stats()
+    return profile.stats
+
+
+@contextmanager
+def cprofile_to(path, collected=None):
+    """
+    path 不为 None 时在 with 块内运行 cProfile，结束后写出 pstats 文件
+    collected: 工作进程返回的 stats 字典列表，块结束时一并合并
+    """
+    if path is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        stats = pstats.Stats(_CollectedStats(profile_stats(profile)))
+        for worker_stats in collected or ():
+            stats.add(_CollectedStats(worker_stats))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        stats.dump_stats(path)
+        print(f"生成 cProfile 统计 {path}（python -m pstats {path} 查看）")
@@ -0,0 +1,5 @@
+# 导出 DataTable（bin / columnar）的只读访问：mmap 打开，按需解码
+# 供 Python 工具、服务端脚本与测试使用，不需要 openpyxl，也不需要把整张表读进内存
+from .rows import RowView, row_view_class
+from .strings import PooledStrings
+from .tables import BinaryTable, ColumnarTable, TableSet, open_table, open_tables
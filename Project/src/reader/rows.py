@@ -0,0 +1,60 @@
+# reader/rows.py
+# 行视图：每个 Model 生成一个 __slots__ 视图类，字段为只读属性
+# 视图只持有 (表, 行号)，首次访问字段时才向表取值；不为每行建 dict
+class RowView:
+    """
+    一行的只读视图，与 namedtuple 类似：辅助方法以下划线开头，避免与字段名冲突
+        row.Name / row["Name"]   字段值
+        row._asdict()            {字段名: 值}
+        row._tuple()             按字段顺序的值 tuple
+    """
+
+    __slots__ = ("_table", "_row", "_values")
+    _fields = ()
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+        self._values = None
+
+    def _load(self):
+        values = self._values
+        if values is None:
+            values = self._values = self._table.row_values(self._row)
+        return values
+
+    def __getitem__(self, name):
+        return self._load()[self._table.field_index[name]]
+
+    def _tuple(self):
+        values = self._load()
+        return tuple(values[i] for i in range(len(self._fields)))
+
+    def _asdict(self):
+        return dict(zip(self._fields, self._tuple()))
+
+    def __eq__(self, other):
+        if isinstance(other, RowView):
+            return self._fields == other._fields and self._tuple() == other._tuple()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self._tuple()))
+        return f"{type(self).__name__}({values})"
+
+
+def _field_getter(index):
+    def get(self):
+        return self._load()[index]
+    return get
+
+
+def row_view_class(model):
+    """ModelDef -> RowView 子类 {Name}Row；以下划线开头的字段只能用 row["_x"] 访问"""
+    namespace = {"__slots__": (), "_fields": tuple(f.name for f in model.fields)}
+    for index, f in enumerate(model.fields):
+        if not f.name.startswith("_"):
+            namespace[f.name] = property(_field_getter(index), doc=f.comment or None)
+    return type(f"{model.name}Row", (RowView,), namespace)
@@ -0,0 +1,50 @@
+# reader/strings.py
+# 字符串池文件（exporters.string_pool 写出的 _strings.bin）的只读视图
+import mmap
+import struct
+
+from exporters.string_pool import FORMAT_VERSION, HEADER, MAGIC
+
+_SPAN = struct.Struct("<II")
+
+
+class PooledStrings:
+    """mmap 打开字符串池；按下标取字符串时才解码，池再大也不整体读入"""
+
+    def __init__(self, buf):
+        magic, version, _, self.count = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("不是字符串池文件（magic 不匹配）")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"不支持的字符串池版本: {version}")
+        self.buf = buf
+        self._blob = HEADER.size + 4 * (self.count + 1)
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buf)
+        except Exception:
+            buf.close()
+            raise
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start, end = _SPAN.unpack_from(self.buf, HEADER.size + 4 * i)
+        return str(self.buf[self._blob + start:self._blob + end], "utf-8")
+
+    def close(self):
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
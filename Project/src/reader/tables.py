@@ -0,0 +1,290 @@
+# reader/tables.py
+# 按 Model 打开导出的 DataTable：
+#   BinaryTable    行格式（.bin）：行偏移表定位单行，get(key) 二分文件内的主键索引
+#   ColumnarTable  列格式（.col）：按列解码并缓存，get(key) 首次调用时由主键列建 dict 索引
+# 两者都以 mmap 打开，table[i] / 迭代得到的是行视图（reader.rows），访问字段时才解码
+import mmap
+import os
+import sys
+from array import array
+
+from exporters.binary_layout import ARRAY, TableLayout
+from exporters.binary_table import (
+    KEY_INT, KEY_NONE, MAGIC as BINARY_MAGIC, OFFSET, BinaryTableReader, primary_key, schema_fingerprint,
+)
+from exporters.columnar_table import MAGIC as COLUMNAR_MAGIC, ColumnarTableReader
+from exporters.string_pool import POOL_FILE, StringPool
+from .rows import row_view_class
+from .strings import PooledStrings
+
+DATA_DIR = "DataTables"
+TABLE_EXTENSIONS = (".bin", ".col")
+# 两种格式的 Header 中 schema 指纹都位于 8..16 字节
+_FINGERPRINT = slice(8, 16)
+
+
+def _string_resolver(layout, strings):
+    """池化字段的值（池下标，数组逐层）-> 字符串"""
+    if layout.kind == ARRAY:
+        resolve = _string_resolver(layout.element, strings)
+        return lambda values: [resolve(v) for v in values]
+    return strings.__getitem__
+
+
+def _contains_pooled(layout):
+    while layout.kind == ARRAY:
+        layout = layout.element
+    return layout.pooled
+
+
+def _normalize_key(key_kind, key):
+    """整数主键接受 "3" / 3.0 这样的值；无法转换时返回 None（视为不存在）"""
+    if key_kind != KEY_INT or isinstance(key, int):
+        return key
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Table:
+    """BinaryTable / ColumnarTable 的共同部分；子类提供 row_values / column / find"""
+
+    def __init__(self, buf, layout, strings=None):
+        self.buf = buf
+        self.layout = layout
+        self.model = layout.model
+        self.name = layout.model.name
+        self.field_index = {name: i for i, name in enumerate(layout.names)}
+        self.row_class = row_view_class(layout.model)
+        pooled = [i for i, f in enumerate(layout.fields) if _contains_pooled(f)]
+        if pooled and strings is None:
+            raise ValueError(f"{self.name} 的字符串存为池下标，需要提供字符串池")
+        self.strings = strings
+        self._resolvers = {i: _string_resolver(layout.fields[i], strings) for i in pooled}
+        self._owned = []    # close() 时一并关闭（open_table 自动打开的字符串池）
+
+    def __len__(self):
+        return self.row_count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.row_count
+        if not 0 <= i < self.row_count:
+            raise IndexError(i)
+        return self.row_class(self, i)
+
+    def __iter__(self):
+        row_class = self.row_class
+        for i in range(self.row_count):
+            yield row_class(self, i)
+
+    def get(self, key, default=None):
+        """按主键取行视图；不存在时返回 default"""
+        row = self.find(key)
+        return default if row is None else self.row_class(self, row)
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def close(self):
+        for owned in self._owned:
+            owned.close()
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}: {self.row_count} 行>"
+
+
+class BinaryTable(_Table):
+    """行格式 DataTable；单行访问只解码该行，column() 每行只解码到该字段为止"""
+
+    def __init__(self, buf, layout, strings=None):
+        super().__init__(buf, layout, strings)
+        self._reader = BinaryTableReader(buf, layout)
+        self.row_count = self._reader.row_count
+        self._data_pos = self._reader.data_pos
+        self._offsets_pos = self._reader.offsets_pos
+        self._key_kind = primary_key(layout)[1]
+
+    def _offset(self, row):
+        return self._data_pos + OFFSET.unpack_from(self.buf, self._offsets_pos + 4 * row)[0]
+
+    def row_values(self, row):
+        values, _ = self.layout.decode_row(self.buf, self._offset(row))
+        for i, resolve in self._resolvers.items():
+            values[i] = resolve(values[i])
+        return values
+
+    def _offsets(self):
+        """整个行偏移表（u32 数组，每行 4 字节）"""
+        offsets = array("I")
+        if offsets.itemsize != 4:
+            offsets = array("L")
+        offsets.frombytes(self.buf[self._offsets_pos:self._offsets_pos + 4 * self.row_count])
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        return offsets
+
+    def column(self, name):
+        """逐行产出一列的值；不构建行视图，也不解码该字段之后的字段"""
+        index = self.field_index[name]
+        decode_field = self.layout.decode_field
+        resolve = self._resolvers.get(index)
+        buf = self.buf
+        data_pos = self._data_pos
+        for offset in self._offsets():
+            value = decode_field(buf, data_pos + offset, index)
+            yield value if resolve is None else resolve(value)
+
+    def find(self, key):
+        """主键 -> 行号（二分文件中按主键排序的索引）；不存在返回 None"""
+        key = _normalize_key(self._key_kind, key)
+        return None if key is None else self._reader.find(key)
+
+
+class _ColumnRow:
+    """列格式的一行：按字段下标从（已缓存的）列中取值"""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, index):
+        return self._table.column_values(index)[self._row]
+
+
+class ColumnarTable(_Table):
+    """列格式 DataTable；每列首次访问时解码一次并缓存，不访问的列不解码"""
+
+    def __init__(self, buf, layout, strings=None):
+        super().__init__(buf, layout, strings)
+        self._reader = ColumnarTableReader(buf, layout)
+        self.row_count = self._reader.row_count
+        self._columns = {}
+        self._key_index, self._key_kind = primary_key(layout)
+        self._index = None
+
+    def column_values(self, index):
+        """第 index 列的全部值（定长列为 array，其余为 list）"""
+        values = self._columns.get(index)
+        if values is None:
+            values = self._reader.column(self.layout.names[index])
+            resolve = self._resolvers.get(index)
+            if resolve is not None:
+                values = [resolve(v) for v in values]
+            self._columns[index] = values
+        return values
+
+    def row_values(self, row):
+        return _ColumnRow(self, row)
+
+    def column(self, name):
+        return iter(self.column_values(self.field_index[name]))
+
+    def find(self, key):
+        """
+        主键 -> 行号；首次调用时由主键列建立 dict 索引
+        主键重复（未校验导出）时取第一行，与 BinaryTable 二分稳定排序的索引一致
+        """
+        if self._key_kind == KEY_NONE:
+            raise KeyError(f"{self.name} 没有可索引的主键")
+        if self._index is None:
+            index = {}
+            for row, k in enumerate(self.column_values(self._key_index)):
+                index.setdefault(k, row)
+            self._index = index
+        return self._index.get(_normalize_key(self._key_kind, key))
+
+
+def _matching_layout(model, model_map, fingerprint):
+    """导出时是否启用了字符串池由文件中的 schema 指纹判断"""
+    for pool in (None, StringPool()):
+        layout = TableLayout(model, model_map, pool)
+        if schema_fingerprint(layout) == fingerprint:
+            return layout
+    raise ValueError(f"DataTable 与 Model {model.name} 的 schema 不一致")
+
+
+def open_table(path, model, model_map=None, strings=None):
+    """
+    mmap 打开 DT_{Model}.bin / .col，按文件头选择 BinaryTable 或 ColumnarTable
+    model_map: 全项目 {name: ModelDef}，引用其它表的字段按其主键类型存储时需要
+    strings: 字符串池（PooledStrings 或字符串列表）；为 None 且表中有池化字段时打开同目录的池文件
+    """
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    owned = None
+    try:
+        magic = bytes(buf[:4])
+        cls = {BINARY_MAGIC: BinaryTable, COLUMNAR_MAGIC: ColumnarTable}.get(magic)
+        if cls is None:
+            raise ValueError(f"不是 DataTable 二进制文件: {path}")
+        layout = _matching_layout(model, model_map, bytes(buf[_FINGERPRINT]))
+        if strings is None and any(_contains_pooled(f) for f in layout.fields):
+            strings = owned = PooledStrings.open(os.path.join(os.path.dirname(path), POOL_FILE))
+        table = cls(buf, layout, strings)
+    except Exception:
+        if owned is not None:
+            owned.close()
+        buf.close()
+        raise
+    if owned is not None:
+        table._owned.append(owned)
+    return table
+
+
+class TableSet(dict):
+    """{Model 名: 表}，close() 关闭全部表与共用的字符串池"""
+
+    def __init__(self, tables=(), strings=None):
+        super().__init__(tables)
+        self.strings = strings
+
+    def close(self):
+        for table in self.values():
+            table.close()
+        if self.strings is not None:
+            self.strings.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_tables(out_dir, model_map=None):
+    """
+    打开导出目录 DataTables 下的全部 bin / columnar 表，返回 TableSet
+    model_map 为 None 时使用导出时保存的 schema 缓存（不打开 Excel）
+    """
+    if model_map is None:
+        from pipeline.schema_cache import load_schema_index
+        index = load_schema_index(out_dir)
+        if index is None:
+            raise ValueError(f"{out_dir} 中没有 schema 缓存，请提供 model_map")
+        model_map = index.models
+    data_dir = os.path.join(out_dir, DATA_DIR)
+    pool_path = os.path.join(data_dir, POOL_FILE)
+    tables = TableSet(strings=PooledStrings.open(pool_path) if os.path.exists(pool_path) else None)
+    try:
+        for file_name in sorted(os.listdir(data_dir)):
+            stem, ext = os.path.splitext(file_name)
+            model = model_map.get(stem[3:]) if stem.startswith("DT_") else None
+            if model is None or ext not in TABLE_EXTENSIONS:
+                continue
+            tables[model.name] = open_table(os.path.join(data_dir, file_name), model, model_map, tables.strings)
+    except Exception:
+        tables.close()
+        raise
+    return tables
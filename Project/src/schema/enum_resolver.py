@@ -0,0 +1,65 @@
+# schema/enum_resolver.py
+# 枚举单元格解析：名称 / 限定名称 / 大小写不敏感 / 整数值，全部预先建表，查找 O(1)
+
+
+class EnumResolver:
+    """
+    由枚举名和成员表预计算的查找表
+        lookup("Fire") / lookup("SkillType.Fire") / lookup("fire") / lookup(1) / lookup("1") -> 1
+        name_of(1) -> "Fire"
+    无法识别时 lookup 返回 default
+    by_name 为精确匹配表（成员名与限定名），热路径可直接查询后再回退到 lookup
+    """
+
+    __slots__ = ("enum_name", "by_name", "_folded", "_names")
+
+    def __init__(self, enum_name, members):
+        self.enum_name = enum_name
+        exact = {}
+        folded = {}
+        names = {}
+        prefix = enum_name + "."
+        for name, value in members.items():
+            name = str(name)
+            for key in (name, prefix + name):
+                exact[key] = value
+                folded.setdefault(key.casefold(), value)
+            names.setdefault(value, name)
+        self.by_name = exact
+        self._folded = folded
+        self._names = names
+
+    def lookup(self, value, default=None):
+        if value.__class__ is str:
+            found = self.by_name.get(value)
+            if found is not None:
+                return found
+            return self._lookup_text(value, default)
+        if isinstance(value, float):
+            if not value.is_integer():
+                return default
+            value = int(value)
+        if isinstance(value, int) and value in self._names:
+            return int(value)
+        return default
+
+    def _lookup_text(self, value, default):
+        text = value.strip()
+        found = self.by_name.get(text)
+        if found is None:
+            found = self._folded.get(text.casefold())
+        if found is None:
+            # 数值写成文本的单元格
+            try:
+                number = int(text)
+            except ValueError:
+                return default
+            found = number if number in self._names else None
+        return default if found is None else found
+
+    def name_of(self, value, default=None):
+        """整数值 -> 成员名（同值多个成员时取第一个）"""
+        return self._names.get(value, default)
+
+    def __contains__(self, value):
+        return self.lookup(value) is not None
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from schema.types import SchemaType
 
-@dataclass
+@dataclass(slots=True)
 class FieldDef:
     name: str
     type: SchemaType
@@ -0,0 +1,312 @@
+# schema/index.py
+# 全项目 schema 索引：一次读取所有工作簿的 Enums / Models，
+# 统一登记类型名、解析跨文件引用，并在一遍线性扫描中检查重名与循环引用
+import hashlib
+import os
+from dataclasses import dataclass, field
+
+from profiling import stage
+from schema.parser import build_models, parse_enums_sheet, read_model_tables, validate_model
+from schema.types import ArrayType, CustomType, EnumType
+
+
+@dataclass
+class TypeLocation:
+    """类型定义的位置"""
+    kind: str       # "Model" / "Enum"
+    name: str
+    file_path: str
+    sheet: str
+    table: str
+
+    def __str__(self):
+        return f"{self.file_path} [{self.sheet}] {self.table}"
+
+
+@dataclass
+class WorkbookSchema:
+    """单个工作簿中未解析引用的 schema 原始内容，可缓存"""
+    file_path: str
+    enums: dict = field(default_factory=dict)          # {name: EnumType}
+    model_tables: list = field(default_factory=list)   # [(model_name, rows)]
+    enums_sheet: str = "Enums"
+    models_sheet: str = "Models"
+
+
+def read_workbook_schema(file_path, sheet_enums="Enums", sheet_models="Models"):
+    """只读打开工作簿，只解析 Enums / Models 两个 sheet"""
+    # 全部命中 schema 缓存时不会走到这里，openpyxl 用到时才导入
+    from schema.workbook import WorkbookSession
+
+    with stage("load_workbook", file_path):
+        session = WorkbookSession(file_path, read_only=True)
+    with session:
+        with stage("parse_enums", file_path):
+            enums = parse_enums_sheet(session, sheet_enums)
+        with stage("parse_models", file_path):
+            model_tables = read_model_tables(session, sheet_models)
+    return WorkbookSchema(
+        file_path=file_path,
+        enums=enums,
+        model_tables=model_tables,
+        enums_sheet=sheet_enums,
+        models_sheet=sheet_models,
+    )
+
+
+def _referenced_model(field_type):
+    while isinstance(field_type, ArrayType):
+        field_type = field_type.element_type
+    if isinstance(field_type, CustomType):
+        return field_type.name
+    return None
+
+
+class KeyCycleError(ValueError):
+    """主键引用链成环，无法确定按主键引用时的存储类型"""
+
+    def __init__(self, path):
+        self.path = path
+        super().__init__(f"主键循环引用: {' -> '.join(path)}")
+
+
+def _primary_field(model):
+    for f in model.fields:
+        if f.is_primary:
+            return f
+    return None
+
+
+def resolve_key_type(models, model_name):
+    """
+    按主键引用 model_name 时实际存储的类型（沿主键引用链展开），全项目唯一的解析规则
+    models: {name: ModelDef}
+    返回 BasicType / EnumType；被引用的 Model 未知、没有主键或主键为数组时返回 None
+    主键引用链成环时抛出 KeyCycleError；各调用方按自己的规则处理 None 与成环
+    （导出转换报错、二进制布局按 int32 存储）
+    """
+    path = [model_name]
+    while True:
+        model = models.get(path[-1])
+        key = _primary_field(model) if model is not None else None
+        if key is None or isinstance(key.type, ArrayType):
+            return None
+        if not isinstance(key.type, CustomType):
+            return key.type
+        if key.type.name in path:
+            raise KeyCycleError(path + [key.type.name])
+        path.append(key.type.name)
+
+
+class SchemaIndex:
+    """
+    locations: {类型名: TypeLocation}，Model 与 Enum 共用一个命名空间
+    models / enums: 全项目的 {名称: ModelDef / EnumType}
+    errors: 重名、未知类型、字段重复、主键循环等错误
+    cycles: Model 之间的引用环（按主键存储时引用环合法，仅供查询）
+    """
+
+    def __init__(self):
+        self.locations = {}
+        self.models = {}
+        self.enums = {}
+        self.files = {}        # {file_path: ([model_name], [enum_name])}
+        self.errors = []
+        self.cycles = []
+
+    @classmethod
+    def build(cls, workbooks):
+        """workbooks: 按文件顺序的 WorkbookSchema 列表；先出现的定义优先"""
+        index = cls()
+        with stage("schema_resolve"):
+            index._register(workbooks)
+            index._resolve(workbooks)
+            index._check_references()
+        return index
+
+    # ---------- 构建 ----------
+
+    def _register(self, workbooks):
+        for wb in workbooks:
+            names = [
+                TypeLocation("Enum", name, wb.file_path, wb.enums_sheet, name)
+                for name in wb.enums
+            ] + [
+                TypeLocation("Model", name, wb.file_path, wb.models_sheet, name)
+                for name, _ in wb.model_tables
+            ]
+            for loc in names:
+                first = self.locations.get(loc.name)
+                if first is not None:
+                    self.errors.append(
+                        f"[{loc.file_path}][{loc.sheet}] 重复 {loc.kind} 名: {loc.name}"
+                        f"（已在 {first} 中定义为 {first.kind}）"
+                    )
+                    continue
+                self.locations[loc.name] = loc
+                if loc.kind == "Enum":
+                    self.enums[loc.name] = wb.enums[loc.name]
+            self.files[wb.file_path] = ([name for name, _ in wb.model_tables], list(wb.enums))
+
+    def _resolve(self, workbooks):
+        # 每个工作簿可以引用全项目的 Enum 与 Model；未知类型记录错误而不中断
+        model_names = [name for name, loc in self.locations.items() if loc.kind == "Model"]
+        for wb in workbooks:
+            errors = []
+            models = build_models(wb.model_tables, self.enums, model_names, errors)
+            for err in errors:
+                self.errors.append(f"[{wb.file_path}][{wb.models_sheet}]{err}")
+            for model in models:
+                for err in validate_model(model):
+                    self.errors.append(f"[{wb.file_path}][{wb.models_sheet}][{model.name}] {err}")
+                loc = self.locations.get(model.name)
+                if loc is not None and loc.file_path == wb.file_path and loc.kind == "Model":
+                    self.models[model.name] = model
+
+    def _check_references(self):
+        """Tarjan 强连通分量：O(Model 数 + 引用数)"""
+        graph = {
+            name: sorted({ref for ref in map(_referenced_model, (f.type for f in model.fields))
+                          if ref in self.models})
+            for name, model in self.models.items()
+        }
+        order = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        counter = 0
+
+        for root in graph:
+            if root in order:
+                continue
+            # 迭代实现，避免深引用链超出递归深度
+            work = [(root, iter(graph[root]))]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, edges = work[-1]
+                advanced = False
+                for ref in edges:
+                    if ref not in order:
+                        order[ref] = low[ref] = counter
+                        counter += 1
+                        stack.append(ref)
+                        on_stack.add(ref)
+                        work.append((ref, iter(graph[ref])))
+                        advanced = True
+                        break
+                    if ref in on_stack:
+                        low[node] = min(low[node], order[ref])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph[node]:
+                        self.cycles.append(sorted(component))
+
+        # 主键引用其它 Model 时按被引用表的主键存储；主键链成环则无法确定存储类型
+        # 每个 Model 至多一条主键引用边，沿链走一遍即可
+        state = {}  # 0: 当前链上 / 1: 已完成
+        for start in self.models:
+            path = []
+            node = start
+            while node in self.models and node not in state:
+                state[node] = 0
+                path.append(node)
+                node = _referenced_model(self.primary_key_type(node))
+            if state.get(node) == 0:
+                cycle = path[path.index(node):]
+                locations = "，".join(str(self.locations[name]) for name in cycle)
+                self.errors.append(f"主键循环引用: {' -> '.join(cycle + [node])}（{locations}）")
+            for name in path:
+                state[name] = 1
+
+    # ---------- 查询 ----------
+
+    def find(self, name):
+        """类型名 -> TypeLocation，不存在返回 None"""
+        return self.locations.get(name)
+
+    def primary_key_type(self, model_name):
+        model = self.models.get(model_name)
+        key = _primary_field(model) if model is not None else None
+        return key.type if key is not None else None
+
+    def references_to(self, name):
+        """引用了某个 Model / Enum 的字段 [(Model 名, 字段名)]"""
+        refs = []
+        for model in self.models.values():
+            for f in model.fields:
+                field_type = f.type
+                while isinstance(field_type, ArrayType):
+                    field_type = field_type.element_type
+                if isinstance(field_type, (CustomType, EnumType)) and field_type.name == name:
+                    refs.append((model.name, f.name))
+        return refs
+
+    def key_type(self, model_name):
+        """按主键引用 Model 时实际存储的类型，见 resolve_key_type；主键链成环（已记录为错误）时返回 None"""
+        try:
+            return resolve_key_type(self.models, model_name)
+        except KeyCycleError:
+            return None
+
+    def dependency_key(self, file_path):
+        """
+        工作簿引用的外部类型摘要（外部 Enum 定义、外部 Model 的主键类型）
+        被引用的类型变化时，即使工作簿本身没变，其代码与数据也需要重新生成
+        """
+        model_names, enum_names = self.files.get(file_path, ([], []))
+        local = set(model_names).union(enum_names)
+        parts = set()
+        for name in model_names:
+            model = self.models.get(name)
+            for f in model.fields if model else ():
+                field_type = f.type
+                while isinstance(field_type, ArrayType):
+                    field_type = field_type.element_type
+                if field_type.name in local:
+                    continue
+                if isinstance(field_type, CustomType):
+                    parts.add(f"{field_type.name}={self.key_type(field_type.name)!r}")
+                elif isinstance(field_type, EnumType):
+                    parts.add(f"{field_type.name}={field_type!r}")
+        return hashlib.sha1("\n".join(sorted(parts)).encode("utf-8")).hexdigest()
+
+    def workbook(self, file_path):
+        """单个工作簿定义的 (models 列表, enums 字典)"""
+        model_names, enum_names = self.files.get(file_path, ([], []))
+        models = [self.models[name] for name in model_names if name in self.models]
+        enums = {name: self.enums[name] for name in enum_names if name in self.enums}
+        return models, enums
+
+    def raise_errors(self):
+        """打印全部错误并抛出 ValueError；没有错误时什么也不做"""
+        if not self.errors:
+            return
+        for err in self.errors:
+            print("Schema 校验错误:", err)
+        raise ValueError(f"Schema 校验失败，共 {len(self.errors)} 个错误")
+
+    def summary(self):
+        return (
+            f"Schema 索引: {len(self.files)} 个工作簿，"
+            f"{len(self.models)} 个 Model，{len(self.enums)} 个 Enum"
+        )
+
+
+def build_schema_index(file_paths):
+    """不使用缓存，直接读取所有工作簿建立索引"""
+    return SchemaIndex.build([read_workbook_schema(os.fspath(p)) for p in file_paths])
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from schema.field import FieldDef
 
-@dataclass
+@dataclass(slots=True)
 class ModelDef:
     name: str
     fields: list[FieldDef]
\ No newline at end of file
@@ -1,6 +1,3 @@
-import openpyxl
-from openpyxl.utils import range_boundaries
-
 from schema.types import (
     BasicType,
     ArrayType,
@@ -26,6 +23,8 @@ BASIC_TYPES = {
 # =========================
 # Excel Table 扫描
 # =========================
+# 读取 Excel 的函数用到时才导入 openpyxl / schema.workbook（导入较慢）；
+# 类型解析与 Model 构建不依赖 openpyxl，缓存命中时不必加载
 
 def scan_tables(ws):
     """
@@ -36,43 +35,103 @@ def scan_tables(ws):
             ...
         ]
     """
-    tables = []
+    from openpyxl.utils import range_boundaries
+    from schema.workbook import iter_table_refs, is_read_only
+
+    refs = [
+        (table_name, range_boundaries(ref))
+        for table_name, ref in iter_table_refs(ws)
+    ]
+    if not refs:
+        return []
 
-    for table in ws.tables.values():
-        table_name = table.name
-        min_col, min_row, max_col, max_row = range_boundaries(table.ref)
+    if is_read_only(ws):
+        blocks = _read_blocks_single_pass(ws, refs)
+    else:
+        blocks = [_read_block(ws, bounds) for _, bounds in refs]
 
-        headers = [
-            ws.cell(row=min_row, column=col).value
-            for col in range(min_col, max_col + 1)
+    tables = []
+    for (table_name, _), rows in zip(refs, blocks):
+        headers = list(rows[0]) if rows else []
+        # 跳过空行
+        data_rows = [
+            list(row) for row in rows[1:]
+            if any(v is not None for v in row)
         ]
-
-        data_rows = []
-        for row in range(min_row + 1, max_row + 1):
-            row_values = [
-                ws.cell(row=row, column=col).value
-                for col in range(min_col, max_col + 1)
-            ]
-            # 跳过空行
-            if any(v is not None for v in row_values):
-                data_rows.append(row_values)
-
         tables.append((table_name, headers, data_rows))
 
     return tables
 
 
+def _read_block(ws, bounds):
+    """
+    按表格范围整块读取，只访问表格内的单元格
+    普通 worksheet 的 iter_rows 内部仍是逐个 ws.cell()（还会为空位创建单元格），
+    这里直接查已加载的单元格字典
+    ws._cells 是 openpyxl 私有属性，所装版本没有时退回公开的 iter_rows
+    """
+    min_col, min_row, max_col, max_row = bounds
+    cells = getattr(ws, "_cells", None)
+    if not isinstance(cells, dict):
+        return [
+            list(row) for row in ws.iter_rows(
+                min_row=min_row, max_row=max_row,
+                min_col=min_col, max_col=max_col,
+                values_only=True,
+            )
+        ]
+    get = cells.get
+    cols = range(min_col, max_col + 1)
+    rows = []
+    for row in range(min_row, max_row + 1):
+        values = []
+        for col in cols:
+            cell = get((row, col))
+            values.append(None if cell is None else cell.value)
+        rows.append(values)
+    return rows
+
+
+def _read_blocks_single_pass(ws, refs):
+    """
+    只读 sheet 每次 iter_rows 都要从头解析 XML，
+    这里对所有表格的外接行范围只解析一遍，再按列切片分给各个表格
+    """
+    min_row = min(bounds[1] for _, bounds in refs)
+    max_row = max(bounds[3] for _, bounds in refs)
+    min_col = min(bounds[0] for _, bounds in refs)
+    max_col = max(bounds[2] for _, bounds in refs)
+
+    blocks = [[] for _ in refs]
+    for row_idx, row in enumerate(
+        ws.iter_rows(
+            min_row=min_row, max_row=max_row,
+            min_col=min_col, max_col=max_col,
+            values_only=True,
+        ),
+        start=min_row,
+    ):
+        for block, (_, (t_min_col, t_min_row, t_max_col, t_max_row)) in zip(blocks, refs):
+            if t_min_row <= row_idx <= t_max_row:
+                block.append(row[t_min_col - min_col:t_max_col - min_col + 1])
+    return blocks
+
+
 # =========================
 # Enums 解析
 # =========================
 
-def parse_enums_sheet(file_path, sheet_name="Enums"):
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    if sheet_name not in wb.sheetnames:
-        return {}
+def parse_enums_sheet(source, sheet_name="Enums"):
+    """
+    source: Excel 文件路径或 WorkbookSession
+    """
+    from schema.workbook import open_session
 
-    ws = wb[sheet_name]
-    tables = scan_tables(ws)
+    with open_session(source) as session:
+        ws = session.get_sheet(sheet_name)
+        if ws is None:
+            return {}
+        tables = scan_tables(ws)
 
     enum_map = {}
 
@@ -124,6 +183,7 @@ def parse_type(type_str, model_map, enum_map):
         SkillType
         int[]
         SkillConfig[]
+        int[][] / SkillConfig[][]（单元格为嵌套数组字面量，见 exporters.cell_literal）
     """
     if not type_str:
         raise ValueError("字段类型不能为空")
@@ -153,32 +213,48 @@ def parse_type(type_str, model_map, enum_map):
 # Models 解析
 # =========================
 
-def parse_models_sheet(file_path, enum_map, sheet_name="Models"):
+def read_model_tables(source, sheet_name="Models"):
     """
-    Models Sheet 规则：
-    每个表：
-        FieldName | Type | Comment | PrimaryKey
+    读取 Models sheet 的原始表格 [(model_name, rows)]，不解析类型
+    source: Excel 文件路径或 WorkbookSession
     """
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    if sheet_name not in wb.sheetnames:
-        return []
+    from schema.workbook import open_session
+
+    with open_session(source) as session:
+        ws = session.get_sheet(sheet_name)
+        if ws is None:
+            return []
+        tables = scan_tables(ws)
+    return [(table_name, rows) for table_name, headers, rows in tables]
 
-    ws = wb[sheet_name]
-    tables = scan_tables(ws)
 
+def _parse_primary(primary_raw):
+    if isinstance(primary_raw, bool):
+        return primary_raw
+    elif isinstance(primary_raw, (int, float)):
+        return primary_raw != 0
+    elif isinstance(primary_raw, str):
+        return primary_raw.strip().lower() in ("true", "1", "yes")
+    return False
+
+
+def build_models(model_tables, enum_map, external_models=(), errors=None):
+    """
+    由 read_model_tables 的结果构建 ModelDef
+    external_models: 其它工作簿中定义的 Model 名，字段可以引用
+    errors: 传入列表时，无法解析的字段类型记入列表并跳过该字段；否则直接抛出 ValueError
+    """
     # 先注册所有 Model（解决互相引用）
     model_map = {}
-    table_rows = {}
-
-    for table_name, headers, rows in tables:
+    for table_name, rows in model_tables:
         model_map[table_name] = ModelDef(
             name=table_name,
             fields=[]
         )
-        table_rows[table_name] = rows
+    known_models = set(model_map).union(external_models)
 
     # 第二遍解析字段
-    for model_name, rows in table_rows.items():
+    for model_name, rows in model_tables:
         model = model_map[model_name]
 
         for row in rows:
@@ -193,86 +269,69 @@ def parse_models_sheet(file_path, enum_map, sheet_name="Models"):
             if not field_name or not type_name:
                 continue
 
-            is_primary = False
-            if isinstance(primary_raw, bool):
-                is_primary = primary_raw
-            elif isinstance(primary_raw, (int, float)):
-                is_primary = primary_raw != 0
-            elif isinstance(primary_raw, str):
-                is_primary = primary_raw.strip().lower() in ("true", "1", "yes")
-
-            field_type = parse_type(type_name, model_map, enum_map)
+            try:
+                field_type = parse_type(type_name, known_models, enum_map)
+            except ValueError as e:
+                if errors is None:
+                    raise
+                errors.append(f"[{model_name}.{field_name}] {e}")
+                continue
 
             model.fields.append(
                 FieldDef(
                     name=field_name,
                     type=field_type,
                     comment=comment or "",
-                    is_primary=is_primary,
+                    is_primary=_parse_primary(primary_raw),
                 )
             )
 
     return list(model_map.values())
 
 
+def parse_models_sheet(source, enum_map, sheet_name="Models", external_models=()):
+    """
+    Models Sheet 规则：
+    每个表：
+        FieldName | Type | Comment | PrimaryKey
+    source: Excel 文件路径或 WorkbookSession
+    external_models: 其它工作簿中定义的 Model 名
+    """
+    return build_models(read_model_tables(source, sheet_name), enum_map, external_models)
+
+
 # =========================
 # Schema 校验
 # =========================
 
-def validate_schema(file_path, models, enums, sheet_models="Models", sheet_enums="Enums"):
+def validate_model(model):
+    """单个 Model 的字段检查，返回错误描述列表"""
+    errors = []
+    field_names = set()
+    primary_count = 0
+    for field in model.fields:
+        # 重复字段
+        if field.name in field_names:
+            errors.append(f"重复字段: {field.name}")
+        field_names.add(field.name)
+
+        # 主键数量
+        if field.is_primary:
+            primary_count += 1
+
+    if primary_count > 1:
+        errors.append("主键重复 (多个 PrimaryKey)")
+    return errors
+
+
+def validate_schema(file_path, sheet_models="Models", sheet_enums="Enums"):
     """
-    校验解析后的 schema
-    Args:
-        file_path: Excel 文件路径
-        models: parse_models_sheet 返回的 List[ModelDef]
-        enums: parse_enums_sheet 返回的 Dict[str, EnumType]
+    校验单个工作簿的 schema，有错误时打印并抛出 ValueError
+    与导出走同一条路径：SchemaIndex 检查重名与未知类型，validate_model 检查字段与主键
     """
-    errors = []
+    from schema.index import SchemaIndex, read_workbook_schema
 
-    # ------------------------
-    # 1. 检查 Model 重名
-    # ------------------------
-    model_names = set()
-    for model in models:
-        if model.name in model_names:
-            errors.append(f"[{file_path}][{sheet_models}] 重复 Model 名: {model.name}")
-        model_names.add(model.name)
-
-    # ------------------------
-    # 2. 检查 Enum 重名
-    # ------------------------
-    enum_names = set()
-    for enum_name in enums.keys():
-        if enum_name in enum_names:
-            errors.append(f"[{file_path}][{sheet_enums}] 重复 Enum 名: {enum_name}")
-        enum_names.add(enum_name)
-
-    # ------------------------
-    # 3. 检查 Model 内字段重复 & 主键重复
-    # ------------------------
-    for model in models:
-        field_names = set()
-        primary_count = 0
-        for field in model.fields:
-            # 重复字段
-            if field.name in field_names:
-                errors.append(f"[{file_path}][{sheet_models}][{model.name}] 重复字段: {field.name}")
-            field_names.add(field.name)
-
-            # 主键数量
-            if field.is_primary:
-                primary_count += 1
-
-        if primary_count > 1:
-            errors.append(f"[{file_path}][{sheet_models}][{model.name}] 主键重复 (多个 PrimaryKey)")
-
-    # ------------------------
-    # 4. 输出结果
-    # ------------------------
-    if errors:
-        for err in errors:
-            print("Schema 校验错误:", err)
-        raise ValueError(f"{file_path} 校验失败，共 {len(errors)} 个错误")
-    else:
-        print(f"{file_path} 校验通过，没有发现重复主键或重名类型。")
+    index = SchemaIndex.build([read_workbook_schema(file_path, sheet_enums, sheet_models)])
+    index.raise_errors()
+    print(f"{file_path} 校验通过，没有发现重复主键或重名类型。")
 
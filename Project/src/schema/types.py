@@ -1,18 +1,20 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Optional
 
+from .enum_resolver import EnumResolver
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SchemaType:
     name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BasicType(SchemaType):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ArrayType:
     element_type: SchemaType
 
@@ -21,18 +23,23 @@ class ArrayType:
         return f"{self.element_type.name}[]"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EnumType(SchemaType):
     members: Dict[str, int]
     underlying: str = "int"
+    # 成员查找表，由 members 预计算，不参与比较
+    resolver: EnumResolver = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "resolver", EnumResolver(self.name, self.members))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CustomType(SchemaType):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeRef:
     name: str
     resolved: Optional[SchemaType] = None
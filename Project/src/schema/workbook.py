@@ -0,0 +1,100 @@
+from contextlib import contextmanager
+
+import openpyxl
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
+from openpyxl.worksheet.table import Table
+from openpyxl.xml.functions import fromstring
+
+
+class WorkbookSession:
+    """
+    Excel 工作簿会话：
+    每个文件只 load 一次，Enums / Models 解析与数据导出共享同一份已解析的 sheet
+
+    read_only=True 时以 openpyxl 只读模式打开，sheet 按需流式解析，
+    内存占用只与行宽有关，与表长无关
+    只读模式读取表格定义依赖 openpyxl 私有属性（见 iter_table_refs），
+    所装版本没有这些属性时退回普通模式打开
+    """
+
+    def __init__(self, file_path, data_only=True, read_only=False):
+        self.file_path = file_path
+        self.read_only = read_only
+        self.workbook = openpyxl.load_workbook(file_path, data_only=data_only, read_only=read_only)
+        if read_only and not all(map(has_table_archive, self.workbook.worksheets)):
+            self.workbook.close()
+            self.read_only = False
+            self.workbook = openpyxl.load_workbook(file_path, data_only=data_only)
+
+    @property
+    def sheetnames(self):
+        return self.workbook.sheetnames
+
+    def get_sheet(self, sheet_name):
+        """按名称取 worksheet，不存在返回 None"""
+        if sheet_name not in self.workbook.sheetnames:
+            return None
+        return self.workbook[sheet_name]
+
+    def close(self):
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@contextmanager
+def open_session(source):
+    """
+    source 可以是文件路径或已打开的 WorkbookSession
+    传入路径时临时打开并在结束后关闭；传入会话时直接复用，不负责关闭
+    """
+    if isinstance(source, WorkbookSession):
+        yield source
+        return
+
+    session = WorkbookSession(source)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def is_read_only(ws):
+    """只读 worksheet 没有 tables / cell 缓存"""
+    return not hasattr(ws, "tables")
+
+
+def has_table_archive(ws):
+    """
+    只读 worksheet 能否直接从 xlsx 压缩包读取表格定义
+    ws.parent._archive / ws._worksheet_path 是 openpyxl 私有属性（requirements.txt 锁定了已验证的版本范围）
+    """
+    return hasattr(ws.parent, "_archive") and hasattr(ws, "_worksheet_path")
+
+
+def iter_table_refs(ws):
+    """
+    枚举 worksheet 中的 Excel「表格对象」
+    yield (table_name, ref)
+
+    只读模式下 openpyxl 不加载 tables，这里直接从 xlsx 压缩包读取表格定义，
+    不需要解析任何单元格；WorkbookSession 已保证此时 has_table_archive(ws) 成立
+    """
+    if not is_read_only(ws):
+        for table in ws.tables.values():
+            yield table.name, table.ref
+        return
+
+    archive = ws.parent._archive
+    rels_path = get_rels_path(ws._worksheet_path)
+    if rels_path not in archive.namelist():
+        return
+
+    rels = get_dependents(archive, rels_path)
+    for rel in rels.find(Table._rel_type):
+        table = Table.from_tree(fromstring(archive.read(rel.target)))
+        yield table.name, table.ref
@@ -0,0 +1,80 @@
+# excel_fixture.py
+# 测试用：按 Enums / Models / 数据表 规则生成 .xlsx
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.table import Table
+
+
+def _add_table(ws, name, header, rows, start_col=1, start_row=1):
+    for c, value in enumerate(header):
+        ws.cell(row=start_row, column=start_col + c, value=value)
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row):
+            ws.cell(row=start_row + r, column=start_col + c, value=value)
+    ref = "{}{}:{}{}".format(
+        get_column_letter(start_col), start_row,
+        get_column_letter(start_col + len(header) - 1), start_row + max(len(rows), 1),
+    )
+    ws.add_table(Table(displayName=name, ref=ref))
+
+
+def make_workbook(path, enums=None, models=None, data=None):
+    """
+    enums:  {EnumName: [(Name, Value), ...]}
+    models: {ModelName: [(FieldName, Type, Comment, PrimaryKey), ...]}
+    data:   {ModelName: [row_tuple, ...]}
+    每个表横向排开，中间空一列
+    """
+    wb = Workbook()
+    wb.remove(wb.active)
+
+    if enums is not None:
+        ws = wb.create_sheet("Enums")
+        col = 1
+        for name, members in enums.items():
+            _add_table(ws, name, ["Name", "Value"], members, start_col=col)
+            col += 3
+
+    if models is not None:
+        ws = wb.create_sheet("Models")
+        col = 1
+        for name, fields in models.items():
+            _add_table(ws, name, ["FieldName", "Type", "Comment", "PrimaryKey"], fields, start_col=col)
+            col += 5
+
+    for name, rows in (data or {}).items():
+        ws = wb.create_sheet(name)
+        header = [f[0] for f in models[name]]
+        ws.append(header)
+        for row in rows:
+            ws.append(list(row))
+
+    wb.save(path)
+    return path
+
+
+SKILL_ENUMS = {
+    "SkillType": [("Fire", 1), ("Ice", 2), ("Thunder", 3)],
+}
+
+SKILL_MODELS = {
+    "SkillConfig": [
+        ("Id", "int", "主键", True),
+        ("Name", "string", "技能名", False),
+        ("Damage", "float", "伤害", False),
+        ("Type", "SkillType", "类型", False),
+        ("Tags", "string[]", "标签", False),
+    ],
+}
+
+SKILL_DATA = {
+    "SkillConfig": [
+        (1, "火球", 10.5, "Fire", "a,b"),
+        (2, "冰箭", 8.0, "Ice", None),
+        (3, "雷击", 12.25, 3, "c"),
+    ],
+}
+
+
+def make_skill_workbook(path):
+    return make_workbook(path, SKILL_ENUMS, SKILL_MODELS, SKILL_DATA)
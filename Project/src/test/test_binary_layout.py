@@ -0,0 +1,53 @@
+import struct
+
+from exporters.binary_layout import TableLayout
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType, CustomType, EnumType
+
+KIND = EnumType("Kind", {"A": 0, "B": 1}, underlying="byte")
+
+ITEM = ModelDef("Item", [
+    FieldDef("Key", BasicType("string"), is_primary=True),
+])
+
+MODEL = ModelDef("Sample", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Rate", BasicType("float")),
+    FieldDef("On", BasicType("bool")),
+    FieldDef("Kind", KIND),
+    FieldDef("Name", BasicType("string")),
+    FieldDef("Item", CustomType("Item")),
+    FieldDef("Levels", ArrayType(BasicType("int"))),
+    FieldDef("Tags", ArrayType(BasicType("string"))),
+])
+
+
+def test_layout_follows_schema_types():
+    layout = TableLayout(MODEL, {"Item": ITEM, "Sample": MODEL})
+    assert layout.describe() == [
+        ("Id", "i"), ("Rate", "f"), ("On", "?"), ("Kind", "B"),
+        ("Name", "string"), ("Item", "string"),
+        ("Levels", "array<i>"), ("Tags", "array<string>"),
+    ]
+
+
+def test_encode_row_uses_schema_not_runtime_type():
+    layout = TableLayout(MODEL, {"Item": ITEM, "Sample": MODEL})
+    out = bytearray()
+    # float 列里的整数、bool 列、None 都按 schema 编码
+    layout.encode_row([7, 3, True, 1, None, "sword", [1, 2], ["x"]], out)
+
+    expected = struct.pack("<if?B", 7, 3.0, True, 1)
+    expected += struct.pack("<I", 0)
+    expected += struct.pack("<I", 5) + b"sword"
+    expected += struct.pack("<I2i", 2, 1, 2)
+    expected += struct.pack("<I", 1) + struct.pack("<I", 1) + b"x"
+    assert bytes(out) == expected
+
+
+def test_missing_values_write_defaults():
+    layout = TableLayout(MODEL, {"Item": ITEM})
+    out = bytearray()
+    layout.encode_row(layout.row_values((1,)), out)
+    assert bytes(out) == struct.pack("<if?BIII I", 1, 0.0, False, 0, 0, 0, 0, 0)
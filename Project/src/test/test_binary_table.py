@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from exporters.binary_layout import TableLayout
+from exporters.binary_table import KEY_INT, KEY_STRING, BinaryTableReader, write_table
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType
+
+SKILL = ModelDef("Skill", [
+    FieldDef("Name", BasicType("string")),
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Levels", ArrayType(BasicType("int"))),
+])
+
+ITEM = ModelDef("Item", [
+    FieldDef("Key", BasicType("string"), is_primary=True),
+    FieldDef("Price", BasicType("float")),
+])
+
+
+def _write(layout, rows):
+    """rows 以 dict 书写便于阅读，写出前按字段顺序转为 tuple"""
+    f = io.BytesIO()
+    write_table(layout, (tuple(row.get(name) for name in layout.names) for row in rows), f)
+    return f.getvalue()
+
+
+def test_round_trip_with_int_key():
+    layout = TableLayout(SKILL)
+    rows = [{"Name": f"S{i}", "Id": 100 - i, "Levels": list(range(i % 3))} for i in range(50)]
+    reader = BinaryTableReader(_write(layout, iter(rows)), layout)
+
+    assert reader.key_kind == KEY_INT
+    assert len(reader) == 50
+    assert [reader.row_dict(i) for i in range(50)] == rows
+    assert reader.get(90) == ["S10", 90, [0]]
+    assert reader.get(7) is None
+
+
+def test_round_trip_with_string_key(tmp_path):
+    layout = TableLayout(ITEM)
+    rows = [{"Key": k, "Price": 1.5} for k in ("sword", "axe", "盾")]
+    path = tmp_path / "DT_Item.bin"
+    path.write_bytes(_write(layout, rows))
+
+    with BinaryTableReader.open(path, layout) as reader:
+        assert reader.key_kind == KEY_STRING
+        assert reader.get("axe") == ["axe", 1.5]
+        assert reader.get("盾") == ["盾", 1.5]
+        assert reader.find("bow") is None
+
+
+def test_empty_table_and_schema_mismatch():
+    data = _write(TableLayout(SKILL), [])
+    assert len(BinaryTableReader(data, TableLayout(SKILL))) == 0
+
+    with pytest.raises(ValueError):
+        BinaryTableReader(data, TableLayout(ITEM))
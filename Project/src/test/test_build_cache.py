@@ -0,0 +1,51 @@
+import os
+
+from pipeline.build_cache import BuildCache, CacheEntry, file_digest
+
+
+def _entry(cache, path, outputs):
+    st = os.stat(path)
+    return CacheEntry(
+        content_hash=file_digest(path),
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        config=cache.config,
+        outputs=outputs,
+    )
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    (out_dir / "A.cs").write_text("class A {}")
+    book = tmp_path / "A.xlsx"
+    book.write_bytes(b"v1")
+
+    cache = BuildCache(str(out_dir), "json", "csharp")
+    cache.update(str(book), _entry(cache, str(book), {"A.cs": "x"}))
+    cache.save()
+
+    cache = BuildCache(str(out_dir), "json", "csharp").load()
+    assert cache.lookup(str(book), file_digest(str(book))) is not None
+
+    # 导出配置变化
+    other = BuildCache(str(out_dir), "bin", "csharp").load()
+    assert other.lookup(str(book), file_digest(str(book))) is None
+
+    # 输出文件被删除
+    (out_dir / "A.cs").unlink()
+    assert cache.lookup(str(book), file_digest(str(book))) is None
+    (out_dir / "A.cs").write_text("class A {}")
+
+    # 内容变化
+    book.write_bytes(b"v2-longer")
+    assert cache.lookup(str(book), file_digest(str(book))) is None
+
+
+def test_prune_removes_deleted_workbooks(tmp_path):
+    book = tmp_path / "A.xlsx"
+    book.write_bytes(b"v1")
+    cache = BuildCache(str(tmp_path), "json", "csharp")
+    cache.update(str(book), _entry(cache, str(book), {}))
+    cache.prune([])
+    assert cache.entries == {}
@@ -0,0 +1,175 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from backends.codegen import SchemaPlan, TypeMap
+from backends.factory import get_backend
+from exporters.binary_layout import TableLayout
+from exporters.binary_table import schema_fingerprint, write_table
+from exporters.string_pool import POOL_FILE, StringPool, write_pool
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType, CustomType, EnumType
+
+SKILL_TYPE = EnumType("SkillType", {"Attack": 0, "Heal": 1}, underlying="byte")
+
+ITEM = ModelDef("ItemConfig", [FieldDef("Code", BasicType("string"), is_primary=True)])
+SKILL = ModelDef("SkillConfig", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Name", BasicType("string"), comment="技能名"),
+    FieldDef("Type", SKILL_TYPE),
+    FieldDef("Rate", BasicType("float")),
+    FieldDef("Passive", BasicType("bool")),
+    FieldDef("Types", ArrayType(SKILL_TYPE)),
+    FieldDef("Flags", ArrayType(BasicType("bool"))),
+    FieldDef("Waves", ArrayType(ArrayType(BasicType("int")))),
+    FieldDef("Drops", ArrayType(CustomType("ItemConfig"))),
+    FieldDef("Tags", ArrayType(ArrayType(BasicType("string")))),
+])
+MODEL_MAP = {"ItemConfig": ITEM, "SkillConfig": SKILL}
+ROWS = [
+    (3, "火球", 0, 0.5, True, [1, 0], [True, False], [[1, 2], []], ["sword", "shield"], [["a"], ["b", ""]]),
+    (1, "", 1, 2.0, False, [], [], [], [], []),
+]
+
+
+def _generate(backend, out_dir):
+    """按 tools.export 的目录结构写出全部代码"""
+    ext = backend.file_ext
+    files = {f"Enums/SkillType.{ext}": backend.export_enum(SKILL_TYPE)}
+    for model in (ITEM, SKILL):
+        files[f"Models/{model.name}.{ext}"] = backend.export_model(model, MODEL_MAP)
+    for name, code in backend.export_runtime().items():
+        files[f"Runtime/{name}.{ext}"] = code
+    for rel, code in files.items():
+        path = out_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code, encoding="utf-8")
+
+
+def _write_data(out_dir, pooled):
+    pool = StringPool() if pooled else None
+    with open(out_dir / "DT_SkillConfig.bin", "wb") as f:
+        write_table(TableLayout(SKILL, MODEL_MAP, pool), ROWS, f)
+    if pooled:
+        with open(out_dir / POOL_FILE, "wb") as f:
+            write_pool(pool.strings, f)
+
+
+def _expected():
+    return [[round(v, 3) if isinstance(v, float) else v for v in row] for row in ROWS]
+
+
+def test_plan_is_shared_per_model_map():
+    backend = get_backend("python", binary_loader=True)
+    plan, types = backend.context(MODEL_MAP)
+    assert backend.context(MODEL_MAP) == (plan, types)
+    assert backend.context(dict(MODEL_MAP))[0] is not plan
+
+    model_plan = plan.model(SKILL)
+    assert plan.model(SKILL) is model_plan
+    assert model_plan.fingerprint == schema_fingerprint(TableLayout(SKILL, MODEL_MAP))
+    assert model_plan.enums == ["SkillType"] and model_plan.key == 0
+    assert types(SKILL.fields[8].type) == "list[str]"
+    assert get_backend("cpp").context(MODEL_MAP)[1](SKILL.fields[7].type) == "std::vector<std::vector<int32_t>>"
+    assert get_backend("csharp").context(MODEL_MAP)[1](SKILL.fields[8].type) == "ItemConfig[]"
+    with pytest.raises(TypeError):
+        TypeMap()
+
+
+def test_key_type_follows_reference_chain_and_cycles():
+    a = ModelDef("A", [FieldDef("B", CustomType("B"), is_primary=True)])
+    b = ModelDef("B", [FieldDef("A", CustomType("A"), is_primary=True)])
+    plan = SchemaPlan({"A": a, "B": b, "ItemConfig": ITEM})
+    assert plan.key_type("A") == BasicType("int")
+    assert plan.key_type("Missing") == BasicType("int")
+    assert plan.value_type(ArrayType(CustomType("ItemConfig"))) == ArrayType(BasicType("string"))
+
+
+@pytest.mark.parametrize("pooled", [False, True])
+def test_python_loader_reads_exported_table(tmp_path, pooled):
+    _generate(get_backend("python", binary_loader=True, string_pool=pooled), tmp_path)
+    _write_data(tmp_path, pooled)
+    script = (
+        "import json\n"
+        "from Enums.SkillType import SkillType\n"
+        "from Models.SkillConfig import SkillConfig, SkillConfigTable\n"
+        + (f"from Runtime import StringPool\nStringPool.load({POOL_FILE!r})\n" if pooled else "")
+        + "table = SkillConfigTable.load('DT_SkillConfig.bin')\n"
+        "assert table.get(3).Type is SkillType.Attack and table.get(2) is None\n"
+        "assert not hasattr(table.rows[0], '__dict__')\n"
+        "rows = [[round(getattr(r, n), 3) if n == 'Rate' else getattr(r, n) for n in SkillConfig.__slots__]"
+        " for r in table]\n"
+        "print(json.dumps(rows))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout) == _expected()
+
+
+CPP_MAIN = r"""
+#include <iostream>
+#include "Models/SkillConfig.h"
+
+template <typename T> void Print(const T& v) { std::cout << v; }
+void Print(bool v) { std::cout << (v ? "true" : "false"); }
+void Print(const std::string& v) { std::cout << '"' << v << '"'; }
+void Print(SkillType v) { std::cout << static_cast<int>(v); }
+template <typename T> void Print(const std::vector<T>& v)
+{
+    std::cout << '[';
+    for (size_t i = 0; i < v.size(); i++) { if (i) std::cout << ','; Print(static_cast<T>(v[i])); }
+    std::cout << ']';
+}
+
+int main()
+{
+    %s
+    auto table = SkillConfigTable::Load("DT_SkillConfig.bin");
+    if (table.Find(3) == nullptr || table.Find(2) != nullptr) return 1;
+    std::cout << '[';
+    for (size_t i = 0; i < table.Rows.size(); i++)
+    {
+        const SkillConfig& r = table.Rows[i];
+        std::cout << (i ? ",[" : "[");
+        Print(r.Id); std::cout << ','; Print(r.Name); std::cout << ','; Print(r.Type); std::cout << ',';
+        Print(r.Rate); std::cout << ','; Print(r.Passive); std::cout << ','; Print(r.Types); std::cout << ',';
+        Print(r.Flags); std::cout << ','; Print(r.Waves); std::cout << ','; Print(r.Drops); std::cout << ',';
+        Print(r.Tags); std::cout << ']';
+    }
+    std::cout << "]\n";
+}
+"""
+
+
+@pytest.mark.skipif(shutil.which("g++") is None, reason="需要 g++")
+@pytest.mark.parametrize("pooled", [False, True])
+def test_cpp_loader_compiles_and_reads_exported_table(tmp_path, pooled):
+    _generate(get_backend("cpp", binary_loader=True, string_pool=pooled), tmp_path)
+    _write_data(tmp_path, pooled)
+    load_pool = f'data2code::StringPool::Load("{POOL_FILE}");' if pooled else ""
+    (tmp_path / "main.cpp").write_text(
+        ('#include "Runtime/StringPool.h"\n' if pooled else "") + CPP_MAIN % load_pool, encoding="utf-8")
+    build = subprocess.run(["g++", "-std=c++17", "-Wall", "-Werror", "-o", "main", "main.cpp"],
+                           cwd=tmp_path, capture_output=True, text=True)
+    assert build.returncode == 0, build.stderr
+    proc = subprocess.run([os.path.join(tmp_path, "main")], cwd=tmp_path, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout) == _expected()
+
+
+def test_plain_classes_without_loader():
+    code = get_backend("python").export_model(SKILL, MODEL_MAP)
+    namespace = {}
+    exec(code.replace("from Enums.SkillType import SkillType", "SkillType = int"), namespace)
+    skill = namespace["SkillConfig"](Id=5)
+    assert (skill.Id, skill.Name, skill.Rate, skill.Drops) == (5, "", 0.0, [])
+    assert "SkillConfig(Id=5" in repr(skill)
+
+    header = get_backend("cpp").export_model(SKILL, MODEL_MAP)
+    assert "std::vector<std::string> Drops{}; // ItemConfig 的主键" in header
+    assert "Read(" not in header and "DataTableReader" not in header
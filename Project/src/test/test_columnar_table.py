@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+from exporters.binary_layout import PackError, TableLayout
+from exporters.columnar_table import ALIGN, BUFFER_ENTRY, HEADER, ColumnarTableReader, write_columns
+from exporters.factory import get_data_exporter
+from exporters.columnar_exporter import ColumnarExporter
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType, EnumType
+
+ELEMENT = EnumType("Element", {"Fire": 1, "Ice": 2}, underlying="byte")
+
+BALANCE = ModelDef("Balance", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Power", BasicType("float")),
+    FieldDef("Enabled", BasicType("bool")),
+    FieldDef("Element", ELEMENT),
+    FieldDef("Name", BasicType("string")),
+    FieldDef("Levels", ArrayType(BasicType("int"))),
+    FieldDef("Tags", ArrayType(BasicType("string"))),
+])
+
+
+def _write(layout, rows):
+    """rows 以 dict 书写便于阅读，写出前按字段顺序转为 tuple"""
+    f = io.BytesIO()
+    write_columns(layout, (tuple(row.get(name) for name in layout.names) for row in rows), f)
+    return f.getvalue()
+
+
+def test_round_trip_columns():
+    layout = TableLayout(BALANCE)
+    rows = [
+        {"Id": i, "Power": i * 0.5, "Enabled": i % 3 == 0, "Element": 1 + i % 2,
+         "Name": f"名字{i}", "Levels": list(range(i % 4)), "Tags": ["a"] * (i % 2)}
+        for i in range(21)
+    ]
+    reader = ColumnarTableReader(_write(layout, rows), layout)
+
+    assert len(reader) == 21
+    assert reader.rows() == rows
+    ids = reader.column("Id")
+    assert ids.typecode == "i" and list(ids) == list(range(21))
+    assert reader.column("Element").itemsize == 1
+
+
+def test_buffers_are_aligned_and_values_coerced():
+    layout = TableLayout(BALANCE)
+    rows = [{"Id": 1.0, "Power": None, "Enabled": "false", "Element": 2,
+             "Name": None, "Levels": None, "Tags": []}]
+    data = _write(layout, rows)
+    reader = ColumnarTableReader(data, layout)
+    assert reader.rows() == [{"Id": 1, "Power": 0.0, "Enabled": False, "Element": 2,
+                              "Name": "", "Levels": [], "Tags": []}]
+    for entries in reader._buffers.values():
+        assert all(pos % ALIGN == 0 for pos, _ in entries)
+    assert HEADER.size + BUFFER_ENTRY.size <= entries[0][0] < len(data)
+
+
+def test_empty_table_and_schema_mismatch():
+    layout = TableLayout(BALANCE)
+    data = _write(layout, [])
+    assert ColumnarTableReader(data, layout).rows() == []
+
+    other = TableLayout(ModelDef("Balance", BALANCE.fields[:2]))
+    with pytest.raises(ValueError):
+        ColumnarTableReader(data, other)
+
+
+def test_factory_registration():
+    assert isinstance(get_data_exporter("columnar"), ColumnarExporter)
+
+
+@pytest.mark.parametrize("lenient", [False, True])
+def test_invalid_array_element(lenient):
+    # 数组元素出错时 PackError.row 是所在的行；lenient 时按默认值写出
+    layout = TableLayout(BALANCE, lenient=lenient)
+    rows = [{"Id": 1, "Levels": [1, 2]}, {"Id": 2, "Levels": []}, {"Id": 3, "Levels": [3, "x"]}]
+    if not lenient:
+        with pytest.raises(PackError) as info:
+            _write(layout, rows)
+        assert (info.value.field, info.value.value, info.value.row) == ("Levels", "x", 2)
+        return
+    reader = ColumnarTableReader(_write(layout, rows), layout)
+    assert [row["Levels"] for row in reader.rows()] == [[1, 2], [], [3, 0]]
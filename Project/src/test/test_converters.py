@@ -0,0 +1,89 @@
+import pytest
+
+from exporters.converters import TypeCompiler, UnknownEnumValue, compile_converter, compile_model
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType, CustomType, EnumType
+
+ELEMENT = EnumType("Element", {"Fire": 1, "Ice": 2})
+
+
+def test_enum_and_array_converters():
+    assert compile_converter(ELEMENT)("Ice") == 2
+    assert compile_converter(ELEMENT)(7) == 7
+    assert compile_converter(ELEMENT)(None) == 0
+    assert compile_converter(ArrayType(ELEMENT))("Fire, Ice") == [1, 2]
+    assert compile_converter(ArrayType(BasicType("int")))("1, 2,3") == [1, 2, 3]
+    assert compile_converter(ArrayType(BasicType("int")))(5) == [5]
+    assert compile_converter(ArrayType(BasicType("bool")))("true,0,Yes") == [True, False, True]
+    assert compile_converter(ArrayType(BasicType("string")))(None) == []
+
+
+def test_compile_model_matches_fields():
+    model = ModelDef("M", [
+        FieldDef("Id", BasicType("int")),
+        FieldDef("Ref", CustomType("Other")),
+        FieldDef("Refs", ArrayType(CustomType("Other"))),
+    ])
+    compiled = compile_model(model)
+    assert compiled.names == ("Id", "Ref", "Refs")
+    assert [i for i, _ in compiled.active] == [2]
+    assert compiled.convert_row((1, "x", None)) == [1, "x", []]
+    assert compiled.convert_row((1,)) == [1]
+    # 被引用的 Model 未知：引用原样拆分
+    assert compiled.convert_row((1, "x", "a, b")) == [1, "x", ["a", "b"]]
+
+
+OTHER = ModelDef("Other", [FieldDef("Id", BasicType("int"), is_primary=True)])
+NAMED = ModelDef("Named", [FieldDef("Key", BasicType("string"), is_primary=True)])
+# 主键本身引用另一张表：沿引用链解析为 Other 的 int 主键
+CHAINED = ModelDef("Chained", [FieldDef("Other", CustomType("Other"), is_primary=True)])
+MODEL_MAP = {m.name: m for m in (OTHER, NAMED, CHAINED)}
+
+
+def test_references_convert_to_primary_key_type():
+    assert compile_converter(CustomType("Other"), model_map=MODEL_MAP)("3") == 3
+    assert compile_converter(CustomType("Other"), model_map=MODEL_MAP)("  ") is None
+    assert compile_converter(CustomType("Named"), model_map=MODEL_MAP)(7) == "7"
+    assert compile_converter(CustomType("Chained"), model_map=MODEL_MAP)(4.0) == 4
+    assert compile_converter(ArrayType(CustomType("Other")), model_map=MODEL_MAP)("1, 2") == [1, 2]
+    assert compile_converter(ArrayType(CustomType("Named")), model_map=MODEL_MAP)("a, b") == ["a", "b"]
+    with pytest.raises(ValueError):
+        compile_converter(CustomType("Other"), model_map=MODEL_MAP)(1.5)
+
+
+def test_nested_arrays():
+    convert = compile_converter(ArrayType(ArrayType(BasicType("int"))))
+    assert convert("[[1, 2], [3], []]") == [[1, 2], [3], []]
+    assert convert("[1, 2], [3]") == [[1, 2], [3]]
+    assert convert(5) == [[5]]
+    assert convert(None) == []
+    names = compile_converter(ArrayType(ArrayType(BasicType("string"))))
+    assert names('[["a,b", c], [d]]') == [["a,b", "c"], ["d"]]
+    deep = compile_converter(ArrayType(ArrayType(ArrayType(ELEMENT))))
+    assert deep("[[[Fire], [Ice, 1]]]") == [[[1], [2, 1]]]
+    refs = compile_converter(ArrayType(ArrayType(CustomType("Other"))), model_map=MODEL_MAP)
+    assert refs("[[1], [2, 3]]") == [[1], [2, 3]]
+    with pytest.raises(ValueError):
+        convert("[[1, 2]")
+
+
+def test_nested_enum_fallback_keeps_shape():
+    convert = compile_converter(ArrayType(ArrayType(ELEMENT)), strict=True)
+    with pytest.raises(UnknownEnumValue) as info:
+        convert("[[Fire], [Wind, Ice]]")
+    assert info.value.literals == ["Wind"]
+    assert info.value.fallback == [[1], [0, 2]]
+
+
+def test_type_compiler_detects_key_cycles_and_shares_converters():
+    a = ModelDef("A", [FieldDef("B", CustomType("B"), is_primary=True)])
+    b = ModelDef("B", [FieldDef("A", CustomType("A"), is_primary=True)])
+    compiler = TypeCompiler({"A": a, "B": b})
+    with pytest.raises(ValueError, match="A -> B -> A"):
+        compiler.converter(CustomType("A"))
+
+    compiler = TypeCompiler(MODEL_MAP)
+    first = compile_model(ModelDef("X", [FieldDef("Refs", ArrayType(CustomType("Other")))]), compiler=compiler)
+    second = compile_model(ModelDef("Y", [FieldDef("More", ArrayType(CustomType("Other")))]), compiler=compiler)
+    assert first.converters[0] is second.converters[0]
@@ -0,0 +1,58 @@
+import pytest
+
+from excel_fixture import SKILL_ENUMS, SKILL_MODELS, make_workbook
+from exporters.converters import UnknownEnumValue, compile_converter
+from exporters.json_exporter import JSONExporter
+from schema.parser import parse_enums_sheet, parse_models_sheet
+from schema.types import ArrayType, EnumType
+
+SKILL_TYPE = EnumType("SkillType", {"Fire": 1, "Ice": 2, "Thunder": 3})
+
+
+def test_resolver_lookups():
+    resolver = SKILL_TYPE.resolver
+    for literal in ("Fire", "SkillType.Fire", "fire", " FIRE ", "skilltype.fire", 1, 1.0, "1"):
+        assert resolver.lookup(literal) == 1
+    for literal in ("Fier", 4, 1.5, "", None):
+        assert resolver.lookup(literal) is None
+    assert resolver.name_of(2) == "Ice"
+    assert "Thunder" in resolver and "Wind" not in resolver
+
+
+def test_strict_converters():
+    convert = compile_converter(SKILL_TYPE, strict=True)
+    assert convert("SkillType.Ice") == 2
+    assert convert(None) == 0 and convert("  ") == 0
+    with pytest.raises(UnknownEnumValue) as info:
+        convert("Fier")
+    assert info.value.literals == ["Fier"] and info.value.fallback == 0
+
+    convert = compile_converter(ArrayType(SKILL_TYPE), strict=True)
+    assert convert("fire, Ice") == [1, 2]
+    with pytest.raises(UnknownEnumValue) as info:
+        convert("Fire, Wind, 9")
+    assert info.value.literals == ["Wind", "9"] and info.value.fallback == [1, 0, 0]
+    assert compile_converter(ArrayType(SKILL_TYPE))("Fire, Wind") == [1, 0]
+
+
+def test_strict_export_reports_all_cells(tmp_path, capsys):
+    models = dict(SKILL_MODELS)
+    models["SkillConfig"] = SKILL_MODELS["SkillConfig"] + [("Weak", "SkillType[]", "弱点", False)]
+    data = {"SkillConfig": [
+        (1, "火球", 1.0, "Fier", "a", "Ice"),
+        (2, "冰箭", 2.0, "Ice", None, "Fire,Wnd"),
+        (3, "雷击", 3.0, 7, None, None),
+    ]}
+    path = make_workbook(tmp_path / "Skill.xlsx", SKILL_ENUMS, models, data)
+    enums = parse_enums_sheet(path)
+    models = parse_models_sheet(path, enums)
+
+    with pytest.raises(ValueError, match="共 3 个错误"):
+        JSONExporter().export_data(path, models, enums)
+    out = capsys.readouterr().out
+    assert "[SkillConfig!D2] 未知 SkillType 枚举值: 'Fier'" in out
+    assert "[SkillConfig!F3] 未知 SkillType 枚举值: 'Wnd'" in out
+    assert "[SkillConfig!D4]" in out
+
+    rows = JSONExporter(strict=False).export_data(path, models, enums)["SkillConfig"]
+    assert [row["Type"] for row in rows] == [0, 2, 7]
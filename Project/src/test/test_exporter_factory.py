@@ -0,0 +1,24 @@
+import pytest
+
+from exporters import factory
+from exporters.base import BaseDataExporter
+from exporters.factory import get_data_exporter
+
+
+class MissingOptions(BaseDataExporter):
+    """注册错误：没有实现 from_options"""
+
+    def iter_tables(self, source, models, enums):
+        return iter(())
+
+    def write_tables(self, tables, output_dir):
+        return {}
+
+
+def test_incomplete_exporter_fails_when_selected(monkeypatch):
+    monkeypatch.setitem(factory.DATA_EXPORTERS, "broken", f"{__name__}:MissingOptions")
+    with pytest.raises(TypeError, match="from_options"):
+        get_data_exporter("broken")
+    with pytest.raises(TypeError):
+        MissingOptions()
+    assert get_data_exporter("bin").file_ext == "bin"
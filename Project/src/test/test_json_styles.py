@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from exporters import json_writers
+from exporters.json_exporter import JSONExporter
+from exporters.json_writers import JSON_STYLES, get_serializer, write_compact_array, write_ndjson
+
+ROWS = [{"Id": i, "Name": f"火球{i}", "Rate": i / 3, "Tags": ["a", "b"], "Ok": i % 2 == 0} for i in range(5)]
+
+
+def test_compact_and_ndjson(monkeypatch):
+    monkeypatch.setattr(json_writers, "CHUNK_ROWS", 2)
+    _, dumps = get_serializer("stdlib")
+
+    f = io.BytesIO()
+    write_compact_array(iter(ROWS), f, dumps)
+    assert f.getvalue().decode("utf-8") == json.dumps(ROWS, ensure_ascii=False, separators=(",", ":"))
+
+    f = io.BytesIO()
+    write_ndjson(iter(ROWS), f, dumps)
+    lines = f.getvalue().decode("utf-8").split("\n")
+    assert lines[-1] == ""
+    assert [json.loads(line) for line in lines[:-1]] == ROWS
+
+    for writer in (write_compact_array, write_ndjson):
+        f = io.BytesIO()
+        writer(iter([]), f, dumps)
+        assert f.getvalue() in (b"[]", b"")
+
+
+@pytest.mark.skipif(json_writers.orjson is None, reason="orjson 未安装")
+def test_orjson_matches_stdlib_compact():
+    assert get_serializer("orjson")[1](ROWS) == get_serializer("stdlib")[1](ROWS)
+
+
+def test_serializer_fallback(monkeypatch):
+    monkeypatch.setattr(json_writers, "orjson", None)
+    assert get_serializer("auto")[0] == "stdlib"
+    with pytest.raises(ValueError):
+        get_serializer("orjson")
+
+
+def test_exporter_styles(tmp_path):
+    pretty = JSONExporter()
+    pretty.write_tables([("Skill", iter(ROWS))], tmp_path)
+    text = (tmp_path / "DT_Skill.json").read_text(encoding="utf-8")
+    assert text == json.dumps(ROWS, ensure_ascii=False, indent=4)
+
+    mapping = JSONExporter(style="ndjson").write_tables([("Skill", iter(ROWS))], tmp_path)
+    assert mapping == {"Skill": "DT_Skill.ndjson"}
+    lines = (tmp_path / "DT_Skill.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+
+    with pytest.raises(ValueError):
+        JSONExporter(style="yaml")
+
+
+def test_tuple_rows_named_at_write(tmp_path):
+    names = ("Id", "Name", "Rate", "Tags", "Ok")
+    records = [tuple(row[name] for name in names) for row in ROWS] + [(9, "短行")]
+    expected = ROWS + [{"Id": 9, "Name": "短行"}]
+    for style in JSON_STYLES:
+        exporter = JSONExporter(style=style)
+        out_file = tmp_path / f"DT_Skill.{exporter.file_ext}"
+        exporter.write_rows(iter(records), out_file, names)
+        text = out_file.read_text(encoding="utf-8")
+        rows = [json.loads(line) for line in text.splitlines()] if style == "ndjson" else json.loads(text)
+        assert rows == expected
+
+
+@pytest.mark.parametrize("style", JSON_STYLES)
+def test_write_file_without_iter_tables(tmp_path, style):
+    # 手工构造的 data_dict：导出器没有运行过 iter_tables，字段名取自 dict 本身
+    exporter = JSONExporter(style=style, serializer="stdlib")
+    mapping = exporter.write_file({"Skill": ROWS}, tmp_path)
+    text = (tmp_path / mapping["Skill"]).read_text(encoding="utf-8")
+    rows = [json.loads(line) for line in text.splitlines()] if style == "ndjson" else json.loads(text)
+    assert rows == ROWS
@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from excel_fixture import SKILL_DATA, SKILL_ENUMS, SKILL_MODELS, make_workbook
+from pipeline.output_writer import OutputWriter, atomic_open, remove_orphans
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("atomic", [True, False])
+@pytest.mark.parametrize("threads", [1, 4])
+def test_writer_skips_unchanged_files(tmp_path, threads, atomic):
+    with OutputWriter(str(tmp_path), threads, atomic) as writer:
+        writer.submit(os.path.join("Models", "A.cs"), lambda: "class A {}")
+        writer.write(os.path.join("Enums", "E.cs"), b"enum E {}")
+        outputs = writer.wait()
+    assert set(outputs) == {os.path.join("Models", "A.cs"), os.path.join("Enums", "E.cs")}
+    assert (tmp_path / "Models" / "A.cs").read_text() == "class A {}"
+    assert writer.written == 2
+
+    mtime = os.stat(tmp_path / "Models" / "A.cs").st_mtime_ns
+    with OutputWriter(str(tmp_path), threads, atomic) as writer:
+        writer.submit(os.path.join("Models", "A.cs"), lambda: "class A {}")
+        writer.submit(os.path.join("Enums", "E.cs"), lambda: "enum E { X }")
+    assert (writer.written, writer.unchanged) == (1, 1)
+    assert os.stat(tmp_path / "Models" / "A.cs").st_mtime_ns == mtime
+    assert os.listdir(tmp_path / "Enums") == ["E.cs"]
+
+
+def test_writer_reports_render_errors_after_all_tasks(tmp_path):
+    def fail():
+        raise ValueError("bad model")
+
+    writer = OutputWriter(str(tmp_path), threads=2)
+    writer.submit("A.cs", fail)
+    writer.submit("B.cs", lambda: "ok")
+    with pytest.raises(ValueError, match="bad model"):
+        writer.wait()
+    writer.close()
+    assert os.listdir(tmp_path) == ["B.cs"]
+
+
+def test_atomic_open_keeps_old_content_on_error(tmp_path):
+    path = tmp_path / "DT_A.json"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_open(str(path), "w", encoding="utf-8") as f:
+            f.write("partial")
+            raise RuntimeError
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["DT_A.json"]
+
+
+def test_remove_orphans_prunes_empty_dirs(tmp_path):
+    for rel in ("Models/A.cs", "Models/B.cs", "Enums/E.cs", "keep.txt"):
+        (tmp_path / rel).parent.mkdir(exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+    removed = remove_orphans(str(tmp_path), {"Models/A.cs", "Models/B.cs", "Enums/E.cs"}, {"Models/A.cs"})
+    assert removed == ["Enums/E.cs", "Models/B.cs"]
+    assert sorted(os.listdir(tmp_path)) == ["Models", "keep.txt"]
+    assert os.listdir(tmp_path / "Models") == ["A.cs"]
+
+
+def _export(excel_dir, out_dir):
+    proc = subprocess.run(
+        [sys.executable, "-m", "tools.export", str(excel_dir), "--out", str(out_dir)],
+        cwd=os.path.dirname(SRC_DIR), env=dict(os.environ, PYTHONPATH=SRC_DIR),
+        capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+
+def test_removed_model_outputs_are_deleted(tmp_path):
+    excel_dir = tmp_path / "excel"
+    excel_dir.mkdir()
+    out_dir = tmp_path / "out"
+    models = {**SKILL_MODELS, "BuffConfig": [("Id", "int", "主键", True)]}
+    make_workbook(excel_dir / "Skill.xlsx", SKILL_ENUMS, models, {**SKILL_DATA, "BuffConfig": [(1,)]})
+    make_workbook(excel_dir / "Extra.xlsx", None, {"ItemConfig": [("Id", "int", "主键", True)]},
+                  {"ItemConfig": [(1,)]})
+    _export(excel_dir, out_dir)
+    assert (out_dir / "Models" / "BuffConfig.cs").exists()
+    assert (out_dir / "DataTables" / "DT_ItemConfig.json").exists()
+
+    # 删掉一个 Model 和整个工作簿
+    make_workbook(excel_dir / "Skill.xlsx", SKILL_ENUMS, SKILL_MODELS, SKILL_DATA)
+    (excel_dir / "Extra.xlsx").unlink()
+    (out_dir / "notes.txt").write_text("不是导出产物")
+    _export(excel_dir, out_dir)
+    assert not (out_dir / "Models" / "BuffConfig.cs").exists()
+    assert not (out_dir / "DataTables" / "DT_BuffConfig.json").exists()
+    assert not (out_dir / "Models" / "ItemConfig.cs").exists()
+    assert not (out_dir / "DataTables" / "DT_ItemConfig.json").exists()
+    assert (out_dir / "Models" / "SkillConfig.cs").exists()
+    assert (out_dir / "Enums" / "SkillType.cs").exists()
+    assert (out_dir / "notes.txt").exists()
@@ -1,13 +1,16 @@
 # test_parser.py
 
 import os
+import tempfile
 from schema.parser import parse_models_sheet, parse_enums_sheet, validate_schema
 from backends.csharp.exporter import CSharpBackend
+from excel_fixture import make_skill_workbook
 
 # -------------------------
-# 配置 Excel 文件路径
+# 配置 Excel 文件路径：DATA2CODE_SKILL_XLSX 指定真实工作簿，未设置时生成测试用工作簿
 # -------------------------
-file_path = r"D:\Data2Code\Excel\Skill.xlsx"
+file_path = os.environ.get("DATA2CODE_SKILL_XLSX") or str(
+    make_skill_workbook(os.path.join(tempfile.mkdtemp(), "Skill.xlsx")))
 
 # -------------------------
 # 解析枚举和模型
@@ -19,7 +22,7 @@ models = parse_models_sheet(file_path, enums)
 # 校验 schema
 # -------------------------
 try:
-    validate_schema(file_path, models, enums)
+    validate_schema(file_path)
 except ValueError as e:
     print("Schema 校验失败:", e)
     exit(1)
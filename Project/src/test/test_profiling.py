@@ -0,0 +1,83 @@
+import json
+
+from excel_fixture import make_skill_workbook
+from exporters.json_exporter import JSONExporter
+from profiling import NULL_PROFILER, Profiler, active, chrome_trace, format_summary, stage, use, write_chrome_trace
+from schema.index import build_schema_index
+
+
+class _Model:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_stages_nest_and_record_counters():
+    profiler = Profiler(memory=True)
+    with use(profiler):
+        assert active() is profiler
+        with stage("outer") as outer:
+            with stage("inner", "A.xlsx", "Item") as inner:
+                data = [0] * 100_000
+                inner.rows = 3
+            del data
+        outer.bytes = 10
+    profiler.finish()
+    assert active() is NULL_PROFILER
+    names = [e.name for e in profiler.events]
+    assert names == ["inner", "outer"]
+    inner, outer = profiler.events
+    assert inner.rows == 3 and inner.workbook == "A.xlsx" and inner.model == "Item"
+    assert outer.duration >= inner.duration
+    # 子阶段的峰值计入父阶段
+    assert inner.peak_memory >= 800_000 and outer.peak_memory >= inner.peak_memory
+
+
+def test_table_rows_split_read_and_write(tmp_path):
+    profiler = Profiler()
+    tables = [(_Model("A"), iter([(1, 2)] * 5)), (_Model("B"), iter([]))]
+    out = []
+    for name, rows in profiler.tables(iter(tables), "W.xlsx"):
+        out.append((name, list(rows)))
+    assert [(name, len(rows)) for name, rows in out] == [("A", 5), ("B", 0)]
+    (tmp_path / "DT_A.json").write_bytes(b"12345")
+    profiler.table_bytes("W.xlsx", {"A": "DT_A.json"}, str(tmp_path))
+    a, b = profiler.events
+    assert (a.model, a.rows, a.cells, a.bytes) == ("A", 5, 10, 5)
+    assert set(a.parts) == {"read_convert", "write"} and b.rows == 0
+
+
+def test_null_profiler_passes_tables_through():
+    rows = iter([(1,)])
+    [(name, passed)] = list(NULL_PROFILER.tables([(_Model("A"), rows)], "W.xlsx"))
+    assert name == "A" and passed is rows
+    with NULL_PROFILER.stage("x") as event:
+        assert event is None
+
+
+def test_workbook_export_summary_and_trace(tmp_path):
+    path = str(make_skill_workbook(tmp_path / "Skill.xlsx"))
+    profiler = Profiler()
+    with use(profiler):
+        index = build_schema_index([path])
+        models, enums = index.workbook(path)
+        exporter = JSONExporter()
+        with stage("export_data", path):
+            tables = profiler.tables(exporter.iter_tables(path, models, enums), path)
+            mapping = exporter.write_tables(tables, str(tmp_path / "out"))
+        profiler.table_bytes(path, mapping, str(tmp_path / "out"))
+
+    names = {e.name for e in profiler.events}
+    assert {"load_workbook", "parse_enums", "parse_models", "schema_resolve", "table"} <= names
+    table = next(e for e in profiler.events if e.name == "table")
+    assert (table.model, table.rows, table.cells) == ("SkillConfig", 3, 15) and table.bytes > 0
+
+    summary = format_summary(profiler.finish())
+    assert "table.read_convert" in summary and "SkillConfig" in summary
+
+    trace = chrome_trace(profiler)["traceEvents"]
+    complete = [e for e in trace if e["ph"] == "X"]
+    assert len(complete) == len(profiler.events)
+    assert all(e["ts"] >= 0 and e["dur"] >= 0 for e in complete)
+    assert any(e["args"].get("model") == "SkillConfig" for e in complete)
+    write_chrome_trace(profiler, tmp_path / "trace.json")
+    assert json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from excel_fixture import make_skill_workbook
+from exporters.binary_layout import TableLayout
+from exporters.binary_table import write_table
+from exporters.columnar_table import write_columns
+from exporters.string_pool import POOL_FILE, StringPool, write_pool
+from reader import PooledStrings, open_table, open_tables
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType, CustomType, EnumType
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ITEM = ModelDef("ItemConfig", [FieldDef("Code", BasicType("string"), is_primary=True)])
+SKILL = ModelDef("SkillConfig", [
+    FieldDef("Id", BasicType("int"), is_primary=True),
+    FieldDef("Name", BasicType("string"), comment="技能名"),
+    FieldDef("Type", EnumType("SkillType", {"Fire": 1, "Ice": 2})),
+    FieldDef("Tags", ArrayType(BasicType("string"))),
+    FieldDef("Waves", ArrayType(ArrayType(BasicType("int")))),
+    FieldDef("Drop", CustomType("ItemConfig")),
+    FieldDef("Power", BasicType("float")),
+])
+MODEL_MAP = {"ItemConfig": ITEM, "SkillConfig": SKILL}
+ROWS = [
+    (i, f"技能{i}", 1 + i % 2, ["a", f"t{i}"][: i % 3], [[i], []], f"item{i % 4}", i * 0.5)
+    for i in range(50, 0, -1)
+]
+
+
+def _write(tmp_path, writer, pool=None):
+    path = tmp_path / f"DT_SkillConfig.{'bin' if writer is write_table else 'col'}"
+    with open(path, "wb") as f:
+        writer(TableLayout(SKILL, MODEL_MAP, pool), ROWS, f)
+    if pool is not None:
+        with open(tmp_path / POOL_FILE, "wb") as f:
+            write_pool(pool.strings, f)
+    return str(path)
+
+
+@pytest.mark.parametrize("writer", [write_table, write_columns])
+@pytest.mark.parametrize("pooled", [False, True])
+def test_rows_get_and_columns(tmp_path, writer, pooled):
+    path = _write(tmp_path, writer, StringPool() if pooled else None)
+    with open_table(path, SKILL, MODEL_MAP) as table:
+        assert len(table) == len(ROWS)
+        row = table[0]
+        assert type(row).__name__ == "SkillConfigRow"
+        assert not hasattr(row, "__dict__")
+        assert (row.Id, row.Name, row["Tags"], row.Waves, row.Drop) == (50, "技能50", ["a", "t50"], [[50], []], "item2")
+        assert table[-1]._tuple() == tuple(ROWS[-1])
+
+        found = table.get(7)
+        assert found._asdict()["Name"] == "技能7" and found == table[43]
+        assert table.get("7") == found
+        assert table.get(999) is None and 999 not in table
+
+        assert list(table.column("Name")) == [r[1] for r in ROWS]
+        assert list(table.column("Power")) == [r[6] for r in ROWS]
+        assert [r._tuple() for r in table] == [tuple(r) for r in ROWS]
+
+
+@pytest.mark.parametrize("writer", [write_table, write_columns])
+def test_duplicate_keys_find_first_row(tmp_path, writer):
+    # 未校验导出可能有重复主键：两种格式都返回第一行
+    path = tmp_path / f"DT_ItemConfig.{'bin' if writer is write_table else 'col'}"
+    with open(path, "wb") as f:
+        writer(TableLayout(ITEM), [("b",), ("a",), ("b",), ("a",)], f)
+    with open_table(str(path), ITEM) as table:
+        assert table.find("a") == 1 and table.find("b") == 0
+
+
+def test_schema_mismatch_and_pool_view(tmp_path):
+    path = _write(tmp_path, write_table)
+    other = ModelDef("SkillConfig", SKILL.fields[:2])
+    with pytest.raises(ValueError, match="schema"):
+        open_table(path, other, MODEL_MAP)
+
+    pool = StringPool(["x", "", "字符串"])
+    with open(tmp_path / "pool.bin", "wb") as f:
+        write_pool(pool.strings, f)
+    with PooledStrings.open(str(tmp_path / "pool.bin")) as strings:
+        assert len(strings) == 3 and [strings[i] for i in range(3)] == pool.strings
+        with pytest.raises(IndexError):
+            strings[3]
+
+
+@pytest.mark.parametrize("data", ["bin", "columnar"])
+def test_open_exported_tables_from_schema_cache(tmp_path, data):
+    excel_dir = tmp_path / "excel"
+    excel_dir.mkdir()
+    make_skill_workbook(excel_dir / "Skill.xlsx")
+    out_dir = tmp_path / "out"
+    proc = subprocess.run(
+        [sys.executable, "-m", "tools.export", str(excel_dir), "--out", str(out_dir), "--data", data, "--string-pool"],
+        cwd=os.path.dirname(SRC_DIR), env=dict(os.environ, PYTHONPATH=SRC_DIR), capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    with open_tables(str(out_dir)) as tables:
+        skills = tables["SkillConfig"]
+        assert [row.Name for row in skills] == ["火球", "冰箭", "雷击"]
+        assert skills.get(3).Tags == ["c"]
+        assert list(skills.column("Type")) == [1, 2, 3]
@@ -0,0 +1,142 @@
+import os
+
+import pytest
+
+from backends.codegen import SchemaPlan
+from excel_fixture import make_workbook
+from exporters.binary_layout import field_layout
+from exporters.converters import TypeCompiler
+from pipeline.build_cache import file_digest
+from pipeline.schema_cache import SchemaCache, load_schema_index
+from schema.index import KeyCycleError, SchemaIndex, WorkbookSchema
+from schema.types import ArrayType, BasicType, CustomType, EnumType
+
+QUALITY = EnumType("Quality", {"Common": 0, "Rare": 1})
+
+
+def _item(code_type="string"):
+    return WorkbookSchema("Item.xlsx", enums={"Quality": QUALITY}, model_tables=[
+        ("ItemConfig", [["Code", code_type, "", True], ["Quality", "Quality", "", False]]),
+    ])
+
+
+SKILL = WorkbookSchema("Skill.xlsx", model_tables=[
+    ("SkillConfig", [["Id", "int", "", True], ["Drops", "ItemConfig[]", "", False],
+                     ["MinQuality", "Quality", "", False]]),
+])
+
+
+def test_cross_file_references_resolve():
+    index = SchemaIndex.build([_item(), SKILL])
+    assert index.errors == []
+    fields = {f.name: f.type for f in index.models["SkillConfig"].fields}
+    assert fields["Drops"] == ArrayType(CustomType("ItemConfig"))
+    assert fields["MinQuality"] is QUALITY
+
+    assert index.find("ItemConfig").file_path == "Item.xlsx"
+    assert index.find("Quality").kind == "Enum"
+    assert index.references_to("ItemConfig") == [("SkillConfig", "Drops")]
+    models, enums = index.workbook("Skill.xlsx")
+    assert [m.name for m in models] == ["SkillConfig"] and enums == {}
+
+
+def test_collisions_and_unknown_types_are_collected():
+    dup = WorkbookSchema("Dup.xlsx", enums={"ItemConfig": QUALITY}, model_tables=[
+        ("Quality", [["Id", "int", "", True]]),
+        ("Broken", [["Id", "int", "", True], ["Ref", "Missing", "", False], ["Id", "int", "", False]]),
+    ])
+    index = SchemaIndex.build([_item(), dup])
+    text = "\n".join(index.errors)
+    assert "重复 Enum 名: ItemConfig" in text and "Item.xlsx" in text
+    assert "重复 Model 名: Quality" in text
+    assert "[Dup.xlsx][Models][Broken.Ref] 未知类型: Missing" in text
+    assert "[Dup.xlsx][Models][Broken] 重复字段: Id" in text
+    assert index.find("Quality").file_path == "Item.xlsx"
+
+
+def test_cycles():
+    mutual = WorkbookSchema("Loop.xlsx", model_tables=[
+        ("A", [["Id", "int", "", True], ["B", "B", "", False]]),
+        ("B", [["Id", "int", "", True], ["A", "A[]", "", False]]),
+        ("KeyA", [["Id", "KeyB", "", True]]),
+        ("KeyB", [["Id", "KeyA", "", True]]),
+    ])
+    index = SchemaIndex.build([mutual])
+    assert ["A", "B"] in index.cycles and ["KeyA", "KeyB"] in index.cycles
+    assert len(index.errors) == 1 and "主键循环引用: KeyA -> KeyB -> KeyA" in index.errors[0]
+
+
+def test_dependency_key_tracks_external_key_types():
+    before = SchemaIndex.build([_item("string"), SKILL])
+    after = SchemaIndex.build([_item("int"), SKILL])
+    assert before.dependency_key("Skill.xlsx") != after.dependency_key("Skill.xlsx")
+    assert before.dependency_key("Item.xlsx") == after.dependency_key("Item.xlsx")
+
+
+def test_schema_cache_round_trip(tmp_path):
+    path = str(make_workbook(
+        tmp_path / "Item.xlsx",
+        enums={"Quality": [("Common", 0), ("Rare", 1)]},
+        models={"ItemConfig": [("Code", "string", "", True), ("Quality", "Quality", "", False)]},
+    ))
+    out = tmp_path / "out"
+
+    cache = SchemaCache(out).load()
+    index = cache.build_index([path])
+    cache.save()
+    assert cache.parsed == 1 and index.errors == []
+
+    cache = SchemaCache(out).load()
+    cache.build_index([path], file_digest)
+    assert cache.parsed == 0 and cache.reused == 1
+
+    loaded = load_schema_index(out)
+    assert loaded.find("ItemConfig").file_path == path
+    assert loaded.models["ItemConfig"].fields[1].type.resolver.lookup("rare") == 1
+
+
+def test_schema_cache_stamps_skip_hashing(tmp_path, monkeypatch):
+    path = str(make_workbook(tmp_path / "Item.xlsx", models={"ItemConfig": [("Id", "int", "", True)]}))
+    out = tmp_path / "out"
+    cache = SchemaCache(out).load()
+    cache.build_index([path])
+    cache.save()
+
+    hashed = []
+    monkeypatch.setattr("pipeline.schema_cache.file_digest", lambda p: hashed.append(p) or file_digest(p))
+    cache = SchemaCache(out).load()
+    cache.build_index([path])
+    assert hashed == [] and cache.reused == 1
+
+    os.utime(path, ns=(0, 0))
+    cache.build_index([path])
+    assert hashed == [path] and cache.parsed == 0
+    cache.build_index([])
+    assert cache.stamps == {} and cache.workbooks == {}
+
+
+def test_key_type_rules_are_shared():
+    # 转换、二进制布局、代码生成都经 resolve_key_type 解析按主键引用的类型
+    chain = WorkbookSchema("Chain.xlsx", enums={"Quality": QUALITY}, model_tables=[
+        ("ByName", [["Name", "string", "", True]]),
+        ("ByRef", [["Ref", "ByName", "", True]]),
+        ("ByQuality", [["Q", "Quality", "", True]]),
+        ("ByArray", [["Ids", "int[]", "", True]]),
+        ("NoKey", [["Id", "int", "", False]]),
+        ("KeyA", [["Id", "KeyB", "", True]]),
+        ("KeyB", [["Id", "KeyA", "", True]]),
+    ])
+    index = SchemaIndex.build([chain])
+    compiler = TypeCompiler(index.models)
+    plan = SchemaPlan(index.models)
+    expected = {"ByRef": BasicType("string"), "ByQuality": QUALITY, "ByArray": None, "NoKey": None, "Missing": None}
+    for name, key_type in expected.items():
+        assert index.key_type(name) == key_type == compiler.key_type(name)
+        assert plan.key_type(name) == (key_type or BasicType("int"))
+        stored = field_layout("F", CustomType(name), index.models).kind
+        assert stored == ("i" if key_type is None else field_layout("F", key_type).kind)
+
+    assert index.key_type("KeyA") is None and plan.key_type("KeyA") == BasicType("int")
+    assert field_layout("F", CustomType("KeyA"), index.models).kind == "i"
+    with pytest.raises(KeyCycleError, match="KeyA -> KeyB -> KeyA"):
+        compiler.key_type("KeyA")
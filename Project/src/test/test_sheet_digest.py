@@ -0,0 +1,85 @@
+import zipfile
+
+from pipeline.sheet_digest import changed_sheets, workbook_digest
+from pipeline.watcher import PollingWatcher, is_complete
+
+WORKBOOK = (
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+    '<sheet name="Models" sheetId="1" r:id="rId1"/><sheet name="A" sheetId="2" r:id="rId2"/>'
+    '<sheet name="B" sheetId="3" r:id="rId3"/></sheets></workbook>'
+)
+RELS = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Target="/xl/worksheets/sheet2.xml"/>'
+    '<Relationship Id="rId3" Target="worksheets/sheet3.xml"/></Relationships>'
+)
+
+
+def _sheet(*cells):
+    body = "".join(f'<c r="A{i}" t="s"><v>{v}</v></c>' if isinstance(v, int) else
+                   f'<c r="A{i}"><v>{v}</v></c>' for i, v in enumerate(cells, start=1))
+    return f'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData><row r="1">{body}</row></sheetData></worksheet>'
+
+
+def _strings(*values):
+    items = "".join(f"<si><t>{v}</t></si>" for v in values)
+    return f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">{items}</sst>'
+
+
+def _xlsx(path, sheets, strings, styles="<styleSheet/>"):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("xl/workbook.xml", WORKBOOK)
+        z.writestr("xl/_rels/workbook.xml.rels", RELS)
+        z.writestr("xl/styles.xml", styles)
+        z.writestr("xl/sharedStrings.xml", strings)
+        for i, sheet in enumerate(sheets, start=1):
+            z.writestr(f"xl/worksheets/sheet{i}.xml", sheet)
+    return str(path)
+
+
+def test_only_edited_sheets_change(tmp_path):
+    models = _sheet(0)
+    old = workbook_digest(_xlsx(tmp_path / "a.xlsx", [models, _sheet(1, "2.5"), _sheet(2)], _strings("Id", "x", "y")))
+    assert set(old.sheets) == {"Models", "A", "B"} and old.shared[1] == ["Id", "x", "y"]
+
+    path = _xlsx(tmp_path / "b.xlsx", [models, _sheet(1, "3.5"), _sheet(2)], _strings("Id", "x", "y"))
+    assert changed_sheets(path, old, workbook_digest(path)) == {"A"}
+
+    # 共享字符串表变化：只有引用了变化下标的 sheet 算变化
+    path = _xlsx(tmp_path / "c.xlsx", [models, _sheet(1, "2.5"), _sheet(2)], _strings("Id", "x", "z"))
+    assert changed_sheets(path, old, workbook_digest(path)) == {"B"}
+
+    # 样式等工作簿级部件变化：整个工作簿重新导出
+    path = _xlsx(tmp_path / "d.xlsx", [models, _sheet(1, "2.5"), _sheet(2)], _strings("Id", "x", "y"), "<styleSheet><x/></styleSheet>")
+    assert changed_sheets(path, old, workbook_digest(path)) is None
+    assert changed_sheets(path, None, workbook_digest(path)) is None
+
+
+def test_watcher_reports_complete_changes(tmp_path):
+    path = _xlsx(tmp_path / "a.xlsx", [_sheet(0), _sheet(1), _sheet(2)], _strings("a", "b", "c"))
+    watcher = PollingWatcher(lambda: sorted(str(p) for p in tmp_path.glob("*.xlsx")), interval=0.01, debounce=0.02)
+    assert watcher.poll() == set()
+
+    _xlsx(tmp_path / "a.xlsx", [_sheet(0), _sheet(1), _sheet(2, 0)], _strings("a", "b", "c"))
+    partial = tmp_path / "b.xlsx"
+    partial.write_bytes(b"PK\x03\x04 not finished")
+    assert not is_complete(str(partial))
+    partial.unlink()
+    assert watcher.wait() == {path}
+
+
+def test_watcher_does_not_hang_on_unreadable_files(tmp_path, capsys):
+    # .xls 不是 zip，不检查完整性；始终读不出来的 xlsx 超时后报告并返回
+    watcher = PollingWatcher(lambda: sorted(str(p) for p in tmp_path.glob("*.xls*")),
+                             interval=0.01, debounce=0.02, ready_timeout=0.1)
+    legacy = tmp_path / "old.xls"
+    legacy.write_bytes(b"\xd0\xcf\x11\xe0")
+    assert is_complete(str(legacy))
+    assert watcher.wait() == {str(legacy)}
+
+    broken = tmp_path / "broken.xlsx"
+    broken.write_bytes(b"PK\x03\x04 never finished")
+    assert watcher.wait() == {str(broken)}
+    assert "仍不完整" in capsys.readouterr().out
@@ -0,0 +1,29 @@
+import os
+
+from benchmarks.bench_startup import forbidden_imports, import_profile, noop_args
+
+
+def test_help_does_not_import_heavy_modules():
+    _, modules, _ = import_profile(["--help"])
+    assert "exporters.factory" in modules
+    assert forbidden_imports(modules) == []
+
+
+def test_cached_run_only_imports_selected_exporter(tmp_path):
+    _, modules, _ = import_profile(noop_args(str(tmp_path)))
+    assert forbidden_imports(modules) == []
+    assert "exporters.json_exporter" in modules and "backends.csharp.exporter" in modules
+
+
+def test_schema_only_run_skips_openpyxl(tmp_path):
+    args = noop_args(str(tmp_path))
+    excel_dir = args[0]
+    for name in os.listdir(excel_dir):
+        os.utime(os.path.join(excel_dir, name))   # 只改 mtime：重新计算哈希，内容未变仍复用 schema
+    models_dir = os.path.join(args[2], "Models")
+    mtimes = {name: os.stat(os.path.join(models_dir, name)).st_mtime_ns for name in os.listdir(models_dir)}
+    _, modules, _ = import_profile(args + ["--schema-only"])
+    assert forbidden_imports(modules) == []
+    assert "exporters.json_exporter" not in modules and "validation" not in modules
+    # 生成的代码未变：不重写文件
+    assert {name: os.stat(os.path.join(models_dir, name)).st_mtime_ns for name in os.listdir(models_dir)} == mtimes
@@ -0,0 +1,76 @@
+import io
+import json
+
+from excel_fixture import make_skill_workbook
+from exporters.binary_exporter import BinaryExporter
+from exporters.json_exporter import JSONExporter, write_json_array
+from schema import workbook
+from schema.parser import parse_enums_sheet, parse_models_sheet, scan_tables
+from schema.workbook import WorkbookSession
+
+
+class PublicSheet:
+    """只暴露公开 API 的 worksheet，模拟没有 _cells 的 openpyxl 版本"""
+
+    def __init__(self, ws):
+        self.tables = ws.tables
+        self.iter_rows = ws.iter_rows
+
+
+def test_write_json_array_matches_json_dump():
+    samples = [
+        [],
+        [{}],
+        [{"Id": 1, "Tags": [], "Name": "多行\n文本"}],
+        [{"Id": 1, "Tags": ["a", "b"]}, {"Id": 2, "Vec": [[1, 2], []]}],
+    ]
+    for rows in samples:
+        expected = io.StringIO()
+        json.dump(rows, expected, ensure_ascii=False, indent=4)
+        actual = io.StringIO()
+        write_json_array(iter(rows), actual)
+        assert actual.getvalue() == expected.getvalue()
+
+
+def test_read_only_session_parses_same_schema(tmp_path):
+    path = make_skill_workbook(tmp_path / "Skill.xlsx")
+
+    enums = parse_enums_sheet(path)
+    models = parse_models_sheet(path, enums)
+    with WorkbookSession(path, read_only=True) as session:
+        assert parse_enums_sheet(session) == enums
+        assert parse_models_sheet(session, enums) == models
+
+
+def test_missing_private_attributes_fall_back_to_public_api(tmp_path, monkeypatch):
+    # openpyxl 私有属性不存在时退回 iter_rows / 普通模式，解析结果不变
+    path = make_skill_workbook(tmp_path / "Skill.xlsx")
+    enums = parse_enums_sheet(path)
+    models = parse_models_sheet(path, enums)
+
+    with WorkbookSession(path) as session:
+        ws = session.get_sheet("Models")
+        assert scan_tables(PublicSheet(ws)) == scan_tables(ws)
+
+    monkeypatch.setattr(workbook, "has_table_archive", lambda ws: False)
+    with WorkbookSession(path, read_only=True) as session:
+        assert not session.read_only
+        assert parse_enums_sheet(session) == enums
+        assert parse_models_sheet(session, enums) == models
+
+
+def test_export_stream_matches_eager_output(tmp_path):
+    path = make_skill_workbook(tmp_path / "Skill.xlsx")
+    enums = parse_enums_sheet(path)
+    models = parse_models_sheet(path, enums)
+
+    for exporter in (JSONExporter(), BinaryExporter()):
+        eager_dir = tmp_path / f"eager_{exporter.file_ext}"
+        stream_dir = tmp_path / f"stream_{exporter.file_ext}"
+
+        exporter.write_file(exporter.export_data(path, models, enums), eager_dir)
+        with WorkbookSession(path, read_only=True) as session:
+            exporter.export_stream(session, models, enums, stream_dir)
+
+        for f in eager_dir.iterdir():
+            assert (stream_dir / f.name).read_bytes() == f.read_bytes()
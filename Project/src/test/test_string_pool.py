@@ -0,0 +1,106 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from excel_fixture import make_workbook
+from exporters.binary_exporter import BinaryExporter
+from exporters.columnar_exporter import ColumnarExporter
+from exporters.factory import get_data_exporter
+from exporters.string_pool import StringPool, is_identity, load_pool, read_pool, write_pool
+from reader import open_tables
+from schema.field import FieldDef
+from schema.model import ModelDef
+from schema.types import ArrayType, BasicType
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXT = ModelDef("Text", [
+    FieldDef("Key", BasicType("string"), is_primary=True),
+    FieldDef("Icon", BasicType("string")),
+    FieldDef("Tags", ArrayType(BasicType("string"))),
+])
+
+
+def test_pool_round_trip():
+    pool = StringPool(["a"])
+    assert [pool.index(s) for s in ("b", "a", None, 3, "b")] == [1, 0, 2, 3, 1]
+    f = io.BytesIO()
+    write_pool(pool.strings, f)
+    assert read_pool(f.getvalue()) == ["a", "b", "", "3"]
+
+    other = StringPool(["a"])
+    other.index("c")
+    assert pool.merge(other.strings[1:], base=1) == [0, 4]
+    assert is_identity([0, 1]) and not is_identity([0, 4])
+
+
+def _export(exporter_cls, pool, rows, out_dir):
+    exporter = exporter_cls(pool)
+    exporter.models = {"Text": TEXT}
+    records = [tuple(row[f.name] for f in TEXT.fields) for row in rows]
+    return exporter, exporter.write_tables([("Text", records)], out_dir)
+
+
+def _resolved(exporter, out_dir, mapping, strings):
+    layout = exporter.layout_for("Text", string_pool=StringPool())
+    with open(os.path.join(out_dir, mapping["Text"]), "rb") as f:
+        rows = exporter.read_rows(f.read(), layout)
+    return [
+        {"Key": key, "Icon": strings[icon], "Tags": [strings[i] for i in tags]}
+        for key, icon, tags in rows
+    ]
+
+
+@pytest.mark.parametrize("exporter_cls", [BinaryExporter, ColumnarExporter])
+def test_remap_local_indices(tmp_path, exporter_cls):
+    seed = ["icon/a.png"]
+    rows = [
+        {"Key": "k1", "Icon": "icon/b.png", "Tags": ["fire", "icon/a.png"]},
+        {"Key": "k2", "Icon": "icon/a.png", "Tags": []},
+    ]
+    # 另一个工作簿先并入了不同的新字符串，本地下标与全局不一致
+    merged = StringPool(seed)
+    merged.index("other")
+
+    local = StringPool(seed)
+    exporter, mapping = _export(exporter_cls, local, rows, tmp_path)
+    remap = merged.merge(local.strings[len(seed):], len(seed))
+    assert not is_identity(remap)
+    exporter.remap_strings(tmp_path, mapping, [TEXT], remap)
+
+    assert _resolved(exporter, tmp_path, mapping, merged.strings) == rows
+    path = tmp_path / "pool.bin"
+    with open(path, "wb") as f:
+        write_pool(merged.strings, f)
+    assert load_pool(path) == merged.strings
+
+
+def test_json_rejects_string_pool():
+    with pytest.raises(ValueError):
+        get_data_exporter("json", StringPool())
+
+
+@pytest.mark.parametrize("data", ["bin", "columnar"])
+def test_remap_resolves_references_across_workbooks(tmp_path, data):
+    # B_Drop 的新字符串排在 A_Item 之后，下标需要重写；Drop.Item 引用另一个工作簿中以 string 为主键的 Item
+    excel_dir = tmp_path / "excel"
+    excel_dir.mkdir()
+    make_workbook(excel_dir / "A_Item.xlsx", models={
+        "Item": [("Id", "string", "", True), ("Name", "string", "", False)],
+    }, data={"Item": [("sword", "剑"), ("shield", "盾")]})
+    make_workbook(excel_dir / "B_Drop.xlsx", models={
+        "Drop": [("Id", "int", "", True), ("Item", "Item", "", False), ("Note", "string", "", False)],
+    }, data={"Drop": [(1, "shield", "稀有"), (2, "sword", "普通")]})
+    out_dir = tmp_path / "out"
+    proc = subprocess.run(
+        [sys.executable, "-m", "tools.export", str(excel_dir), "--out", str(out_dir), "--data", data, "--string-pool"],
+        cwd=os.path.dirname(SRC_DIR), env=dict(os.environ, PYTHONPATH=SRC_DIR), capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    with open_tables(str(out_dir)) as tables:
+        assert [(row.Item, row.Note) for row in tables["Drop"]] == [("shield", "稀有"), ("sword", "普通")]
+        assert [row.Name for row in tables["Item"]] == ["剑", "盾"]
@@ -0,0 +1,164 @@
+import json
+
+import pytest
+
+from excel_fixture import make_workbook
+from exporters.binary_exporter import BinaryExporter
+from exporters.columnar_exporter import ColumnarExporter
+from exporters.json_exporter import JSONExporter
+from schema.index import build_schema_index
+from validation import RowValidator, check_references, write_report
+
+ITEM_MODELS = {
+    "ItemConfig": [
+        ("Code", "string", "", True),
+        ("Price", "int", "", False),
+        ("Weight", "float", "", False),
+        ("Stackable", "bool", "", False),
+    ],
+}
+
+SHOP_MODELS = {
+    "ShopConfig": [
+        ("Id", "int", "", True),
+        ("Item", "ItemConfig", "", False),
+        ("Gift", "ItemConfig", "", False),
+    ],
+}
+
+
+def _validate(tmp_path, item_rows, shop_rows, exporter=None):
+    item = make_workbook(tmp_path / "Item.xlsx", models=ITEM_MODELS, data={"ItemConfig": item_rows})
+    shop = make_workbook(tmp_path / "Shop.xlsx", models=SHOP_MODELS, data={"ShopConfig": shop_rows})
+    index = build_schema_index([item, shop])
+    assert index.errors == []
+    workbooks = []
+    for path in (str(item), str(shop)):
+        models, enums = index.workbook(path)
+        data_exporter = exporter or JSONExporter()
+        data_exporter.validator = RowValidator(path, index.models)
+        data = data_exporter.export_data(path, models, enums)
+        workbooks.append(data_exporter.validator.facts)
+    violations = [v for wb in workbooks for v in wb.violations]
+    return data, violations + check_references(workbooks, index.models)
+
+
+def test_clean_data_passes(tmp_path):
+    data, violations = _validate(
+        tmp_path,
+        [("sword", 10, 1.5, True), ("shield", 20, 3, "yes")],
+        [(1, "sword", " shield"), (2, None, None)],
+    )
+    assert violations == []
+    # 校验旁路收集，不改变导出的行
+    assert data["ShopConfig"][0] == {"Id": 1, "Item": "sword", "Gift": " shield"}
+
+
+def test_keys_types_and_references_report_cells(tmp_path):
+    _, violations = _validate(
+        tmp_path,
+        [("sword", 10, 1.5, True), ("sword", "ten", "heavy", "maybe"), (None, 1.5, 1, 0)],
+        [(1, "axe", "bow"), (1, "sword", None)],
+    )
+    found = {(v.kind, v.cell) for v in violations}
+    assert found == {
+        ("duplicate_key", "ItemConfig!A3"),
+        ("empty_key", "ItemConfig!A4"),
+        ("type", "ItemConfig!B3"),
+        ("type", "ItemConfig!C3"),
+        ("type", "ItemConfig!D3"),
+        ("type", "ItemConfig!B4"),
+        ("duplicate_key", "ShopConfig!A3"),
+        ("missing_reference", "ShopConfig!B2"),
+        ("missing_reference", "ShopConfig!C2"),
+    }
+    missing = [v for v in violations if v.kind == "missing_reference"]
+    assert {v.value for v in missing} == {"axe", "bow"}
+    assert all(v.file_path.endswith("Shop.xlsx") for v in missing)
+    duplicate = next(v for v in violations if v.cell == "ItemConfig!A3")
+    assert "ItemConfig!A2" in duplicate.message
+
+
+def test_binary_exporter_forwards_validator(tmp_path):
+    _, violations = _validate(
+        tmp_path,
+        [("sword", 10, 1.5, True)],
+        [(1, "bow", None)],
+        exporter=BinaryExporter(),
+    )
+    assert [(v.kind, v.cell, v.value) for v in violations] == [("missing_reference", "ShopConfig!B2", "bow")]
+
+
+def test_integer_keys_match_float_references(tmp_path):
+    level = make_workbook(tmp_path / "Level.xlsx", models={
+        "LevelConfig": [("Id", "int", "", True)],
+        "StageConfig": [("Id", "int", "", True), ("Level", "LevelConfig", "", False)],
+    }, data={"LevelConfig": [(1,), (2,)], "StageConfig": [(1, 2.0), (2, "1"), (3, 4)]})
+    index = build_schema_index([level])
+    models, enums = index.workbook(str(level))
+    exporter = JSONExporter()
+    exporter.validator = RowValidator(str(level), index.models)
+    exporter.export_data(str(level), models, enums)
+    violations = check_references([exporter.validator.facts], index.models)
+    assert [(v.cell, v.value) for v in violations] == [("StageConfig!B4", 4)]
+
+
+def test_report(tmp_path):
+    _, violations = _validate(tmp_path, [("sword", 10, 1.5, True)], [(1, "bow", None)])
+    report = write_report(violations, tmp_path / "out" / "validation_report.json")
+    assert report["ok"] is False and report["summary"] == {"missing_reference": 1}
+    saved = json.loads((tmp_path / "out" / "validation_report.json").read_text(encoding="utf-8"))
+    assert saved["violations"][0]["cell"] == "ShopConfig!B2"
+
+
+def test_nested_references_are_converted_and_checked(tmp_path):
+    path = make_workbook(tmp_path / "Loot.xlsx", models={
+        "ItemConfig": [("Code", "string", "", True)],
+        "LootConfig": [("Id", "int", "", True), ("Drops", "ItemConfig[][]", "", False),
+                       ("Weights", "int[][]", "", False)],
+    }, data={
+        "ItemConfig": [("sword",), ("shield",)],
+        "LootConfig": [(1, "[[sword], [ shield, sword]]", "[[1], [2, 3]]"), (2, "[[bow]]", None)],
+    })
+    index = build_schema_index([path])
+    models, enums = index.workbook(str(path))
+    exporter = JSONExporter(model_map=index.models)
+    exporter.validator = RowValidator(str(path), index.models)
+    data = exporter.export_data(str(path), models, enums)
+    assert data["LootConfig"][0] == {"Id": 1, "Drops": [["sword"], ["shield", "sword"]], "Weights": [[1], [2, 3]]}
+    assert data["LootConfig"][1] == {"Id": 2, "Drops": [["bow"]], "Weights": []}
+    violations = check_references([exporter.validator.facts], index.models)
+    assert [(v.cell, v.value) for v in violations] == [("LootConfig!B3", "bow")]
+
+
+@pytest.mark.parametrize("exporter_cls", [BinaryExporter, ColumnarExporter])
+def test_binary_packing_reports_bad_cells(tmp_path, exporter_cls):
+    # 非法值按默认值写出，不在打包时中断；错误与 JSON 导出一样带坐标记录
+    path = make_workbook(tmp_path / "Item.xlsx", models=ITEM_MODELS, data={
+        "ItemConfig": [("sword", "ten", "heavy", "maybe"), ("shield", 2 ** 40, 2.5, "yes")],
+    })
+    index = build_schema_index([path])
+    models, enums = index.workbook(str(path))
+    exporter = exporter_cls(model_map=index.models)
+    exporter.validator = RowValidator(str(path), index.models)
+    mapping = exporter.export_stream(str(path), models, enums, str(tmp_path / "out"))
+
+    found = {(v.kind, v.cell) for v in exporter.validator.facts.violations}
+    assert found == {("type", "ItemConfig!B2"), ("type", "ItemConfig!C2"), ("type", "ItemConfig!D2"),
+                     ("type", "ItemConfig!B3")}
+    with open(tmp_path / "out" / mapping["ItemConfig"], "rb") as f:
+        rows = exporter.read_rows(f.read(), exporter.layout_for("ItemConfig"))
+    assert [tuple(row) for row in rows] == [("sword", 0, 0.0, False), ("shield", 0, 2.5, True)]
+
+
+@pytest.mark.parametrize("exporter_cls", [BinaryExporter, ColumnarExporter])
+def test_binary_packing_without_validator_raises(tmp_path, exporter_cls):
+    # 未挂校验器（--no-validate）时不静默写默认值，报出单元格
+    path = make_workbook(tmp_path / "Item.xlsx", models=ITEM_MODELS, data={
+        "ItemConfig": [("sword", 10, 1.5, "yes"), ("shield", 2, "heavy", "no")],
+    })
+    index = build_schema_index([path])
+    models, enums = index.workbook(str(path))
+    exporter = exporter_cls(model_map=index.models)
+    with pytest.raises(ValueError, match=r"\[ItemConfig!C3\] 字段 Weight 的值 'heavy' 无法写出"):
+        exporter.export_stream(str(path), models, enums, str(tmp_path / "out"))
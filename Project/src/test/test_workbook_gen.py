@@ -0,0 +1,51 @@
+from benchmarks.bench_suite import compare, find_baseline
+from benchmarks.workbook_gen import WorkbookSpec, make_spec_workbook, spec_fields
+from exporters.json_exporter import JSONExporter
+from schema.parser import parse_enums_sheet, parse_models_sheet
+from schema.types import ArrayType
+from schema.workbook import WorkbookSession
+
+SPEC = WorkbookSpec(enum_count=3, enum_members=4, model_count=2, field_count=9, row_count=20,
+                    array_ratio=0.3, string_cardinality=3)
+
+
+def test_generated_workbook_matches_spec(tmp_path):
+    path, rows = make_spec_workbook(str(tmp_path / "gen.xlsx"), SPEC)
+    assert rows == 40
+    with WorkbookSession(path, read_only=True) as session:
+        enums = parse_enums_sheet(session)
+        models = parse_models_sheet(session, enums)
+    assert sorted(enums) == ["Enum0", "Enum1", "Enum2"]
+    assert [m.name for m in models] == ["Model0", "Model1"]
+    fields = models[0].fields
+    assert len(fields) == 9 and fields[0].is_primary
+    assert sum(isinstance(f.type, ArrayType) for f in fields) == sum(t.endswith("[]") for _, t in spec_fields(SPEC)) > 0
+
+    # 严格模式下全部枚举值可识别，字符串取值个数受 string_cardinality 限制
+    data = JSONExporter().export_data(path, models, enums)
+    assert [len(data[m.name]) for m in models] == [20, 20]
+    name = next(name for name, field_type in spec_fields(SPEC) if field_type == "string")
+    strings = {row[name] for row in data["Model0"]}
+    assert len(strings) <= 3
+
+
+def test_generation_is_deterministic(tmp_path):
+    a, _ = make_spec_workbook(str(tmp_path / "a.xlsx"), SPEC)
+    b, _ = make_spec_workbook(str(tmp_path / "b.xlsx"), SPEC)
+    with WorkbookSession(a, read_only=True) as sa, WorkbookSession(b, read_only=True) as sb:
+        rows_a = list(sa.get_sheet("Model1").iter_rows(values_only=True))
+        rows_b = list(sb.get_sheet("Model1").iter_rows(values_only=True))
+    assert rows_a == rows_b
+
+
+def test_history_baseline_and_regressions():
+    spec = {"row_count": 1}
+    runs = [
+        {"label": "v1", "revision": "abc123", "time": "t1", "scales": {"small": {"spec": spec, "seconds": {"json": 1.0}}}},
+        {"label": None, "revision": "def456", "time": "t2", "scales": {"small": {"spec": spec, "seconds": {"json": 2.0}}}},
+    ]
+    assert find_baseline(runs, None) is runs[1]
+    assert find_baseline(runs, "v1") is runs[0] and find_baseline(runs, "abc") is runs[0]
+    current = {"scales": {"small": {"spec": spec, "seconds": {"json": 1.5}}}}
+    assert compare(current, runs[1], 0.1) == []
+    assert [r[:2] for r in compare(current, runs[0], 0.1)] == [("small", "json")]
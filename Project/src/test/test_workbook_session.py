@@ -0,0 +1,46 @@
+import openpyxl
+
+import schema.workbook
+from excel_fixture import make_skill_workbook
+from exporters.json_exporter import JSONExporter
+from schema.parser import parse_enums_sheet, parse_models_sheet
+from schema.workbook import WorkbookSession
+
+
+def test_session_loads_workbook_once(tmp_path, monkeypatch):
+    path = make_skill_workbook(tmp_path / "Skill.xlsx")
+
+    calls = []
+    real_load = openpyxl.load_workbook
+
+    def counting_load(*args, **kwargs):
+        calls.append(args)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(schema.workbook.openpyxl, "load_workbook", counting_load)
+
+    with WorkbookSession(path) as session:
+        enums = parse_enums_sheet(session)
+        models = parse_models_sheet(session, enums)
+        data = JSONExporter().export_data(session, models, enums)
+
+    assert len(calls) == 1
+    assert set(enums) == {"SkillType"}
+    assert [m.name for m in models] == ["SkillConfig"]
+    assert len(data["SkillConfig"]) == 3
+
+
+def test_path_based_calls_still_work(tmp_path):
+    path = make_skill_workbook(tmp_path / "Skill.xlsx")
+
+    enums = parse_enums_sheet(str(path))
+    models = parse_models_sheet(str(path), enums)
+    data = JSONExporter().export_data(str(path), models, enums)
+
+    with WorkbookSession(path) as session:
+        assert parse_enums_sheet(session) == enums
+        assert JSONExporter().export_data(session, models, enums) == data
+
+    assert data["SkillConfig"][0] == {
+        "Id": 1, "Name": "火球", "Damage": 10.5, "Type": 1, "Tags": ["a", "b"],
+    }
@@ -0,0 +1,2 @@
+from .report import REPORT_FILE, Violation, print_violations, write_report
+from .rows import RowValidator, TableFacts, WorkbookFacts, check_references, merge_facts
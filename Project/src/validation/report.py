@@ -0,0 +1,52 @@
+# validation/report.py
+# 校验结果：控制台输出 + JSON 报告
+import json
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+from pipeline.output_writer import atomic_open
+
+REPORT_FILE = "validation_report.json"
+REPORT_FORMAT = 1
+
+
+@dataclass
+class Violation:
+    kind: str           # type / empty_key / duplicate_key / missing_reference
+    file_path: str
+    cell: str           # Sheet!A1
+    model: str
+    field: str
+    value: object
+    message: str
+
+    def __str__(self):
+        return f"[{self.file_path}][{self.cell}] {self.model}.{self.field}: {self.message}"
+
+
+def _json_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def print_violations(violations):
+    for violation in violations:
+        print("数据校验错误:", violation)
+
+
+def write_report(violations, path):
+    """写出 JSON 报告（没有错误时同样写出，便于 CI 读取）"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    report = {
+        "format": REPORT_FORMAT,
+        "ok": not violations,
+        "summary": dict(Counter(v.kind for v in violations)),
+        "violations": [
+            dict(asdict(v), value=_json_value(v.value)) for v in violations
+        ],
+    }
+    with atomic_open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    return report
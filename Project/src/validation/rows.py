@@ -0,0 +1,343 @@
+# validation/rows.py
+# 数据行校验：导出时旁路收集需要检查的列，每张表读完后按列做集合运算
+#   主键：哈希索引，检查重复与空值
+#   类型：int / float / bool 列中的非法值
+#   引用：CustomType 字段的值必须是被引用 Model 的主键（跨表、跨工作簿，由 check_references 统一检查）
+from collections import Counter
+from dataclasses import dataclass, field
+from operator import itemgetter
+
+from exporters.converters import TRUE_STRINGS
+from schema.types import ArrayType, BasicType, CustomType
+from .report import Violation
+
+FALSE_STRINGS = frozenset(("0", "false", "no", ""))
+
+
+# int 列按 int32 导出（bin / columnar），超出范围的值同样是非法值
+INT_MIN, INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def _is_int(value):
+    if value.__class__ is int:
+        return INT_MIN <= value <= INT_MAX
+    if isinstance(value, float):
+        return value.is_integer() and INT_MIN <= value <= INT_MAX
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_float(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_bool(value):
+    if isinstance(value, (bool, int)):
+        return value in (0, 1)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        return text in TRUE_STRINGS or text in FALSE_STRINGS
+    return False
+
+
+def _ints_in_range(values):
+    ints = [v for v in values if v is not None]
+    return not ints or (INT_MIN <= min(ints) and max(ints) <= INT_MAX)
+
+
+TYPE_CHECKS = {
+    "int": _is_int,
+    "float": _is_float,
+    "bool": _is_bool,
+}
+
+# 整列的值类型都在此集合内时无需逐个检查（绝大多数列走这条路径）
+VALID_TYPES = {
+    "int": frozenset((int, type(None))),
+    "float": frozenset((int, float, type(None))),
+    "bool": frozenset((bool, type(None))),
+}
+
+
+def _is_int_key(key_type):
+    return isinstance(key_type, BasicType) and key_type.name == "int"
+
+
+def key_normalizer(key_type):
+    """主键值的比较形式：整数主键按整数比较，其余按去空白的字符串比较"""
+    if _is_int_key(key_type):
+        def norm(value):
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return value
+            return int(number) if number.is_integer() else number
+        return norm
+
+    def norm(value):
+        return value.strip() if isinstance(value, str) else str(value)
+    return norm
+
+
+def _primary_field(model):
+    for f in model.fields:
+        if f.is_primary:
+            return f
+    return None
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _column_letter(index):
+    """1 起的列号 -> 列字母；openpyxl 导入较慢，用到时才导入"""
+    from openpyxl.utils import get_column_letter
+    return get_column_letter(index)
+
+
+@dataclass
+class ReferenceColumn:
+    """CustomType 字段收集到的引用值（已展开数组，跳过空值）"""
+    model: str
+    field: str
+    target: str
+    sheet: str = ""
+    column: str = ""    # 列字母
+    values: list = field(default_factory=list)
+    rows: list = field(default_factory=list)   # 与 values 对应的 Excel 行号
+
+    def cell(self, i):
+        return f"{self.sheet}!{self.column}{self.rows[i]}"
+
+
+@dataclass
+class TableFacts:
+    """一张表校验所需的全部信息，可缓存、可在进程间传递"""
+    model: str
+    sheet: str
+    file_path: str
+    keys: frozenset = frozenset()   # 规范化后的主键值；None 表示该 Model 没有主键
+    refs: list = field(default_factory=list)
+
+
+@dataclass
+class WorkbookFacts:
+    file_path: str
+    tables: list = field(default_factory=list)
+    violations: list = field(default_factory=list)
+
+
+class RowValidator:
+    """
+    单个工作簿的行校验器
+    导出器把每张表的行流交给 observe，行原样透传，校验所需的列在旁边收集
+    """
+
+    def __init__(self, file_path, model_map):
+        self.file_path = file_path
+        self.model_map = model_map
+        self.facts = WorkbookFacts(file_path)
+
+    def observe(self, model, sheet, rows, row_numbers):
+        """
+        rows: 行 tuple 的迭代器；row_numbers: 与 rows 同步追加的 Excel 行号列表
+        透传全部行，迭代结束后检查本表
+        """
+        watched = [(i, f.name) for i, f in enumerate(model.fields) if self._watch(f)]
+        names = [name for _, name in watched]
+        if not names:
+            yield from rows
+            self.facts.tables.append(TableFacts(model.name, sheet, self.file_path, self._keys(model, [], [])))
+            return
+
+        indices = [i for i, _ in watched]
+        getter = itemgetter(*indices)
+        records = []
+        append = records.append
+        for row in rows:
+            try:
+                append(getter(row))
+            except IndexError:
+                # 行比字段短：缺少的列视为 None（与 itemgetter 一样，单列时记录标量）
+                values = tuple(row[i] if i < len(row) else None for i in indices)
+                append(values if len(values) > 1 else values[0])
+            yield row
+
+        if len(names) == 1:
+            columns = {names[0]: records}
+        else:
+            columns = dict(zip(names, map(list, zip(*records)))) if records else {n: [] for n in names}
+        self._check_table(model, sheet, columns, row_numbers)
+
+    def _watch(self, f):
+        field_type = f.type
+        while isinstance(field_type, ArrayType):
+            field_type = field_type.element_type
+        if isinstance(field_type, CustomType) or f.is_primary:
+            return True
+        return isinstance(f.type, BasicType) and f.type.name in TYPE_CHECKS
+
+    def _cell(self, sheet, col, row):
+        return f"{sheet}!{_column_letter(col + 1)}{row}"
+
+    def _violation(self, kind, model, sheet, col, row, field_name, value, message):
+        self.facts.violations.append(Violation(
+            kind=kind,
+            file_path=self.file_path,
+            cell=self._cell(sheet, col, row),
+            model=model.name,
+            field=field_name,
+            value=value,
+            message=message,
+        ))
+
+    def _check_table(self, model, sheet, columns, row_numbers):
+        col_of = {f.name: i for i, f in enumerate(model.fields)}
+
+        # 类型：整列一次过滤，只为出错的值回查坐标
+        for f in model.fields:
+            check = TYPE_CHECKS.get(f.type.name) if isinstance(f.type, BasicType) else None
+            if check is None or f.name not in columns:
+                continue
+            values = columns[f.name]
+            if set(map(type, values)) <= VALID_TYPES[f.type.name] and (
+                    f.type.name != "int" or _ints_in_range(values)):
+                continue
+            for i, value in enumerate(values):
+                if value is not None and not check(value):
+                    self._violation("type", model, sheet, col_of[f.name], row_numbers[i], f.name, value,
+                                    f"{f.type.name} 列中的非法值 {value!r}")
+
+        keys = self._keys(model, columns, row_numbers, sheet, col_of)
+
+        refs = []
+        for f in model.fields:
+            field_type = f.type
+            is_array = isinstance(field_type, ArrayType)
+            while isinstance(field_type, ArrayType):
+                field_type = field_type.element_type
+            if not isinstance(field_type, CustomType):
+                continue
+            ref = ReferenceColumn(model.name, f.name, field_type.name, sheet, _column_letter(col_of[f.name] + 1))
+            values = columns[f.name]
+            if is_array:
+                for i, value in enumerate(values):
+                    for item in _flatten(value):
+                        if not _is_empty(item):
+                            ref.values.append(item)
+                            ref.rows.append(row_numbers[i])
+            else:
+                # 空引用合法，只保留有值的单元格
+                kept = [(v, n) for v, n in zip(values, row_numbers) if not _is_empty(v)]
+                ref.values = [v for v, _ in kept]
+                ref.rows = [n for _, n in kept]
+            refs.append(ref)
+
+        self.facts.tables.append(TableFacts(model.name, sheet, self.file_path, keys, refs))
+
+    def _keys(self, model, columns, row_numbers, sheet=None, col_of=None):
+        key_field = _primary_field(model)
+        if key_field is None:
+            return None
+        values = columns.get(key_field.name, []) if columns else []
+        normalized = _normalize_keys(key_field.type, values)
+
+        # 哈希计数找出重复，只对重复值回查行号
+        counts = Counter(normalized)
+        duplicated = {k for k, n in counts.items() if n > 1 and k is not None}
+        first = {}
+        for i, key in enumerate(normalized):
+            if key is None:
+                self._violation("empty_key", model, sheet, col_of[key_field.name], row_numbers[i],
+                                key_field.name, values[i], "主键为空")
+            elif key in duplicated:
+                if key in first:
+                    self._violation("duplicate_key", model, sheet, col_of[key_field.name], row_numbers[i],
+                                    key_field.name, values[i],
+                                    f"主键重复 {values[i]!r}（首次出现在 {self._cell(sheet, col_of[key_field.name], first[key])}）")
+                else:
+                    first[key] = row_numbers[i]
+        counts.pop(None, None)
+        return frozenset(counts)
+
+
+def merge_facts(base, update, models):
+    """部分重新导出时，用 update 中 models 这些表的校验信息替换 base 中的对应部分"""
+    models = set(models)
+    merged = WorkbookFacts(update.file_path)
+    merged.tables = [t for t in base.tables if t.model not in models] + update.tables
+    merged.violations = [v for v in base.violations if v.model not in models] + update.violations
+    return merged
+
+
+def _normalize_keys(key_type, values):
+    """整列规范化主键值，空值为 None；整列已是 int / str 时不逐个调用"""
+    kinds = set(map(type, values))
+    if _is_int_key(key_type):
+        if kinds <= {int}:
+            return values
+    elif kinds <= {str} and not any(v != v.strip() or not v for v in values):
+        return values
+    norm = key_normalizer(key_type)
+    return [None if _is_empty(v) else norm(v) for v in values]
+
+
+def _flatten(value):
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return [e.strip() for e in value.split(",")]
+    if isinstance(value, (list, tuple)):
+        if not any(isinstance(item, (list, tuple)) for item in value):
+            return value
+        # 嵌套数组（如 ItemConfig[][]）逐层展开
+        return list(_leaves(value))
+    return (value,)
+
+
+def _leaves(items):
+    for item in items:
+        if isinstance(item, (list, tuple)):
+            yield from _leaves(item)
+        else:
+            yield item
+
+
+def check_references(workbooks, model_map):
+    """
+    跨表引用检查：workbooks 为所有工作簿的 WorkbookFacts
+    每个引用列与被引用表的主键集合做一次集合差，只对缺失的值逐个报告
+    """
+    keys = {}
+    for wb in workbooks:
+        for table in wb.tables:
+            if table.keys is not None:
+                keys[table.model] = table.keys
+
+    violations = []
+    for wb in workbooks:
+        for table in wb.tables:
+            for ref in table.refs:
+                target_keys = keys.get(ref.target)
+                target = model_map.get(ref.target)
+                key_field = _primary_field(target) if target is not None else None
+                if target_keys is None or key_field is None:
+                    # 被引用的表没有数据或没有主键，无法检查
+                    continue
+                normalized = _normalize_keys(key_field.type, ref.values)
+                missing = set(normalized) - target_keys
+                if not missing:
+                    continue
+                for i, key in enumerate(normalized):
+                    if key in missing:
+                        value = ref.values[i]
+                        violations.append(Violation(
+                            kind="missing_reference",
+                            file_path=wb.file_path,
+                            cell=ref.cell(i),
+                            model=ref.model,
+                            field=ref.field,
+                            value=value,
+                            message=f"引用的 {ref.target} 主键 {value!r} 不存在",
+                        ))
+    return violations
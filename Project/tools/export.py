@@ -1,78 +1,616 @@
 # export.py
 
+import io
 import os
+import shutil
 import argparse
-from schema.parser import parse_models_sheet, parse_enums_sheet, validate_schema
+import time
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import dataclass, field, replace
+# 启动速度：openpyxl、各导出器 / 后端、进程池、cProfile 都在用到时才导入，
+# --help 与全部命中缓存的导出不加载它们（预算见 benchmarks/bench_startup.py）
 from backends.factory import get_backend
 from exporters.factory import get_data_exporter
+from exporters.json_writers import JSON_STYLES
+from pipeline.build_cache import BuildCache, CacheEntry
+from pipeline.output_writer import OutputWriter, atomic_open, remove_orphans
+from profiling import NULL_PROFILER, Profiler, active, stage, use
+
+STAGING_DIR = ".staging"
+SCHEMA_SHEETS = {"Enums", "Models"}
 
 def find_excel_files(root_dir):
-    """递归查找目录下所有 .xlsx / .xls 文件"""
+    """递归查找目录下所有 .xlsx / .xls 文件（按路径排序，保证合并顺序确定）"""
     excel_files = []
     for dirpath, _, filenames in os.walk(root_dir):
         for f in filenames:
             if f.lower().endswith((".xlsx", ".xls")) and not f.startswith("~$"):
                 excel_files.append(os.path.join(dirpath, f))
-    return excel_files
-
-def export_code(models, enums, backend, base_dir):
-    """统一导出枚举和模型代码"""
-    # Enums
-    enums_dir = os.path.join(base_dir, "Enums")
-    os.makedirs(enums_dir, exist_ok=True)
-    for enum in enums.values():
-        out_file = os.path.join(enums_dir, f"{enum.name}.{backend.file_ext}")
-        with open(out_file, "w", encoding="utf-8") as f:
-            f.write(backend.export_enum(enum))
-        print(f"导出 Enum {enum.name} 到 {out_file}")
-
-    # Models
-    models_dir = os.path.join(base_dir, "Models")
-    os.makedirs(models_dir, exist_ok=True)
-    for model in models:
-        out_file = os.path.join(models_dir, f"{model.name}.{backend.file_ext}")
-        with open(out_file, "w", encoding="utf-8") as f:
-            f.write(backend.export_model(model))
-        print(f"导出 Model {model.name} 到 {out_file}")
-
-def export_data(file_path, models, enums, data_exporter, base_dir):
-    """统一导出 DataTables"""
-    data_dict = data_exporter.export_data(file_path, models, enums)
+    return sorted(excel_files)
+
+def export_code(models, enums, backend, base_dir, model_map=None, threads=None, atomic=False):
+    """
+    统一导出枚举和模型代码；model_map 为全项目 Model，用于解析跨工作簿引用
+    各文件在线程池中渲染并写出（threads=1 时顺序执行），日志按 Enum、Model 的顺序输出
+    atomic: 直接写入输出目录（而非暂存目录）时为 True，逐文件原子替换
+    """
+    model_map = {**(model_map or {}), **{model.name: model for model in models}}
+    ext = backend.file_ext
+    logged = []
+    with OutputWriter(base_dir, threads, atomic) as writer:
+        # Enums
+        for enum in enums.values():
+            rel_path = os.path.join("Enums", f"{enum.name}.{ext}")
+            writer.submit(rel_path, lambda enum=enum: backend.export_enum(enum))
+            logged.append(("Enum", enum.name, rel_path))
+
+        # Models
+        for model in models:
+            rel_path = os.path.join("Models", f"{model.name}.{ext}")
+            writer.submit(rel_path, lambda model=model: backend.export_model(model, model_map))
+            logged.append(("Model", model.name, rel_path))
+
+        # 运行时支持代码（如二进制加载器）
+        for name, code in (backend.export_runtime() or {}).items():
+            writer.write(os.path.join("Runtime", f"{name}.{ext}"), code)
+    for kind, name, rel_path in logged:
+        print(f"导出 {kind} {name} 到 {os.path.join(base_dir, rel_path)}")
+
+def export_data(source, models, enums, data_exporter, base_dir, stream=False):
+    """
+    统一导出 DataTables；source 为文件路径或 WorkbookSession
+    stream=True 时逐行读取并直接写出，不构建整表 data_dict
+    返回 {model_name: 输出文件名}，映射文件由调用方合并后统一写出
+    """
     data_dir = os.path.join(base_dir, "DataTables")
     os.makedirs(data_dir, exist_ok=True)
-    data_exporter.write_file(data_dict, data_dir)
+    profiler = active()
+    workbook = getattr(source, "file_path", source)
+    tables = profiler.tables(data_exporter.iter_tables(source, models, enums), workbook)
+    if not stream:
+        tables = [(name, list(rows)) for name, rows in tables]
+        if profiler.enabled:
+            tables = [(name, profiler.rows(rows, workbook, name)) for name, rows in tables]
+    mapping = data_exporter.write_tables(tables, data_dir)
+    profiler.table_bytes(workbook, mapping, data_dir)
+    return mapping
+
+@dataclass
+class WorkbookResult:
+    """单个工作簿的处理结果，由工作进程返回给主进程合并"""
+    file_path: str
+    stage_dir: str
+    log: str = ""
+    models: list = field(default_factory=list)
+    enums: dict = field(default_factory=dict)
+    mapping: dict = field(default_factory=dict)
+    error: Exception = None
+    cached: bool = False
+    strings: list = field(default_factory=list)  # 字符串池中本工作簿新增的字符串（按本地下标顺序）
+    facts: object = None  # validation.WorkbookFacts，未校验时为 None
+    profile: object = None         # 工作进程的 profiling.Profiler
+    cprofile_stats: dict = None    # 工作进程的 cProfile 统计
+    tables: set = None             # 只重新导出了这些表（watch 模式），None 表示整个工作簿
+
+@dataclass
+class ExportOptions:
+    """所有工作簿共用的导出选项，随任务传给工作进程"""
+    base_dir: str
+    lang: str
+    data: str
+    stream: bool = False
+    json_style: str = "pretty"
+    strict: bool = True
+    pool_seed: list = None   # 启用字符串池时为上次构建的池内容
+    model_map: dict = field(default_factory=dict)  # 全项目 {name: ModelDef}
+    validate: bool = True    # 导出数据时收集主键 / 引用 / 类型校验信息
+    profile: bool = False         # 分阶段计时（--profile）
+    profile_memory: bool = False  # 同时记录 tracemalloc 峰值
+    cprofile: bool = False        # 工作进程运行 cProfile，统计随结果返回
+    io_threads: int = 1           # 代码渲染 / 输出写入的线程数，None 为 ThreadPoolExecutor 默认值
+
+@dataclass
+class WatchState:
+    """
+    watch 模式在两次导出之间常驻内存的状态
+    cache / schema_cache: 不再每次从磁盘读取；digests / hashes: 上次成功导出时各工作簿的 sheet 摘要与内容哈希
+    """
+    cache: BuildCache = None
+    schema_cache: object = None   # pipeline.SchemaCache
+    digests: dict = field(default_factory=dict)
+    hashes: dict = field(default_factory=dict)
+
+def make_backend(lang, data, string_pool=False):
+    """二进制数据导出时，代码后端同时生成对应的加载代码"""
+    binary_loader = (data or "").lower() in ("bin", "binary")
+    return get_backend(lang, binary_loader=binary_loader, string_pool=binary_loader and string_pool)
+
+def process_workbook(file_path, stage_dir, models, enums, options, tables=None):
+    """
+    导出单个工作簿的代码与数据到独立的暂存目录；schema 已由全项目索引解析好
+    可在进程池中运行：输出被捕获到 log，异常放入 error，由主进程按文件顺序处理
+    启用字符串池时，新字符串在 options.pool_seed 之后按本地顺序编号
+    tables: 只导出这些 Model 的数据表，不生成代码（schema 未变，只有数据 sheet 变化）
+    """
+    result = WorkbookResult(file_path=file_path, stage_dir=stage_dir, models=models, enums=enums, tables=tables)
+    pool_seed = options.pool_seed
+    # 串行时与主进程共用同一个 Profiler；工作进程各自记录，随结果返回
+    profiler = active()
+    if not (profiler.enabled and profiler.pid == os.getpid()):
+        profiler = Profiler(options.profile_memory) if options.profile else NULL_PROFILER
+        result.profile = profiler if profiler.enabled else None
+    profile = None
+    if options.cprofile:
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+    buf = io.StringIO()
+    with redirect_stdout(buf), use(profiler), profiler.stage("workbook", file_path):
+        try:
+            print(f"\n处理文件: {file_path}")
+            backend = make_backend(options.lang, options.data, string_pool=pool_seed is not None)
+            pool = None
+            if pool_seed is not None:
+                from exporters.string_pool import StringPool
+                pool = StringPool(pool_seed)
+            data_exporter = None
+            if options.data:
+                data_exporter = get_data_exporter(
+                    options.data, pool, options.json_style, options.strict, options.model_map)
+
+            # 导出代码
+            if tables is None:
+                with profiler.stage("codegen", file_path):
+                    export_code(models, enums, backend, stage_dir, options.model_map, options.io_threads)
+            else:
+                print(f"只更新数据表: {', '.join(sorted(tables)) or '无'}")
+
+            # 导出数据；只导出部分表时以只读模式打开，不解析其它 sheet
+            data_models = models if tables is None else [m for m in models if m.name in tables]
+            if data_exporter and data_models:
+                if options.validate:
+                    from validation import RowValidator
+                    data_exporter.validator = RowValidator(file_path, options.model_map)
+                from schema.workbook import WorkbookSession
+                with profiler.stage("load_workbook", file_path):
+                    session = WorkbookSession(file_path, read_only=options.stream or tables is not None)
+                with session, profiler.stage("export_data", file_path):
+                    result.mapping = export_data(
+                        session, data_models, enums, data_exporter, stage_dir, stream=options.stream)
+                if options.validate:
+                    result.facts = data_exporter.validator.facts
+            if pool is not None:
+                result.strings = pool.strings[len(pool_seed):]
+        except Exception as e:
+            result.error = e
+    if profile is not None:
+        from profiling import profile_stats
+        result.cprofile_stats = profile_stats(profile)
+    if result.profile is not None:
+        result.profile.finish()
+    # 日志中显示最终输出路径
+    result.log = buf.getvalue().replace(stage_dir, os.path.normpath(options.base_dir))
+    return result
+
+def commit_stage(stage_dir, base_dir, cache, force=False, threads=None):
+    """
+    把暂存目录中的输出移动到最终输出目录（线程池中并行比较 / 移动）
+    目标文件内容相同则不覆盖（保持 mtime，避免引擎重新导入资源）
+    返回 {相对输出路径: sha256}
+    """
+    with OutputWriter(base_dir, threads, force=force) as writer:
+        writer.commit_dir(stage_dir)
+        outputs = writer.wait()
+    cache.files_written += writer.written
+    cache.files_unchanged += writer.unchanged
+    return outputs
+
+def run_workbooks(excel_files, index, options, jobs=1, tables=None):
+    """
+    按 jobs 串行或并行处理工作簿，返回按输入顺序排列的结果
+    tables: {file_path: 只重新导出的 Model 名集合}，见 process_workbook
+    """
+    staging_root = os.path.join(options.base_dir, STAGING_DIR)
+    tables = tables or {}
+    tasks = [
+        (file_path, os.path.join(staging_root, f"{i:04d}"), *index.workbook(file_path), options,
+         tables.get(file_path))
+        for i, file_path in enumerate(excel_files)
+    ]
+    jobs = jobs if jobs > 0 else os.cpu_count()
+    if jobs == 1 or len(tasks) <= 1:
+        # 串行时 cProfile 由主进程统一记录
+        options = replace(options, cprofile=False)
+        return [process_workbook(*task[:4], options, task[5]) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(process_workbook, *zip(*tasks)))
+
+def cached_result(file_path, entry, index):
+    """由缓存记录构造结果，不再打开工作簿"""
+    models, enums = index.workbook(file_path)
+    return WorkbookResult(
+        file_path=file_path,
+        stage_dir=None,
+        log=f"\n跳过未变更文件: {file_path}\n",
+        models=models,
+        enums=enums,
+        mapping=entry.mapping,
+        cached=True,
+        facts=entry.facts,
+    )
+
+def validate_results(results, model_map, report_path):
+    """
+    汇总各工作簿的校验信息，做跨表引用检查
+    写出 JSON 报告并打印全部错误；有错误时抛出 ValueError（此时尚未提交任何输出）
+    """
+    from validation import check_references, print_violations, write_report
+    facts = [result.facts for result in results if result.facts is not None]
+    violations = [v for wb in facts for v in wb.violations]
+    violations += check_references(facts, model_map)
+    write_report(violations, report_path)
+    if violations:
+        print_violations(violations)
+        raise ValueError(f"数据校验失败，共 {len(violations)} 个错误，详见 {report_path}")
+    print(f"数据校验通过: {sum(len(wb.tables) for wb in facts)} 张表")
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("dir", help="Excel 文件所在目录")
     parser.add_argument("--lang", default="csharp", help="选择导出语言: csharp, python, cpp")
-    parser.add_argument("--data", default="json", help="数据导出类型: json, bin")
+    parser.add_argument("--data", default="json", help="数据导出类型: json, bin, columnar")
     parser.add_argument("--out", default="output", help="输出目录")
+    parser.add_argument("--stream", action="store_true", help="只读模式流式读取数据表，内存占用与表长无关")
+    parser.add_argument("--jobs", type=int, default=1, help="并行处理工作簿的进程数，0 表示 CPU 核数")
+    parser.add_argument("--io-threads", type=int, default=1,
+                        help="代码渲染与输出写入的线程数，0 表示自动；输出目录在网络盘等高延迟存储上时调大"
+                             "（本地磁盘上渲染受 GIL 限制，多线程反而更慢，见 benchmarks/bench_output.py）")
+    parser.add_argument("--force", action="store_true", help="忽略构建缓存，重新导出全部文件")
+    parser.add_argument("--schema-only", action="store_true",
+                        help="只根据 Enums / Models 重新生成代码，不导出数据；schema 未变的工作簿不打开 Excel")
+    parser.add_argument("--string-pool", action="store_true",
+                        help="string / string[] 字段存为全局字符串池下标（bin / columnar），池只追加，--force 时重建")
+    parser.add_argument("--json-style", default="pretty", choices=JSON_STYLES,
+                        help="JSON 输出格式: pretty（缩进）、compact（无空白）、ndjson（每行一个对象）")
+    parser.add_argument("--lenient-enums", action="store_true",
+                        help="无法识别的枚举值按 0 导出，不报错（默认报告全部错误单元格并失败）")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="跳过数据校验（主键唯一 / 引用存在 / 基础类型），默认校验并写出 validation_report.json")
+    parser.add_argument("--profile", action="store_true",
+                        help="记录各阶段 / 工作簿 / Model 的耗时、行数、单元格数、输出字节数，结束时打印汇总")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="同 --profile，并用 tracemalloc 记录各阶段峰值内存（明显变慢）")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="写出 Chrome trace JSON（chrome://tracing / Perfetto），隐含 --profile")
+    parser.add_argument("--cprofile", metavar="FILE",
+                        help="用 cProfile 运行（含工作进程）并写出 pstats 文件")
+    parser.add_argument("--watch", action="store_true",
+                        help="常驻监视目录：工作簿保存后只重新导出变化的工作簿 / 数据 sheet（Ctrl+C 退出）")
+    parser.add_argument("--watch-interval", type=float, default=0.2, help="--watch 的轮询间隔（秒）")
+    parser.add_argument("--watch-debounce", type=float, default=0.3,
+                        help="--watch 时文件停止变化多久后开始导出（秒）")
     args = parser.parse_args()
 
-    backend = get_backend(args.lang)
-    data_exporter = get_data_exporter(args.data)
+    enabled = args.profile or args.profile_memory or args.trace
+    profiler = Profiler(memory=args.profile_memory) if enabled else NULL_PROFILER
+    worker_stats = []
+    collect = nullcontext()
+    if args.cprofile:
+        from profiling import cprofile_to
+        collect = cprofile_to(args.cprofile, worker_stats)
+    try:
+        with use(profiler), collect:
+            if args.watch:
+                watch(args, profiler, worker_stats)
+            else:
+                with profiler.stage("export"):
+                    run(args, profiler, worker_stats)
+    except KeyboardInterrupt:
+        if not args.watch:
+            raise
+        print("\n已停止监视")
+    finally:
+        if profiler.enabled:
+            from profiling import format_summary, write_chrome_trace
+            print(format_summary(profiler.finish()))
+            if args.trace:
+                write_chrome_trace(profiler, args.trace)
+
+def watch(args, profiler=NULL_PROFILER, worker_stats=None):
+    """
+    常驻进程：首次导出后轮询目录，工作簿保存（并稳定 debounce 秒）后再次导出
+    解释器、openpyxl 与两级缓存都留在内存中；只改了数据 sheet 的工作簿只重新导出这些表
+    导出失败不退出，等待下一次保存
+    """
+    from pipeline.watcher import PollingWatcher
+    state = WatchState()
+    watcher = PollingWatcher(lambda: find_excel_files(args.dir), args.watch_interval, args.watch_debounce)
+    changed = None
+    while True:
+        start = time.perf_counter()
+        try:
+            with profiler.stage("export"):
+                run(args, profiler, worker_stats, state)
+            if changed is not None:
+                print(f"更新完成，用时 {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            # 状态丢弃，下次从磁盘缓存重新开始
+            print(f"导出失败: {e}")
+            state = WatchState()
+        print(f"\n监视 {args.dir} 中的工作簿变化（Ctrl+C 退出）...")
+        changed = watcher.wait()
+        print(f"\n检测到变化: {', '.join(os.path.basename(p) for p in sorted(changed))}")
+
+def run(args, profiler=NULL_PROFILER, worker_stats=None, state=None):
+    """
+    执行一次导出
+    profiler: 当前 Profiler，合并工作进程的记录；worker_stats: 收集工作进程的 cProfile 统计
+    state: watch 模式的 WatchState，启用按 sheet 的增量导出
+    """
+    from pipeline.schema_cache import SchemaCache
+
+    if args.schema_only:
+        return run_schema_only(args, state)
+
+    from validation import REPORT_FILE, merge_facts
+
+    if args.string_pool:
+        from exporters.string_pool import POOL_FILE, StringPool, is_identity, load_pool, write_pool
 
-    excel_files = find_excel_files(args.dir)
+    # 提前校验参数
+    make_backend(args.lang, args.data, args.string_pool)
+    data_exporter = get_data_exporter(
+        args.data, StringPool() if args.string_pool else None, args.json_style, not args.lenient_enums)
+
+    with stage("find_files"):
+        excel_files = find_excel_files(args.dir)
     if not excel_files:
         print(f"未找到 Excel 文件: {args.dir}")
         return
 
-    for file_path in excel_files:
-        print(f"\n处理文件: {file_path}")
-        enums = parse_enums_sheet(file_path)
-        models = parse_models_sheet(file_path, enums)
-        validate_schema(file_path, models, enums)
+    base_out_dir = args.out
+    io_threads = args.io_threads or None
+    os.makedirs(base_out_dir, exist_ok=True)
+    staging_root = os.path.join(base_out_dir, STAGING_DIR)
+
+    # 增量构建：内容哈希与导出配置都没变的工作簿直接复用缓存
+    cache_options = ()
+    if args.string_pool:
+        cache_options += ("string-pool",)
+    if args.lenient_enums:
+        cache_options += ("lenient-enums",)
+    if args.no_validate:
+        cache_options += ("no-validate",)
+    if args.data.lower() == "json" and args.json_style != "pretty":
+        cache_options += (f"json-{args.json_style}-{data_exporter.serializer}",)
+    if state is not None and state.cache is not None and state.cache.config[:3] == (args.data, args.lang, cache_options):
+        cache = state.cache
+        cache.reset_counters()
+    else:
+        cache = BuildCache(base_out_dir, args.data, args.lang, cache_options).load()
+    # 上次构建记录的全部输出，成功导出后据此删除不再产生的文件
+    previous_outputs = {rel for entry in cache.entries.values() for rel in entry.outputs}
+
+    # 字符串池：以上次构建的池为种子，缓存命中的表引用的下标保持有效；池文件丢失时全部重建
+    pool_seed = None
+    rebuild = args.force
+    if args.string_pool:
+        pool_path = os.path.join(base_out_dir, "DataTables", POOL_FILE)
+        if not args.force and os.path.exists(pool_path):
+            pool_seed = load_pool(pool_path)
+        else:
+            pool_seed = []
+            rebuild = True
+
+    # 全项目 schema 索引：未变更的工作簿直接复用缓存的 Enums / Models，不打开 Excel
+    schema_cache = state.schema_cache if state is not None and state.schema_cache is not None else None
+    if schema_cache is None:
+        schema_cache = SchemaCache(base_out_dir).load()
+    schema_cache.reset_counters()
+    with stage("content_hash"):
+        stats = {file_path: schema_cache.content_hash(file_path) for file_path in excel_files}
+
+    # watch 模式：按 sheet 摘要找出只改了数据 sheet 的工作簿，schema 沿用缓存，稍后只重新导出这些表
+    digests = {}
+    changed_tables = {}
+    if state is not None:
+        from pipeline.sheet_digest import changed_sheets, workbook_digest
+        with stage("sheet_digest"):
+            for file_path in excel_files:
+                content_hash = stats[file_path][0]
+                if state.hashes.get(file_path) == content_hash:
+                    continue
+                digests[file_path] = workbook_digest(file_path)
+                sheets = changed_sheets(file_path, state.digests.get(file_path), digests[file_path])
+                if sheets is None or sheets & SCHEMA_SHEETS:
+                    continue
+                schema_cache.retag(file_path, content_hash)
+                changed_tables[file_path] = sheets
+
+    with stage("schema_index"):
+        index = schema_cache.build_index(excel_files, lambda file_path: stats[file_path][0])
+        schema_cache.save()
+    print(index.summary())
+    print(schema_cache.report())
+    index.raise_errors()
+    # 主进程的导出器合并字符串池时重写已导出的表，需要全项目 Model 解析跨工作簿引用
+    data_exporter = get_data_exporter(
+        args.data, StringPool() if args.string_pool else None, args.json_style, not args.lenient_enums,
+        index.models)
+
+    options = ExportOptions(
+        base_dir=base_out_dir,
+        lang=args.lang,
+        data=args.data,
+        stream=args.stream,
+        json_style=args.json_style,
+        strict=not args.lenient_enums,
+        pool_seed=pool_seed,
+        model_map=index.models,
+        validate=not args.no_validate,
+        profile=profiler.enabled,
+        profile_memory=profiler.enabled and profiler.memory,
+        cprofile=args.cprofile is not None,
+        io_threads=io_threads,
+    )
+
+    results = [None] * len(excel_files)
+    schema_keys = {}
+    pending = []
+    partial = {}        # {file_path: 作为基础的上次 CacheEntry}
+    partial_tables = {}
+    for i, file_path in enumerate(excel_files):
+        content_hash, st = stats[file_path]
+        schema_keys[file_path] = index.dependency_key(file_path)
+        entry = None if rebuild else cache.lookup(file_path, content_hash, schema_keys[file_path])
+        if entry is not None and options.validate and args.data and entry.facts is None:
+            # 旧缓存没有校验信息，需要重新读取
+            entry = None
+        if entry is not None:
+            entry.size, entry.mtime_ns = st.st_size, st.st_mtime_ns
+            results[i] = cached_result(file_path, entry, index)
+            cache.hits += 1
+            continue
+        pending.append(i)
+        cache.misses += 1
+        base = None if rebuild or file_path not in changed_tables else cache.previous(file_path, schema_keys[file_path])
+        if base is not None and not (options.validate and args.data and base.facts is None):
+            partial[file_path] = base
+            model_names, _ = index.files.get(file_path, ([], []))
+            partial_tables[file_path] = changed_tables[file_path] & set(model_names)
+
+    try:
+        with stage("run_workbooks"):
+            fresh = run_workbooks([excel_files[i] for i in pending], index, options, args.jobs, partial_tables)
+        for i, result in zip(pending, fresh):
+            results[i] = result
+            base = partial.get(result.file_path)
+            if base is not None and result.facts is not None:
+                result.facts = merge_facts(base.facts, result.facts, result.tables)
+            elif base is not None:
+                result.facts = base.facts
+            profiler.merge(result.profile)
+            if result.cprofile_stats and worker_stats is not None:
+                worker_stats.append(result.cprofile_stats)
+
+        for result in results:
+            print(result.log, end="")
+            if result.error is not None:
+                raise result.error
+
+        # 数据校验：任何错误都在提交输出之前失败，输出目录保持上次的内容
+        if data_exporter and options.validate:
+            with stage("validate"):
+                validate_results(results, index.models, os.path.join(base_out_dir, REPORT_FILE))
 
-        base_out_dir = args.out
-        os.makedirs(base_out_dir, exist_ok=True)
+        # 按文件顺序合并：移动暂存文件（跨工作簿重名已由 schema 索引检查）
+        mapping = {}
+        mapping_outputs = {}
+        pool = StringPool(pool_seed) if pool_seed is not None else None
+        for result in results:
+            base = partial.get(result.file_path) if result.tables is not None else None
+            if base is not None:
+                mapping.update(base.mapping)
+            mapping.update(result.mapping)
+            if result.cached:
+                continue
 
-        # 导出代码
-        export_code(models, enums, backend, base_out_dir)
+            if pool is not None and result.mapping:
+                # 各工作簿的新字符串按文件顺序并入全局池，编号不一致的表重写下标
+                remap = pool.merge(result.strings, len(pool_seed))
+                if not is_identity(remap):
+                    data_exporter.remap_strings(
+                        os.path.join(result.stage_dir, "DataTables"), result.mapping, result.models, remap)
+
+            with stage("commit", result.file_path):
+                outputs = commit_stage(result.stage_dir, base_out_dir, cache, args.force, io_threads)
+            table_mapping = result.mapping
+            if base is not None:
+                outputs = {**base.outputs, **outputs}
+                table_mapping = {**base.mapping, **result.mapping}
+            content_hash, st = stats[result.file_path]
+            cache.update(result.file_path, CacheEntry(
+                content_hash=content_hash,
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                config=cache.config,
+                models=result.models,
+                enums=result.enums,
+                mapping=table_mapping,
+                outputs=outputs,
+                schema_key=schema_keys[result.file_path],
+                facts=result.facts,
+            ))
 
-        # 导出数据
         if data_exporter:
-            export_data(file_path, models, enums, data_exporter, base_out_dir)
+            # 映射文件同样经过暂存比较，内容不变不覆盖
+            mapping_stage = os.path.join(staging_root, "mapping")
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                data_exporter.write_mapping(mapping, os.path.join(mapping_stage, "DataTables"))
+                if pool is not None:
+                    pool_file = os.path.join(mapping_stage, "DataTables", POOL_FILE)
+                    os.makedirs(os.path.dirname(pool_file), exist_ok=True)
+                    with open(pool_file, "wb") as f:
+                        write_pool(pool.strings, f)
+                    print(f"生成字符串池 {pool_file}（{len(pool)} 个字符串）")
+            print(buf.getvalue().replace(mapping_stage, os.path.normpath(base_out_dir)), end="")
+            mapping_outputs = commit_stage(mapping_stage, base_out_dir, cache, args.force, io_threads)
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+    cache.prune(excel_files)
+    # 删除的 Model / Enum / 工作簿留下的输出
+    current_outputs = {rel for entry in cache.entries.values() for rel in entry.outputs}
+    orphans = remove_orphans(base_out_dir, previous_outputs, current_outputs | set(mapping_outputs))
+    if orphans:
+        print(f"删除 {len(orphans)} 个过期输出: {', '.join(orphans)}")
+    cache.save()
+    print(cache.report())
+
+    if state is not None:
+        # 导出成功后才记录摘要，失败时下次仍按变化处理
+        for file_path in excel_files:
+            if file_path not in digests and state.hashes.get(file_path) != stats[file_path][0]:
+                digests[file_path] = workbook_digest(file_path)
+        state.digests = {f: digests.get(f, state.digests.get(f)) for f in excel_files}
+        state.hashes = {f: stats[f][0] for f in excel_files}
+        state.cache = cache
+        state.schema_cache = schema_cache
+
+def run_schema_only(args, state=None):
+    """
+    --schema-only：只由 schema 重新生成代码，不导出数据、不读取构建缓存
+    大小 / mtime 与 schema 缓存记录一致的工作簿不读文件也不打开 Excel，全部命中时不导入 openpyxl
+    删除 Model / Enum 留下的旧代码由下一次完整导出清理
+    """
+    from pipeline.schema_cache import SchemaCache
+
+    backend = make_backend(args.lang, args.data, args.string_pool)
+    with stage("find_files"):
+        excel_files = find_excel_files(args.dir)
+    if not excel_files:
+        print(f"未找到 Excel 文件: {args.dir}")
+        return
+
+    schema_cache = state.schema_cache if state is not None and state.schema_cache is not None else None
+    if schema_cache is None:
+        schema_cache = SchemaCache(args.out).load()
+    schema_cache.reset_counters()
+    with stage("schema_index"):
+        index = schema_cache.build_index(excel_files)
+        schema_cache.save()
+    print(index.summary())
+    print(schema_cache.report())
+    index.raise_errors()
+
+    with stage("codegen"):
+        models = [model for file_path in excel_files for model in index.workbook(file_path)[0]]
+        # 直接写入输出目录：逐文件原子替换，内容未变的文件保持原样（mtime 不变）
+        export_code(models, index.enums, backend, args.out, index.models, args.io_threads or None, atomic=True)
+    if state is not None:
+        state.schema_cache = schema_cache
 
 if __name__ == "__main__":
     main()